@@ -0,0 +1,96 @@
+# ruff: noqa: G004
+"""try_acquire_async latency at high concurrency: per-name vs. loop-wide lock.
+
+Starts ``--tasks`` coroutines at once on one event loop, each acquiring one
+permit for a name drawn round-robin from ``num_keys`` names, and reports the
+p50/p99 latency of a single acquire. Buckets await ``--latency-ms`` inside
+``put`` to emulate the round trip of a networked backend (Redis/Postgres).
+
+``loop-wide`` reproduces the former single async lock per event loop, under
+which every coroutine waits for the round trips of all those ahead of it.
+With per-name locks only acquires of the same name take turns.
+
+    python benchmarks/async_latency.py --tasks 1000 --latency-ms 1
+"""
+
+import argparse
+import asyncio
+import logging
+from statistics import quantiles
+from time import perf_counter
+from typing import Dict, List
+
+from pyrate_limiter import AbstractBucket, BucketFactory, InMemoryBucket, Limiter, Rate, RateItem
+from pyrate_limiter.clocks import MonotonicClock
+
+logger = logging.getLogger(__name__)
+
+KEY_COUNTS = [1, 10, 1000]
+# Generous enough that every acquisition succeeds: we measure lock waits,
+# not rate limiting.
+RATES = [Rate(10_000_000, 1000)]
+
+
+class LatencyBucket(InMemoryBucket):
+    """InMemoryBucket that awaits in ``put`` to emulate a network round trip."""
+
+    def __init__(self, rates: List[Rate], latency_ms: float):
+        super().__init__(rates)
+        self.latency = latency_ms / 1000
+
+    async def put(self, item: RateItem) -> bool:  # type: ignore[override]
+        await asyncio.sleep(self.latency)
+        return super().put(item)
+
+
+class KeyedFactory(BucketFactory):
+    """One pre-built bucket per key; no background leak."""
+
+    def __init__(self, num_keys: int, latency_ms: float):
+        self.clock = MonotonicClock()
+        self.buckets: Dict[str, AbstractBucket] = {f"key-{i}": LatencyBucket(RATES, latency_ms) for i in range(num_keys)}
+
+    def wrap_item(self, name: str, weight: int = 1) -> RateItem:
+        return RateItem(name, self.clock.now(), weight=weight)
+
+    def get(self, item: RateItem) -> AbstractBucket:
+        return self.buckets[item.name]
+
+
+class LoopWideLockLimiter(Limiter):
+    """Every name shares one async lock, as before per-name locks."""
+
+    def _get_async_lock(self, name: str) -> asyncio.Lock:
+        return super()._get_async_lock("")
+
+
+async def run(limiter_cls: type, num_keys: int, tasks: int, latency_ms: float) -> List[float]:
+    """Return the latency in ms of each of ``tasks`` concurrent acquires."""
+    limiter = limiter_cls(KeyedFactory(num_keys, latency_ms))
+
+    async def acquire(name: str) -> float:
+        start = perf_counter()
+        assert await limiter.try_acquire_async(name)
+        return (perf_counter() - start) * 1000
+
+    return await asyncio.gather(*[acquire(f"key-{i % num_keys}") for i in range(tasks)])
+
+
+def percentiles(latencies: List[float]) -> str:
+    cuts = quantiles(latencies, n=100)
+    return f"{cuts[49]:>9,.1f} {cuts[98]:>9,.1f}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=1000, help="concurrent acquires")
+    parser.add_argument("--latency-ms", type=float, default=1.0, help="emulated backend round trip per put")
+    args = parser.parse_args()
+
+    logging.basicConfig(format="%(message)s", level=logging.INFO)
+    logger.info(f"{'keys':>6} {'':>10} {'p50 ms':>9} {'p99 ms':>9}")
+
+    for num_keys in KEY_COUNTS:
+        for label, limiter_cls in (("loop-wide", LoopWideLockLimiter), ("per-name", Limiter)):
+            latencies = asyncio.run(run(limiter_cls, num_keys, args.tasks, args.latency_ms))
+            logger.info(f"{num_keys:>6} {label:>10} {percentiles(latencies)}")
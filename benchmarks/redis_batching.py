@@ -0,0 +1,73 @@
+# ruff: noqa: G004
+"""Async RedisBucket throughput with and without a RedisBatcher.
+
+Each round starts ``tasks`` concurrent acquires on one event loop, spread over
+``num_keys`` bucket keys sharing one client. Without a batcher every acquire
+is its own EVALSHA round trip; with one, the acquires that are ready in the
+same loop tick are sent as a single pipeline.
+
+    REDIS=redis://localhost:6379 python benchmarks/redis_batching.py --tasks 1000
+"""
+
+import argparse
+import asyncio
+import logging
+from os import getenv
+from time import perf_counter
+from typing import Optional
+
+from redis.asyncio import Redis
+
+from pyrate_limiter import Rate, RateItem, RedisBatcher, RedisBucket
+from pyrate_limiter.utils import id_generator
+
+logger = logging.getLogger(__name__)
+
+# Generous enough that every acquisition succeeds: we measure round trips,
+# not rate limiting.
+RATES = [Rate(10_000_000, 60_000)]
+
+
+async def run(redis: Redis, num_keys: int, tasks: int, rounds: int, batcher: Optional[RedisBatcher]) -> float:
+    """Return acquisitions per second over ``rounds`` rounds of ``tasks``."""
+    prefix = f"bench-batching/{id_generator()}"
+    buckets = [await RedisBucket.init(RATES, redis, f"{prefix}/{i}", batcher=batcher) for i in range(num_keys)]
+
+    async def one_round() -> None:
+        results = await asyncio.gather(*[buckets[i % num_keys].put(RateItem("item", buckets[0].now())) for i in range(tasks)])
+        assert all(results)
+
+    # Warm-up: open the pooled connections outside the measurement.
+    await one_round()
+
+    start = perf_counter()
+    for _ in range(rounds):
+        await one_round()
+    elapsed = perf_counter() - start
+
+    await redis.delete(*[bucket.bucket_key for bucket in buckets])
+    return tasks * rounds / elapsed
+
+
+async def main(args: argparse.Namespace) -> None:
+    # Unbatched, every in-flight acquire holds its own pooled connection.
+    redis = Redis.from_url(getenv("REDIS", "redis://localhost:6379"), max_connections=args.tasks)
+
+    logger.info(f"{'keys':>6} {'tasks':>6} {'no batcher':>12} {'batcher':>12}   (acquires/s)")
+    for num_keys in (1, 100):
+        plain = await run(redis, num_keys, args.tasks, args.rounds, None)
+        batched = await run(redis, num_keys, args.tasks, args.rounds, RedisBatcher(redis, max_batch=args.max_batch))
+        logger.info(f"{num_keys:>6} {args.tasks:>6} {plain:>12,.0f} {batched:>12,.0f}")
+
+    await redis.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=1000, help="concurrent acquires per round")
+    parser.add_argument("--rounds", type=int, default=5, help="rounds per measurement")
+    parser.add_argument("--max-batch", type=int, default=128, help="RedisBatcher max_batch")
+    args = parser.parse_args()
+
+    logging.basicConfig(format="%(message)s", level=logging.INFO)
+    asyncio.run(main(args))
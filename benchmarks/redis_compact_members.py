@@ -0,0 +1,69 @@
+# ruff: noqa: G004
+"""RedisBucket put latency and sorted-set size, uuid vs. compact members.
+
+Fills a fresh bucket with ``--puts`` sequential puts of each weight. The
+default member per unit is ``<name>:<uuid hex>:<unit>``, built client-side
+with a uuid per put; ``compact_members=True`` uses integers from a per-key
+``INCRBY`` sequence instead. Reports the mean put latency and the bytes the
+members take, plus ``MEMORY USAGE`` of the sorted set where the server has it.
+
+    REDIS=redis://localhost:6379 python benchmarks/redis_compact_members.py
+"""
+
+import argparse
+import logging
+from os import getenv
+from time import perf_counter
+from typing import Optional, Tuple
+
+from redis import Redis
+from redis.exceptions import ResponseError
+
+from pyrate_limiter import Rate, RateItem, RedisBucket
+from pyrate_limiter.utils import id_generator
+
+logger = logging.getLogger(__name__)
+
+WEIGHTS = [1, 10, 100]
+# Generous enough that every put fits: we measure members.
+RATES = [Rate(1_000_000_000, 60_000)]
+
+
+def memory_usage(redis: Redis, key: str) -> Optional[int]:
+    try:
+        return redis.memory_usage(key, samples=0)
+    except ResponseError:
+        return None
+
+
+def run(redis: Redis, weight: int, compact: bool, puts: int) -> Tuple[float, int, Optional[int]]:
+    """Return (put ms, member bytes, MEMORY USAGE bytes or None)."""
+    bucket = RedisBucket.init(RATES, redis, f"bench-members/{id_generator()}", compact_members=compact)
+    now = bucket.now()
+
+    start = perf_counter()
+    for _ in range(puts):
+        assert bucket.put(RateItem("item", now, weight=weight))
+    elapsed = perf_counter() - start
+
+    member_bytes = sum(len(member) for member in redis.zrange(bucket.bucket_key, 0, -1))
+    usage = memory_usage(redis, bucket.bucket_key)
+    bucket.flush()
+
+    return elapsed * 1000 / puts, member_bytes, usage
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--puts", type=int, default=2000, help="puts measured per weight")
+    args = parser.parse_args()
+
+    logging.basicConfig(format="%(message)s", level=logging.INFO)
+    redis = Redis.from_url(getenv("REDIS", "redis://localhost:6379"))
+
+    logger.info(f"{'weight':>7} {'members':>8} {'put ms':>8} {'member KB':>10} {'MEMORY USAGE KB':>16}")
+    for weight in WEIGHTS:
+        for label, compact in (("uuid", False), ("compact", True)):
+            put_ms, member_bytes, usage = run(redis, weight, compact, args.puts)
+            usage_kb = "n/a" if usage is None else f"{usage / 1024:,.0f}"
+            logger.info(f"{weight:>7} {label:>8} {put_ms:>8.3f} {member_bytes / 1024:>10,.0f} {usage_kb:>16}")
@@ -0,0 +1,58 @@
+# ruff: noqa: G004
+"""Cross-process acquire throughput: MultiprocessBucket vs. SharedMemoryBucket.
+
+``--processes`` workers share one bucket, handed over by a
+``ProcessPoolExecutor`` initializer, and each run ``--acquires`` acquires
+through a ``Limiter``. ``MultiprocessBucket`` keeps its items in a
+``Manager().list()``, so every list operation of a put is an IPC round trip
+to the manager process; ``SharedMemoryBucket`` reads and writes a ring of
+timestamps in shared memory. Reports the aggregate acquires per second.
+
+    python benchmarks/shared_memory_bucket.py --processes 4
+"""
+
+import argparse
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+from typing import Union
+
+from pyrate_limiter import MultiprocessBucket, Rate, SharedMemoryBucket, limiter_factory
+
+logger = logging.getLogger(__name__)
+
+
+def worker(acquires: int) -> float:
+    """Run ``acquires`` acquires; return the seconds they took."""
+    limiter = limiter_factory.LIMITER
+    assert limiter is not None
+
+    start = perf_counter()
+    for _ in range(acquires):
+        assert limiter.try_acquire("item")
+    return perf_counter() - start
+
+
+def run(bucket: Union[MultiprocessBucket, SharedMemoryBucket], processes: int, acquires: int) -> float:
+    """Return the aggregate acquires per second."""
+    with ProcessPoolExecutor(processes, initializer=limiter_factory.init_global_limiter, initargs=(bucket,)) as executor:
+        elapsed = max(executor.map(worker, [acquires] * processes))
+    return processes * acquires / elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--processes", type=int, default=4, help="worker processes sharing the bucket")
+    parser.add_argument("--acquires", type=int, default=2000, help="acquires per worker")
+    args = parser.parse_args()
+
+    logging.basicConfig(format="%(message)s", level=logging.INFO)
+    # Admits every acquire, so we measure the bucket rather than the wait; the
+    # shared ring is sized by the limit, so it is not made any larger.
+    rates = [Rate(args.processes * args.acquires, 60_000)]
+    manager = run(MultiprocessBucket.init(rates), args.processes, args.acquires)
+    shm_bucket = SharedMemoryBucket.init(rates)
+    shared = run(shm_bucket, args.processes, args.acquires)
+    shm_bucket.close()
+    logger.info(f"{'processes':>9} {'manager acq/s':>14} {'shm acq/s':>10}")
+    logger.info(f"{args.processes:>9} {manager:>14,.0f} {shared:>10,.0f}")
@@ -0,0 +1,108 @@
+# ruff: noqa: G004
+"""SQLiteBucket put latency: one admit-and-insert statement vs. a UNION of COUNTs.
+
+A log bucket's put used to run one ``COUNT(*)`` per rate, joined by UNION
+(an index range scan per rate), decide in Python, then ``executemany`` the
+unit rows. It now counts the windows and inserts in one ``INSERT ...
+SELECT``, its SQL composed once per bucket so the connection's statement
+cache keeps it prepared. ``union`` replays the former path. Each bucket is
+pre-filled with ``--fill`` rows spread over its widest window, the rows the
+counts step through. ``synchronous=OFF`` keeps the commit's fsync, which
+otherwise dominates a put on most disks, out of the measurement.
+
+    python benchmarks/sqlite_admit.py
+"""
+
+import argparse
+import logging
+from pathlib import Path
+from tempfile import gettempdir
+from time import perf_counter
+from typing import List
+
+from pyrate_limiter import Decision, Rate, RateItem, SlidingWindowLog, SQLiteBucket
+from pyrate_limiter.utils import id_generator
+
+logger = logging.getLogger(__name__)
+
+# Generous enough that every put fits: we measure the check.
+RATE_SETS = {
+    1: [Rate(1_000_000_000, 3_600_000)],
+    3: [Rate(100_000_000, 1000), Rate(1_000_000_000, 60_000), Rate(10_000_000_000, 3_600_000)],
+    5: [
+        Rate(100_000_000, 1000),
+        Rate(200_000_000, 10_000),
+        Rate(1_000_000_000, 60_000),
+        Rate(5_000_000_000, 600_000),
+        Rate(10_000_000_000, 3_600_000),
+    ],
+}
+
+COUNT_BEFORE_INSERT = """
+SELECT :interval{index} as interval, COUNT(*),
+CASE WHEN COUNT(*) > :bound{index} THEN (
+    SELECT item_timestamp FROM '{table}' ORDER BY item_timestamp DESC LIMIT 1 OFFSET :bound{index}
+) END
+FROM '{table}'
+WHERE item_timestamp >= :current_timestamp - :interval{index}
+"""
+
+
+class UnionBucket(SQLiteBucket):
+    """The former put path: a UNION of per-rate COUNTs, then an insert."""
+
+    def _check_and_insert(self, item: RateItem) -> Decision:
+        parameters = {"current_timestamp": item.timestamp}
+        queries = []
+        for index, rate in enumerate(self.rates):
+            parameters[f"interval{index}"] = rate.interval
+            parameters[f"bound{index}"] = max(rate.limit - item.weight, 0)
+            queries.append(COUNT_BEFORE_INSERT.format(table=self.table, index=index))
+
+        cur = self.conn.execute(" union ".join(queries), parameters)
+        counts = [count for _, count, _ in cur.fetchall()]
+        cur.close()
+
+        decision = SlidingWindowLog().admit(self.rates, counts, item.weight)
+        if decision.allowed:
+            query = f"INSERT INTO '{self.table}' (name, item_timestamp) VALUES (?, ?)"  # noqa: S608
+            self.conn.executemany(query, [(item.name, item.timestamp)] * item.weight).close()
+        return decision
+
+
+def run(rates: List[Rate], union: bool, puts: int, fill: int) -> float:
+    """Return the mean latency of one put, in ms."""
+    db_path = str(Path(gettempdir()) / f"pyrate_bench_admit_{id_generator()}.sqlite")
+    bucket = SQLiteBucket.init_from_file(rates, table="bench", db_path=db_path)
+    if union:
+        bucket = UnionBucket(rates, bucket.conn, bucket.table, bucket.lock)
+    bucket.conn.execute("PRAGMA synchronous=OFF")
+
+    now = bucket.now()
+    widest = rates[-1].interval
+    rows = [("fill", now - widest + widest * index // fill) for index in range(fill)]
+    bucket.conn.executemany("INSERT INTO 'bench' (name, item_timestamp) VALUES (?, ?)", rows)
+    bucket.conn.commit()
+
+    start = perf_counter()
+    for _ in range(puts):
+        assert bucket.put(RateItem("item", now))
+    elapsed = perf_counter() - start
+
+    bucket.close()
+    Path(db_path).unlink()
+    return elapsed * 1000 / puts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--puts", type=int, default=2000, help="puts measured per configuration")
+    parser.add_argument("--fill", type=int, default=10_000, help="rows pre-filled in the widest window")
+    args = parser.parse_args()
+
+    logging.basicConfig(format="%(message)s", level=logging.INFO)
+    logger.info(f"{'rates':>5} {'union ms':>9} {'admit ms':>9}")
+    for count, rates in RATE_SETS.items():
+        union = run(rates, True, args.puts, args.fill)
+        admit = run(rates, False, args.puts, args.fill)
+        logger.info(f"{count:>5} {union:>9,.3f} {admit:>9,.3f}")
@@ -0,0 +1,101 @@
+# ruff: noqa: G004
+"""SQLiteBucket leak time and put stall: the former leak vs. range deletes.
+
+Fills a bucket with ``--expired`` rows past its window and ``--live`` rows
+inside it, then leaks while a second thread keeps putting. ``legacy``
+replays the former leak - ``COUNT(*)`` of the expired rows, then ``DELETE
+... WHERE rowid IN (SELECT rowid ... ORDER BY item_timestamp LIMIT n)`` -
+``range`` deletes them with one indexed range ``DELETE``, and ``chunked``
+does so ``--chunk`` rows per transaction, releasing the bucket lock in
+between. Reports the leak time and the longest put the leak held up.
+
+    python benchmarks/sqlite_leak.py
+"""
+
+import argparse
+import logging
+import threading
+from pathlib import Path
+from tempfile import gettempdir
+from time import perf_counter
+from typing import List, Optional, Tuple
+
+from pyrate_limiter import Rate, RateItem, SQLiteBucket
+from pyrate_limiter.utils import id_generator
+
+logger = logging.getLogger(__name__)
+
+# Generous enough that every put fits: we measure the leak.
+RATES = [Rate(1_000_000_000, 60_000)]
+
+
+class LegacyLeakBucket(SQLiteBucket):
+    """The former leak: count the expired rows, then delete that many oldest."""
+
+    def leak(self, current_timestamp: Optional[int] = None) -> int:
+        assert current_timestamp is not None
+        with self.lock:
+            lower_bound = self._algorithm.leak_bound(self.rates, current_timestamp)
+            cur = self.conn.execute(f"SELECT COUNT(*) FROM '{self.table}' WHERE item_timestamp < ?", (lower_bound,))  # noqa: S608
+            count = cur.fetchone()[0]
+            cur.execute(
+                f"DELETE FROM '{self.table}' WHERE rowid IN (SELECT rowid FROM '{self.table}' ORDER BY item_timestamp ASC LIMIT ?)",  # noqa: S608
+                (count,),
+            )
+            cur.close()
+            self.conn.commit()
+            return count
+
+
+def run(mode: str, expired: int, live: int, chunk: int) -> Tuple[float, float]:
+    """Return (leak ms, longest concurrent put ms)."""
+    db_path = str(Path(gettempdir()) / f"pyrate_bench_leak_{id_generator()}.sqlite")
+    bucket = SQLiteBucket.init_from_file(RATES, table="bench", db_path=db_path, leak_chunk_size=chunk if mode == "chunked" else None)
+    if mode == "legacy":
+        bucket = LegacyLeakBucket(RATES, bucket.conn, bucket.table)
+    bucket.conn.execute("PRAGMA synchronous=OFF")
+
+    now = bucket.now()
+    window = RATES[-1].interval
+    rows = [("old", now - 2 * window + index % window) for index in range(expired)]
+    rows += [("new", now - index % window) for index in range(live)]
+    bucket.conn.executemany("INSERT INTO 'bench' (name, item_timestamp) VALUES (?, ?)", rows)
+    bucket.conn.commit()
+
+    stalls: List[float] = []
+    leaking = threading.Event()
+
+    def putter() -> None:
+        while leaking.is_set():
+            start = perf_counter()
+            bucket.put(RateItem("put", now))
+            stalls.append(perf_counter() - start)
+
+    leaking.set()
+    thread = threading.Thread(target=putter)
+    thread.start()
+
+    start = perf_counter()
+    assert bucket.leak(now) == expired
+    elapsed = perf_counter() - start
+
+    leaking.clear()
+    thread.join()
+    bucket.close()
+    Path(db_path).unlink()
+
+    return elapsed * 1000, max(stalls, default=0.0) * 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--expired", type=int, default=500_000, help="rows past the window")
+    parser.add_argument("--live", type=int, default=100_000, help="rows inside the window")
+    parser.add_argument("--chunk", type=int, default=10_000, help="rows per chunked transaction")
+    args = parser.parse_args()
+
+    logging.basicConfig(format="%(message)s", level=logging.INFO)
+    logger.info(f"{'mode':>8} {'leak ms':>9} {'max put ms':>11}")
+    for mode in ("legacy", "range", "chunked"):
+        leak_ms, stall_ms = run(mode, args.expired, args.live, args.chunk)
+        logger.info(f"{mode:>8} {leak_ms:>9,.1f} {stall_ms:>11,.1f}")
@@ -0,0 +1,66 @@
+# ruff: noqa: G004
+"""SQLiteBucket put latency and table size vs. item weight, unit rows vs. ``weighted_rows``.
+
+Runs ``--puts`` sequential puts of each weight into a fresh bucket whose
+window already holds ``--fill`` puts of that weight, so the admission counts
+cover them too. Unit rows write ``weight`` rows per put and count them;
+``weighted_rows=True`` writes one row and sums its weight. Reports the mean
+put latency, the rows stored and the database size. ``synchronous=OFF``
+keeps the commit's fsync out of the measurement.
+
+    python benchmarks/sqlite_weighted_rows.py
+"""
+
+import argparse
+import logging
+from pathlib import Path
+from tempfile import gettempdir
+from time import perf_counter
+from typing import Tuple
+
+from pyrate_limiter import Rate, RateItem, SQLiteBucket
+from pyrate_limiter.utils import id_generator
+
+logger = logging.getLogger(__name__)
+
+WEIGHTS = [1, 10, 100, 1000]
+# Generous enough that every put fits: we measure writes and counts.
+RATES = [Rate(1_000_000_000, 60_000)]
+
+
+def run(weight: int, weighted_rows: bool, fill: int, puts: int) -> Tuple[float, int, int]:
+    """Return (put ms, rows, database bytes)."""
+    db_path = str(Path(gettempdir()) / f"pyrate_bench_weighted_{id_generator()}.sqlite")
+    bucket = SQLiteBucket.init_from_file(RATES, table="bench", db_path=db_path, weighted_rows=weighted_rows)
+    bucket.conn.execute("PRAGMA synchronous=OFF")
+
+    for _ in range(fill):
+        bucket.put(RateItem("item", bucket.now(), weight=weight))
+
+    start = perf_counter()
+    for _ in range(puts):
+        assert bucket.put(RateItem("item", bucket.now(), weight=weight))
+    elapsed = perf_counter() - start
+
+    rows = bucket.conn.execute("SELECT COUNT(*) FROM bench").fetchone()[0]
+    bucket.close()
+    size = Path(db_path).stat().st_size
+    Path(db_path).unlink()
+
+    return elapsed * 1000 / puts, rows, size
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fill", type=int, default=50, help="puts already in the window")
+    parser.add_argument("--puts", type=int, default=200, help="puts measured per weight")
+    args = parser.parse_args()
+
+    logging.basicConfig(format="%(message)s", level=logging.INFO)
+    logger.info(f"{'weight':>7} {'unit rows ms':>13} {'weighted ms':>12} {'unit rows':>10} {'weighted':>9} {'unit KiB':>9} {'weighted KiB':>13}")
+    for weight in WEIGHTS:
+        unit = run(weight, False, args.fill, args.puts)
+        weighted = run(weight, True, args.fill, args.puts)
+        logger.info(
+            f"{weight:>7} {unit[0]:>13,.3f} {weighted[0]:>12,.3f} {unit[1]:>10,} {weighted[1]:>9,} {unit[2] // 1024:>9,} {weighted[2] // 1024:>13,}"
+        )
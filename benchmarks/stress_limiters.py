@@ -4,9 +4,9 @@ from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
 from dataclasses import dataclass
 from functools import partial
 from time import perf_counter
-from typing import Callable, Literal, cast
+from typing import Callable, Literal, Union, cast
 
-from pyrate_limiter import Duration, Limiter, MultiprocessBucket, Rate, limiter_factory
+from pyrate_limiter import Duration, Limiter, MultiprocessBucket, Rate, SharedMemoryBucket, limiter_factory
 
 logger = logging.getLogger(__name__)
 
@@ -25,7 +25,7 @@ class TestResult:
     percent_from_expected_duration: float
 
 
-def create_mp_limiter(bucket: MultiprocessBucket):
+def create_mp_limiter(bucket: Union[MultiprocessBucket, SharedMemoryBucket]):
     limiter = Limiter(bucket, buffer_ms=BUFFER_MS)
 
     return limiter
@@ -33,7 +33,7 @@ def create_mp_limiter(bucket: MultiprocessBucket):
 
 def create_rate_limiter_factory(
     requests_per_second: int,
-    backend: Literal["default", "sqlite", "sqlite_filelock", "mp_limiter"],
+    backend: Literal["default", "sqlite", "sqlite_filelock", "mp_limiter", "shm_limiter"],
 ) -> Callable[[], Limiter]:
     """Returns a callable, so it can be used with multiprocessing"""
     rate = Rate(requests_per_second, Duration.SECOND)
@@ -58,6 +58,9 @@ def create_rate_limiter_factory(
     elif backend == "mp_limiter":
         bucket = MultiprocessBucket.init([rate])
         return partial(create_mp_limiter, bucket=bucket)
+    elif backend == "shm_limiter":
+        shm_bucket = SharedMemoryBucket.init([rate])
+        return partial(create_mp_limiter, bucket=shm_bucket)
     else:
         raise ValueError(f"Unexpected backend option: {backend}")
 
@@ -156,7 +159,7 @@ if __name__ == "__main__":
     )
 
     for backend in ["default", "sqlite", "mp_limiter"]:
-        backend = cast(Literal["default", "sqlite", "sqlite_filelock", "mp_limiter"], backend)
+        backend = cast(Literal["default", "sqlite", "sqlite_filelock", "mp_limiter", "shm_limiter"], backend)
         for requests_per_second in requests_per_second_list:
             logger.info(f"Testing with {backend=}, {requests_per_second=}")
             limiter_creator = create_rate_limiter_factory(requests_per_second, backend=backend)
@@ -170,8 +173,8 @@ if __name__ == "__main__":
             test_results.append(result)
 
     logger.info("Testing Multiprocessing")
-    for backend in ["sqlite_filelock", "mp_limiter"]:
-        backend = cast(Literal["default", "sqlite", "sqlite_filelock", "mp_limiter"], backend)
+    for backend in ["sqlite_filelock", "mp_limiter", "shm_limiter"]:
+        backend = cast(Literal["default", "sqlite", "sqlite_filelock", "mp_limiter", "shm_limiter"], backend)
 
         for requests_per_second in requests_per_second_list:
             logger.info(f"Testing with {backend=}, {requests_per_second=}")
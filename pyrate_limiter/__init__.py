@@ -1,23 +1,40 @@
 # flake8: noqa
 from ._version import __version__ as __version__
+from .abstracts import GCRA as GCRA
 from .abstracts import AbstractBucket as AbstractBucket
+from .abstracts import Algorithm as Algorithm
 from .abstracts import BucketAsyncWrapper as BucketAsyncWrapper
 from .abstracts import BucketFactory as BucketFactory
+from .abstracts import Decision as Decision
 from .abstracts import Duration as Duration
 from .abstracts import Rate as Rate
 from .abstracts import RateItem as RateItem
+from .abstracts import SlidingWindowCounter as SlidingWindowCounter
+from .abstracts import SlidingWindowLog as SlidingWindowLog
+from .abstracts import StatefulAlgorithm as StatefulAlgorithm
+from .buckets import ArrayBucket as ArrayBucket
+from .buckets import AsyncPostgresBucket as AsyncPostgresBucket
 from .buckets import InMemoryBucket as InMemoryBucket
 from .buckets import MultiprocessBucket as MultiprocessBucket
 from .buckets import PgQueries as PgQueries
 from .buckets import PostgresBucket as PostgresBucket
+from .buckets import PostgresBucketFactory as PostgresBucketFactory
+from .buckets import RedisBatcher as RedisBatcher
 from .buckets import RedisBucket as RedisBucket
+from .buckets import RingBufferBucket as RingBufferBucket
+from .buckets import SharedMemoryBucket as SharedMemoryBucket
 from .buckets import SQLiteBucket as SQLiteBucket
 from .buckets import SQLiteClock as SQLiteClock
 from .buckets import SQLiteQueries as SQLiteQueries
 from .clocks import AbstractClock as AbstractClock
+from .clocks import AsyncCachedClock as AsyncCachedClock
+from .clocks import AsyncPostgresClock as AsyncPostgresClock
+from .clocks import CachedClock as CachedClock
 from .clocks import MonotonicAsyncClock as MonotonicAsyncClock
 from .clocks import MonotonicClock as MonotonicClock
 from .clocks import PostgresClock as PostgresClock
+from .clocks import RedisClock as RedisClock
+from .clocks import WallClock as WallClock
 from .limiter import Limiter as Limiter
 from .limiter import SingleBucketFactory as SingleBucketFactory
 from .utils import dedicated_sqlite_clock_connection as dedicated_sqlite_clock_connection
@@ -28,23 +45,40 @@ from . import limiter_factory as limiter_factory
 __all__ = [
     "__version__",
     "AbstractBucket",
+    "Algorithm",
     "BucketAsyncWrapper",
     "BucketFactory",
+    "Decision",
     "Duration",
     "Rate",
     "RateItem",
+    "GCRA",
+    "SlidingWindowCounter",
+    "SlidingWindowLog",
+    "StatefulAlgorithm",
+    "ArrayBucket",
+    "AsyncPostgresBucket",
     "InMemoryBucket",
     "MultiprocessBucket",
     "PgQueries",
     "PostgresBucket",
+    "PostgresBucketFactory",
+    "RedisBatcher",
     "RedisBucket",
+    "RingBufferBucket",
+    "SharedMemoryBucket",
     "SQLiteBucket",
     "SQLiteClock",
     "SQLiteQueries",
     "AbstractClock",
+    "AsyncCachedClock",
+    "AsyncPostgresClock",
+    "CachedClock",
     "MonotonicAsyncClock",
     "MonotonicClock",
     "PostgresClock",
+    "RedisClock",
+    "WallClock",
     "Limiter",
     "SingleBucketFactory",
     "dedicated_sqlite_clock_connection",
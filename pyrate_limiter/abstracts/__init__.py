@@ -1,3 +1,9 @@
+from .algorithm import GCRA as GCRA
+from .algorithm import Algorithm as Algorithm
+from .algorithm import Decision as Decision
+from .algorithm import SlidingWindowCounter as SlidingWindowCounter
+from .algorithm import SlidingWindowLog as SlidingWindowLog
+from .algorithm import StatefulAlgorithm as StatefulAlgorithm
 from .bucket import AbstractBucket as AbstractBucket
 from .bucket import BucketFactory as BucketFactory
 from .rate import Duration as Duration
@@ -6,6 +12,12 @@ from .rate import RateItem as RateItem
 from .wrappers import BucketAsyncWrapper as BucketAsyncWrapper
 
 __all__ = [
+    "Algorithm",
+    "Decision",
+    "GCRA",
+    "SlidingWindowCounter",
+    "SlidingWindowLog",
+    "StatefulAlgorithm",
     "AbstractBucket",
     "BucketFactory",
     "Duration",
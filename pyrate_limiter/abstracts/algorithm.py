@@ -1,40 +1,61 @@
 """Rate-limiting algorithm abstraction.
 
 Separates the *policy* (which rates admit an item, and how far back items can be
-leaked) from the *storage* that counts and persists those items. In v4 this is
-an internal seam: the built-in buckets delegate their per-rate admit decision
-and leak bound here, so the sliding-window-log logic lives in exactly one place
-instead of being copy-pasted across backends. v5 promotes ``Algorithm`` /
-``Decision`` to a public extension point (a ``Store`` interface plus a generic
-``Algorithm.check`` over it, with backends providing optional native
-implementations), at which point ``Decision`` also carries retry-after and
-replaces the ``failing_rate`` instance-state side-channel + the bool return.
+leaked) from the *storage* that counts and persists those items. The built-in
+buckets delegate their per-rate admit decision and leak bound here, so each
+algorithm's logic lives in exactly one place instead of being copy-pasted
+across backends; backends may still implement an algorithm natively (Redis
+Lua, Postgres lock + ``COUNT FILTER``, in-memory bisect) for atomicity and
+performance, but share this definition of the decision.
+
+Two families exist:
+
+- Log-based (``SlidingWindowLog``): the bucket stores one record per admitted
+  unit and supplies windowed counts to ``admit``.
+- Stateful (``StatefulAlgorithm``, e.g. ``GCRA``): the bucket stores a small,
+  fixed-size state per rate and ``check`` computes both the verdict and the
+  next state, so storage is O(1) per key regardless of the limit.
+
+The algorithm is selected per bucket with the ``algorithm=`` constructor
+argument; ``SlidingWindowLog`` is the default.
 """
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import List, Optional, Sequence
+from math import ceil
+from typing import List, Optional, Sequence, Tuple
 
 from .rate import Rate
 
+# Per-rate state of a StatefulAlgorithm: one number per ``state_fields`` entry.
+State = Tuple[float, ...]
+
 
 @dataclass(frozen=True)
 class Decision:
     """Outcome of an admit check.
 
     ``failing_rate is None`` means the item was admitted; otherwise it is the
-    first rate whose window was full. In v4 the retry-after is still derived
-    separately by ``AbstractBucket.waiting()``; v5 folds it into this type so a
-    single atomic check yields both the verdict and the wait.
+    first rate whose window was full. ``retry_after`` is the number of
+    milliseconds until the rejected item would fit, when the check could derive
+    it in closed form; ``None`` leaves it to ``AbstractBucket.waiting()``.
     """
 
     failing_rate: Optional[Rate] = None
+    retry_after: Optional[int] = None
 
     @property
     def allowed(self) -> bool:
         return self.failing_rate is None
 
 
+def _admit_counts(rates: List[Rate], counts: Sequence[float], weight: int) -> Decision:
+    for rate, count in zip(rates, counts, strict=True):
+        if rate.limit - count < weight:
+            return Decision(failing_rate=rate)
+    return Decision()
+
+
 class Algorithm(ABC):
     """A rate-limiting policy, expressed independently of any storage backend.
 
@@ -59,19 +80,214 @@ class SlidingWindowLog(Algorithm):
     """Precise sliding-window-log policy.
 
     Admit while, for every rate, the count of items within its rolling interval
-    stays under the limit. This is PyrateLimiter's default and (until v5) only
-    algorithm; backends may implement it natively for atomicity/performance
-    (Redis Lua, Postgres lock + ``COUNT FILTER``, in-memory bisect) but share
-    this definition of the decision.
+    stays under the limit. This is PyrateLimiter's default algorithm.
     """
 
     def admit(self, rates: List[Rate], counts: Sequence[int], weight: int) -> Decision:
-        for rate, count in zip(rates, counts, strict=True):
-            if rate.limit - int(count) < weight:
-                return Decision(failing_rate=rate)
-        return Decision()
+        return _admit_counts(rates, [int(count) for count in counts], weight)
 
     def leak_bound(self, rates: List[Rate], now: int) -> int:
         # rates are sorted ascending by interval (AbstractBucket.rates), so
         # rates[-1] is the widest window.
         return now - rates[-1].interval
+
+    @staticmethod
+    def retry_after(rate: Rate, now: int, bound_timestamp: Optional[int]) -> int:
+        """Milliseconds until ``rate`` admits again at ``now``.
+
+        ``bound_timestamp`` is the timestamp of the unit that has to leave the
+        window first - ``peek(limit - weight)`` - or ``None`` if there is none.
+        """
+        if bound_timestamp is None:
+            return 0
+
+        # +1: the window lower bound is inclusive across all backends (an
+        # item counts while timestamp >= now - interval). Returning the bare
+        # difference lands the retry exactly ON the boundary, where the item
+        # is still counted, so the re-put fails and waiting() then returns 0
+        # -> _delay_waiter busy-spins. One extra ms pushes strictly past it.
+        return bound_timestamp - (now - rate.interval) + 1
+
+
+class StatefulAlgorithm(Algorithm):
+    """An algorithm keeping a fixed-size state per rate instead of an item log.
+
+    Backends persist one ``State`` per rate - a tuple with one number per
+    ``state_fields`` entry, keyed by the rate's interval - and call ``check``
+    with the stored states. Nothing accumulates, so there is nothing to leak and
+    no log to ``peek``: the wait is returned in closed form on the
+    ``Decision`` instead.
+
+    ``name`` identifies the algorithm in storage (table/key suffixes), so
+    switching algorithms never reads state written by another one.
+    """
+
+    name: str
+    state_fields: Tuple[str, ...]
+
+    @abstractmethod
+    def initial_state(self, rate: Rate) -> State:
+        """State of a rate that has never admitted anything."""
+
+    @abstractmethod
+    def check(self, rates: List[Rate], states: Sequence[State], now: int, weight: int) -> Tuple[Decision, List[State]]:
+        """Decide whether ``weight`` units fit at ``now``.
+
+        Returns the decision and the states to persist: the advanced states
+        when admitted, the input states unchanged when rejected.
+        """
+
+    @abstractmethod
+    def outstanding(self, rates: List[Rate], states: Sequence[State], now: int) -> int:
+        """Units still counted against the widest rate at ``now``; what
+        ``count()`` reports for a stateful bucket."""
+
+    def admit(self, rates: List[Rate], counts: Sequence[float], weight: int) -> Decision:
+        """Plain limit check over (possibly estimated) per-rate counts."""
+        return _admit_counts(rates, counts, weight)
+
+    def leak_bound(self, rates: List[Rate], now: int) -> int:
+        # State never outgrows its fixed size; nothing is ever below the bound
+        # a bucket would leak, but keep the log's definition for consistency.
+        return now - rates[-1].interval
+
+
+class GCRA(StatefulAlgorithm):
+    """Generic cell rate algorithm (the "virtual scheduling" token bucket).
+
+    Per rate it keeps a single theoretical arrival time (TAT): the moment the
+    rate would be fully drained again. Every unit pushes the TAT forward by the
+    emission interval ``interval / limit``, and an item is admitted while the
+    pushed TAT stays within one ``interval`` of now. A burst of up to ``limit``
+    units is therefore allowed, after which units are admitted one emission
+    interval apart - traffic is smoothed instead of waiting for the whole window
+    to roll over as with ``SlidingWindowLog``.
+
+    The wait for a rejected item is exact and needs no lookup:
+    ``new_tat - interval - now``.
+    """
+
+    name = "gcra"
+    state_fields = ("tat",)
+
+    def initial_state(self, rate: Rate) -> State:
+        return (0.0,)
+
+    def check(self, rates: List[Rate], states: Sequence[State], now: int, weight: int) -> Tuple[Decision, List[State]]:
+        new_states: List[State] = []
+        failing_rate: Optional[Rate] = None
+        retry_after = 0.0
+
+        for rate, (tat,) in zip(rates, states, strict=True):
+            new_tat = max(tat, now) + weight * rate.interval / rate.limit
+            allow_at = new_tat - rate.interval
+
+            if allow_at > now:
+                failing_rate = failing_rate or rate
+                # The item must fit every rate at once, so wait for the slowest.
+                retry_after = max(retry_after, allow_at - now)
+
+            new_states.append((new_tat,))
+
+        if failing_rate is not None:
+            return Decision(failing_rate=failing_rate, retry_after=ceil(retry_after)), list(states)
+
+        return Decision(), new_states
+
+    def outstanding(self, rates: List[Rate], states: Sequence[State], now: int) -> int:
+        rate = rates[-1]
+        (tat,) = states[-1]
+        return max(0, ceil((tat - now) * rate.limit / rate.interval))
+
+
+class SlidingWindowCounter(StatefulAlgorithm):
+    """Approximate sliding window from two fixed-window counters per rate.
+
+    Windows are aligned to multiples of the rate's interval. Each rate keeps the
+    start of the current window and the units admitted in it and in the window
+    before; the count over the sliding window ending now is estimated by
+    weighting the previous window by the fraction of it still covered::
+
+        estimate = previous * (1 - elapsed / interval) + current
+
+    Memory is three numbers per rate however large the limit.
+
+    Error bound: the estimate assumes the previous window's units were spread
+    evenly. The true count over any sliding window is at most
+    ``current + previous``, so it can exceed the limit by at most the
+    uncovered share ``previous * elapsed / interval``. That overshoot is less
+    than ``limit``, so no sliding window ever holds ``2 * limit`` units.
+    Traffic that is spread evenly is limited (almost) exactly, and bursty
+    traffic at the end of a window may instead be rejected slightly early.
+    """
+
+    name = "swc"
+    state_fields = ("window_start", "previous", "current")
+
+    def initial_state(self, rate: Rate) -> State:
+        return (0.0, 0.0, 0.0)
+
+    @staticmethod
+    def _roll(rate: Rate, state: State, now: int) -> State:
+        """Advance ``state`` to the window containing ``now``."""
+        window_start, previous, current = state
+        now_window = now - now % rate.interval
+
+        if now_window <= window_start:
+            return state
+
+        if now_window == window_start + rate.interval:
+            return (now_window, current, 0.0)
+
+        return (now_window, 0.0, 0.0)
+
+    @staticmethod
+    def _estimate(rate: Rate, state: State, now: int) -> float:
+        window_start, previous, current = state
+        elapsed = min(max(now - window_start, 0), rate.interval)
+        return previous * (1 - elapsed / rate.interval) + current
+
+    @staticmethod
+    def _fits_at(rate: Rate, state: State, weight: int) -> float:
+        """Earliest timestamp at which ``weight`` more units fit, given the
+        rolled ``state`` and no further admissions."""
+        window_start, previous, current = state
+        interval, limit = rate.interval, rate.limit
+        room = limit - current - weight
+
+        # Still in this window: the previous window's share decays linearly.
+        if room >= 0 and previous > 0:
+            at = window_start + interval * (1 - room / previous)
+            if at < window_start + interval:
+                return at
+
+        # Otherwise in the next window, where `current` becomes the decaying share.
+        next_start = window_start + interval
+        if current <= 0 or weight + current <= limit:
+            return next_start
+
+        return next_start + interval * (1 - (limit - weight) / current)
+
+    def check(self, rates: List[Rate], states: Sequence[State], now: int, weight: int) -> Tuple[Decision, List[State]]:
+        new_states: List[State] = []
+        failing_rate: Optional[Rate] = None
+        retry_at = float(now)
+
+        for rate, state in zip(rates, states, strict=True):
+            rolled = self._roll(rate, state, now)
+
+            if self._estimate(rate, rolled, now) + weight > rate.limit:
+                failing_rate = failing_rate or rate
+                retry_at = max(retry_at, self._fits_at(rate, rolled, weight))
+
+            window_start, previous, current = rolled
+            new_states.append((window_start, previous, current + weight))
+
+        if failing_rate is not None:
+            return Decision(failing_rate=failing_rate, retry_after=max(ceil(retry_at - now), 1)), list(states)
+
+        return Decision(), new_states
+
+    def outstanding(self, rates: List[Rate], states: Sequence[State], now: int) -> int:
+        rate = rates[-1]
+        return ceil(self._estimate(rate, self._roll(rate, states[-1], now), now))
@@ -8,11 +8,11 @@ from abc import ABC, abstractmethod
 from collections import defaultdict
 from inspect import isawaitable, iscoroutine
 from threading import Event, Thread
-from typing import Any, Awaitable, Dict, List, Optional, Type, Union
+from typing import Any, Awaitable, Dict, List, Optional, Sequence, Tuple, Type, Union
 
 from ..clocks import AbstractClock, MonotonicClock
 from ..utils import enforce_rate_list
-from .algorithm import Algorithm, SlidingWindowLog
+from .algorithm import Algorithm, Decision, SlidingWindowLog, StatefulAlgorithm
 from .rate import Rate, RateItem
 
 logger = logging.getLogger("pyrate_limiter")
@@ -27,17 +27,26 @@ class AbstractBucket(ABC):
     _rates: List[Rate]
     failing_rate: Optional[Rate] = None
     _clock: AbstractClock = MonotonicClock()
-    # The rate-limiting policy this bucket enforces. Internal in v4 (every
-    # bucket uses the sliding-window-log default and delegates its per-rate
-    # admit decision + leak bound to it); v5 makes this a constructor argument
-    # so algorithms (GCRA, sliding-window-counter) become pluggable.
+    # The rate-limiting policy this bucket enforces. Every bucket delegates
+    # its per-rate admit decision + leak bound to it; backends that support
+    # more than the sliding-window-log default take an ``algorithm=``
+    # constructor argument (see ``_use_algorithm``).
     _algorithm: Algorithm = SlidingWindowLog()
+    # ``(weight, timestamp)`` at which the last rejected item fits again, when
+    # the put's own check returned it (``Decision.retry_after``). ``waiting()``
+    # answers from it instead of a second ``peek`` round trip.
+    _retry: Optional[Tuple[int, int]] = None
     # Whether this bucket's operations return awaitables. ``None`` means
     # "unknown" - the Leaker then probes once by calling ``leak(0)`` and
     # checking for a coroutine. Built-in sync/async buckets declare this so no
     # side-effecting probe is needed; ``RedisBucket`` leaves it ``None`` because
     # it may wrap either a sync or an async client (issue #305).
     is_async: Optional[bool] = None
+    # Whether the bucket needs the background Leaker to stay bounded. Buckets
+    # whose storage cannot outgrow the rate limit (e.g. ``RingBufferBucket``,
+    # which overwrites its oldest slots) declare ``False``; they are still
+    # registered with the factory but never keep a leak thread/task alive.
+    requires_leak: bool = True
 
     @property
     def rates(self) -> List[Rate]:
@@ -65,6 +74,32 @@ class AbstractBucket(ABC):
         """Retrieve current timestamp from the clock backend."""
         return self._clock.now()
 
+    @property
+    def stateful(self) -> bool:
+        """Whether the bucket keeps per-rate state instead of an item log."""
+        return isinstance(self._algorithm, StatefulAlgorithm)
+
+    def _use_algorithm(self, algorithm: Optional[Algorithm], supported: Tuple[Type[Algorithm], ...]) -> None:
+        """Select ``algorithm`` for this bucket, or keep the default when None."""
+        if algorithm is None:
+            return
+
+        if not isinstance(algorithm, supported):
+            raise ValueError(f"{type(self).__name__} does not support {type(algorithm).__name__}")
+
+        self._algorithm = algorithm
+
+    def _apply_decision(self, decision: Decision, item: RateItem) -> bool:
+        """Record a put's decision: set ``failing_rate`` and cache the retry."""
+        self.failing_rate = decision.failing_rate
+
+        if decision.allowed or decision.retry_after is None:
+            self._retry = None
+        else:
+            self._retry = (item.weight, item.timestamp + decision.retry_after)
+
+        return decision.allowed
+
     @abstractmethod
     def put(self, item: RateItem) -> Union[bool, Awaitable[bool]]:
         """Put an item (typically the current time) in the bucket
@@ -95,6 +130,32 @@ class AbstractBucket(ABC):
         we can't really tell how many outdated items are still in the queue
         """
 
+    def put_many(self, entries: Sequence[Tuple["AbstractBucket", RateItem]]) -> Union[int, Awaitable[int]]:
+        """Put each ``(bucket, item)`` pair, all or nothing, coordinated by
+        ``self`` (the first pair's bucket).
+
+        Return -1 when every item was admitted; otherwise nothing is kept and
+        the index of a rejected pair is returned, with that pair's bucket
+        ``failing_rate`` set so ``waiting()`` works as after ``put``.
+
+        The default handles a single pair. Backends able to commit to several
+        buckets atomically (one lock set, script or transaction) override it
+        and raise ``NotImplementedError`` for combinations they cannot cover.
+        """
+        if len(entries) != 1 or entries[0][0] is not self:
+            raise NotImplementedError(f"{type(self).__name__} can't put into several buckets atomically")
+
+        result = self.put(entries[0][1])
+
+        if isawaitable(result):
+
+            async def _awaiting():
+                return -1 if await result else 0
+
+            return _awaiting()
+
+        return -1 if result else 0
+
     def waiting(self, item: RateItem) -> Union[int, Awaitable[int]]:
         """Calculate time until bucket become availabe to consume an item again"""
         if self.failing_rate is None:
@@ -105,6 +166,9 @@ class AbstractBucket(ABC):
         if item.weight > self.failing_rate.limit:
             return -1
 
+        if self._retry is not None and self._retry[0] == item.weight:
+            return max(self._retry[1] - item.timestamp, 0)
+
         bound_item = self.peek(self.failing_rate.limit - item.weight)
 
         if bound_item is None:
@@ -113,14 +177,7 @@ class AbstractBucket(ABC):
 
         def _calc_waiting(inner_bound_item: RateItem) -> int:
             assert self.failing_rate is not None  # NOTE: silence mypy
-            lower_time_bound = item.timestamp - self.failing_rate.interval
-            upper_time_bound = inner_bound_item.timestamp
-            # +1: the window lower bound is inclusive across all backends (an
-            # item counts while timestamp >= now - interval). Returning the bare
-            # difference lands the retry exactly ON the boundary, where the item
-            # is still counted, so the re-put fails and waiting() then returns 0
-            # -> _delay_waiter busy-spins. One extra ms pushes strictly past it.
-            return upper_time_bound - lower_time_bound + 1
+            return SlidingWindowLog.retry_after(self.failing_rate, item.timestamp, inner_bound_item.timestamp)
 
         async def _calc_waiting_async() -> int:
             nonlocal bound_item
@@ -236,6 +293,9 @@ class Leaker:
         while not self._stop_event.is_set() and buckets:
             try:
                 for _, bucket in tuple(buckets.items()):
+                    if not bucket.requires_leak:
+                        continue
+
                     now = bucket.now()
 
                     while isawaitable(now):
@@ -254,8 +314,12 @@ class Leaker:
                 logger.debug("Leak task stopped due to event loop shutdown. %s", e)
                 return
 
+    @staticmethod
+    def _any_requires_leak(buckets: Dict[int, AbstractBucket]) -> bool:
+        return any(bucket.requires_leak for bucket in buckets.values())
+
     def leak_async(self):
-        if self.async_buckets and not self.aio_leak_task:
+        if self.async_buckets and not self.aio_leak_task and self._any_requires_leak(self.async_buckets):
             self.aio_leak_task = asyncio.create_task(self._leak(self.async_buckets))
 
     def is_alive(self) -> bool:
@@ -274,7 +338,7 @@ class Leaker:
         ``Thread`` cannot be restarted, so we create a fresh one here instead of
         re-starting the dead one (which would raise ``RuntimeError``).
         """
-        if self.sync_buckets and not self.is_alive():
+        if self.sync_buckets and not self.is_alive() and self._any_requires_leak(self.sync_buckets):
             self._stop_event.clear()
             self._thread = Thread(target=self._run, name=self.name, daemon=True)
             self._thread.start()
@@ -26,6 +26,16 @@ class BucketAsyncWrapper(AbstractBucket):
 
         return result
 
+    async def put_many(self, entries):
+        # Coordinate on the wrapped buckets, so backends see their own type.
+        unwrapped = [(bucket.bucket if isinstance(bucket, BucketAsyncWrapper) else bucket, item) for bucket, item in entries]
+        result = self.bucket.put_many(unwrapped)
+
+        while isawaitable(result):
+            result = await result
+
+        return result
+
     async def count(self):
         result = self.bucket.count()
 
@@ -77,6 +87,14 @@ class BucketAsyncWrapper(AbstractBucket):
     def failing_rate(self):
         return self.bucket.failing_rate
 
+    @property
+    def requires_leak(self):
+        return self.bucket.requires_leak
+
+    @property
+    def _retry(self):
+        return self.bucket._retry
+
     @property
     def rates(self):
         return self.bucket.rates
@@ -1,21 +1,33 @@
 # flake8: noqa
 """Concrete bucket implementations"""
 
+from .array_bucket import ArrayBucket as ArrayBucket
 from .in_memory_bucket import InMemoryBucket as InMemoryBucket
 from .mp_bucket import MultiprocessBucket as MultiprocessBucket
+from .postgres import AsyncPostgresBucket as AsyncPostgresBucket
 from .postgres import PostgresBucket as PostgresBucket
+from .postgres import PostgresBucketFactory as PostgresBucketFactory
 from .postgres import Queries as PgQueries
+from .redis_bucket import RedisBatcher as RedisBatcher
 from .redis_bucket import RedisBucket as RedisBucket
+from .ring_buffer_bucket import RingBufferBucket as RingBufferBucket
+from .shared_memory_bucket import SharedMemoryBucket as SharedMemoryBucket
 from .sqlite_bucket import Queries as SQLiteQueries
 from .sqlite_bucket import SQLiteBucket as SQLiteBucket
 from .sqlite_bucket import SQLiteClock as SQLiteClock
 
 __all__ = [
+    "ArrayBucket",
+    "AsyncPostgresBucket",
     "InMemoryBucket",
     "MultiprocessBucket",
     "PostgresBucket",
+    "PostgresBucketFactory",
     "PgQueries",
+    "RedisBatcher",
     "RedisBucket",
+    "RingBufferBucket",
+    "SharedMemoryBucket",
     "SQLiteQueries",
     "SQLiteBucket",
     "SQLiteClock",
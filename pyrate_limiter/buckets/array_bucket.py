@@ -0,0 +1,191 @@
+"""In-memory bucket storing timestamps in a contiguous integer array"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from threading import RLock
+from typing import Awaitable, List, Optional, Sequence, Tuple, Union
+
+from ..abstracts.algorithm import Decision, SlidingWindowLog
+from ..abstracts.bucket import AbstractBucket
+from ..abstracts.rate import Rate, RateItem
+from .in_memory_bucket import _in_memory_batch, _put_many_in_memory
+
+# Leaked entries are only dropped from the front of the arrays once they make
+# up at least half of it (and this many entries), so a leak costs O(1)
+# amortized instead of an O(n) memmove every time.
+_COMPACT_THRESHOLD = 1024
+
+
+class ArrayBucket(AbstractBucket):
+    """In-memory bucket keeping timestamps in an ``array('q')``
+
+    Same sliding-window-log semantics as ``InMemoryBucket``, but instead of a
+    list of ``RateItem`` objects it stores raw 64-bit timestamps, so an admitted
+    call costs 8 bytes instead of a full Python object, and the bisects in
+    ``put``/``leak`` compare plain ints without a key function.
+
+    - Weights are run-length encoded like ``InMemoryBucket``: a prefix array of
+      cumulative weights is allocated on the first put with ``weight > 1``, so
+      unit-weight workloads never pay for it.
+    - Names are not kept unless ``keep_names=True``; ``peek`` then returns items
+      with an empty name, which is all ``waiting()`` needs.
+    - Leaking moves a head index; the arrays are compacted once the leaked
+      prefix makes up half of them.
+    """
+
+    is_async = False
+    failing_rate: Optional[Rate]
+
+    def __init__(self, rates: List[Rate], keep_names: bool = False):
+        self.rates = rates  # AbstractBucket.rates setter sorts + validates
+        self._timestamps = array("q")
+        # None while every stored weight is 1; see _total()/_weight_from().
+        self._cumulative: Optional[array] = None
+        self._names: Optional[List[str]] = [] if keep_names else None
+        # Index of the oldest entry that has not been leaked yet.
+        self._head = 0
+        # Same role as InMemoryBucket._lock: the Leaker thread calls leak()
+        # without holding the Limiter lock.
+        self._lock = RLock()
+
+    def _total(self) -> int:
+        """Total weight ever stored in the arrays (leaked entries included)."""
+        if self._cumulative is None:
+            return len(self._timestamps)
+        return self._cumulative[-1]
+
+    def _weight_from(self, idx: int) -> int:
+        """Total weight of the entries from ``idx`` to the latest."""
+        if self._cumulative is None:
+            return len(self._timestamps) - idx
+        return self._cumulative[-1] - self._cumulative[idx]
+
+    def put(self, item: RateItem) -> bool:
+        if item.weight == 0:
+            return True
+
+        with self._lock:
+            timestamps = self._timestamps
+            after_length = item.weight + self._weight_from(self._head)
+
+            for rate in self.rates:
+                if after_length < rate.limit:
+                    break
+
+                lower_bound_idx = bisect_left(timestamps, item.timestamp - rate.interval, self._head)
+
+                if rate.limit - self._weight_from(lower_bound_idx) < item.weight:
+                    # Same bound unit waiting() would peek, read under this lock.
+                    bound = self.peek(rate.limit - item.weight)
+                    retry_after = SlidingWindowLog.retry_after(rate, item.timestamp, bound.timestamp if bound else None)
+                    return self._apply_decision(Decision(failing_rate=rate, retry_after=retry_after), item)
+
+            if item.weight > 1 and self._cumulative is None:
+                self._cumulative = array("q", range(len(timestamps) + 1))
+
+            if self._cumulative is not None:
+                self._cumulative.append(self._cumulative[-1] + item.weight)
+
+            timestamps.append(item.timestamp)
+
+            if self._names is not None:
+                self._names.append(item.name)
+
+            return self._apply_decision(Decision(), item)
+
+    def put_many(self, entries: Sequence[Tuple[AbstractBucket, RateItem]]) -> Union[int, Awaitable[int]]:
+        if not _in_memory_batch(entries):
+            return super().put_many(entries)
+
+        return _put_many_in_memory(entries)
+
+    def _snapshot(self, weight: int):
+        return len(self._timestamps), self._cumulative is None
+
+    def _restore(self, snapshot) -> None:
+        # Puts only append, and leak() needs the lock held since the snapshot.
+        length, unit_weights = snapshot
+        del self._timestamps[length:]
+
+        if unit_weights:
+            self._cumulative = None
+        elif self._cumulative is not None:
+            del self._cumulative[length + 1 :]
+
+        if self._names is not None:
+            del self._names[length:]
+
+    def leak(self, current_timestamp: Optional[int] = None) -> int:
+        assert current_timestamp is not None
+        with self._lock:
+            lower_bound = self._algorithm.leak_bound(self.rates, current_timestamp)
+            idx = bisect_left(self._timestamps, lower_bound, self._head)
+
+            if idx == self._head:
+                return 0
+
+            remove_count = self._weight_from(self._head) - self._weight_from(idx)
+            self._head = idx
+
+            if idx >= _COMPACT_THRESHOLD and idx * 2 >= len(self._timestamps):
+                self._compact()
+
+            return remove_count
+
+    def _compact(self) -> None:
+        """Drop the leaked prefix of every array."""
+        head = self._head
+        del self._timestamps[:head]
+
+        if self._cumulative is not None:
+            del self._cumulative[:head]
+
+        if self._names is not None:
+            del self._names[:head]
+
+        self._head = 0
+
+    def flush(self) -> None:
+        with self._lock:
+            self.failing_rate = None
+            self._timestamps = array("q")
+            self._cumulative = None
+            self._names = [] if self._names is not None else None
+            self._head = 0
+
+    def count(self) -> int:
+        with self._lock:
+            return self._weight_from(self._head)
+
+    def peek(self, index: int) -> Optional[RateItem]:
+        """Return the item holding the ``index``-th unit of weight, counting
+        from the latest unit backwards (see ``InMemoryBucket.peek``)."""
+        with self._lock:
+            count = self.count()
+
+            if not abs(index) < count:
+                return None
+
+            if index < 0:
+                index += count
+
+            position = self._total() - 1 - index
+
+            if self._cumulative is None:
+                idx, weight = position, 1
+            else:
+                idx = bisect_right(self._cumulative, position, self._head) - 1
+                weight = self._cumulative[idx + 1] - self._cumulative[idx]
+
+            name = self._names[idx] if self._names is not None else ""
+            return RateItem(name, self._timestamps[idx], weight=weight)
+
+    def __getstate__(self):
+        """Drop the thread lock for pickling, like ``InMemoryBucket``."""
+        state = self.__dict__.copy()
+        state.pop("_lock", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = RLock()
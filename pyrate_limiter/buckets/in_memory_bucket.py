@@ -1,10 +1,13 @@
 """Naive bucket implementation using built-in list"""
 
-from bisect import bisect_left
+from bisect import bisect_left, bisect_right
+from contextlib import ExitStack
+from itertools import accumulate
 from operator import attrgetter
 from threading import RLock
-from typing import List, Optional
+from typing import Awaitable, List, Optional, Sequence, Tuple, Union
 
+from ..abstracts.algorithm import Algorithm, Decision, SlidingWindowLog, State, StatefulAlgorithm
 from ..abstracts.bucket import AbstractBucket
 from ..abstracts.rate import Rate, RateItem
 
@@ -12,6 +15,39 @@ from ..abstracts.rate import Rate, RateItem
 _by_timestamp = attrgetter("timestamp")
 
 
+def _in_memory_batch(entries: Sequence[Tuple[AbstractBucket, RateItem]]) -> bool:
+    """Whether every bucket of ``entries`` can take part in ``_put_many_in_memory``:
+    the in-memory buckets, which snapshot and restore their state under their
+    own ``_lock``."""
+    return all(hasattr(bucket, "_snapshot") and hasattr(bucket, "_lock") for bucket, _ in entries)
+
+
+def _put_many_in_memory(entries: Sequence[Tuple[AbstractBucket, RateItem]]) -> int:
+    """All-or-nothing put across in-memory buckets: every bucket lock is
+    held (in a fixed order, so concurrent batches cannot deadlock) while
+    the items are put one by one, and the buckets are restored to their
+    snapshots if any item is rejected. ``_snapshot`` is given the weight the
+    batch puts into that bucket."""
+    buckets = sorted({id(bucket): bucket for bucket, _ in entries}.values(), key=id)
+
+    with ExitStack() as stack:
+        for bucket in buckets:
+            stack.enter_context(bucket._lock)  # type: ignore[attr-defined]
+
+        snapshots = [
+            bucket._snapshot(sum(item.weight for owner, item in entries if owner is bucket))  # type: ignore[attr-defined]
+            for bucket in buckets
+        ]
+
+        for idx, (bucket, item) in enumerate(entries):
+            if not bucket.put(item):
+                for restored, snapshot in zip(buckets, snapshots, strict=True):
+                    restored._restore(snapshot)  # type: ignore[attr-defined]
+                return idx
+
+    return -1
+
+
 class InMemoryBucket(AbstractBucket):
     """Simple In-memory Bucket using native list
     Clock can be either `time.time` or `time.monotonic`
@@ -19,17 +55,32 @@ class InMemoryBucket(AbstractBucket):
     Pros: fast, safe, and precise
     Cons: since it resides in local memory, the data is not persistent, nor scalable
     Usecase: small applications, simple logic
+
+    Items are stored run-length encoded: one entry per successful ``put``,
+    whatever its weight, alongside a prefix array of cumulative weights.
+    ``_cumulative[i]`` is the total weight put *before* ``items[i]`` (it has one
+    more element than ``items``), so the weight of every item from index ``i``
+    onwards is ``_cumulative[-1] - _cumulative[i]``. A window count is then a
+    bisect plus a subtraction, and memory scales with the number of calls
+    rather than with their total weight.
+
+    With a ``StatefulAlgorithm`` (e.g. ``algorithm=GCRA()``) no items are kept
+    at all: the bucket holds one small state per rate, ``peek`` has nothing to
+    return and ``leak`` nothing to remove.
     """
 
     items: List[RateItem]
     failing_rate: Optional[Rate]
     is_async = False
 
-    def __init__(self, rates: List[Rate]):
+    def __init__(self, rates: List[Rate], algorithm: Optional[Algorithm] = None):
         super().__init__()
 
         self.rates = rates  # AbstractBucket.rates setter sorts + validates
+        self._use_algorithm(algorithm, (SlidingWindowLog, StatefulAlgorithm))
         self.items = []
+        self._cumulative: List[int] = [0]
+        self._states: List[State] = self._initial_states()
         # Guards `self.items` against the background Leaker thread, which calls
         # leak() WITHOUT holding the Limiter lock. Without this, leak()'s
         # `del self.items[:idx]` can interleave with put()/peek() and corrupt
@@ -41,14 +92,18 @@ class InMemoryBucket(AbstractBucket):
         if item.weight == 0:
             return True
 
+        if self.stateful:
+            return self._put_stateful(item)
+
         with self._lock:
             # In-memory native implementation of the SlidingWindowLog policy
             # (see self._algorithm): the admit decision is the same
             # `limit - count < weight` check, kept inline here so the
             # `after_length < limit` shortcut can skip the bisect entirely
             # rather than materialising a full per-rate counts list.
-            current_length = len(self.items)
-            after_length = item.weight + current_length
+            cumulative = self._cumulative
+            total_weight = cumulative[-1]
+            after_length = item.weight + total_weight - cumulative[0]
 
             for rate in self.rates:
                 if after_length < rate.limit:
@@ -58,39 +113,69 @@ class InMemoryBucket(AbstractBucket):
                 # First item still inside this rate's window (timestamp >= lower bound).
                 # When all items are older, bisect returns len(items) -> 0 in window.
                 lower_bound_idx = bisect_left(self.items, lower_bound_value, key=_by_timestamp)
-                count_existing_items = len(self.items) - lower_bound_idx
+                count_existing_items = total_weight - cumulative[lower_bound_idx]
                 space_available = rate.limit - count_existing_items
 
                 if space_available < item.weight:
-                    self.failing_rate = rate
-                    return False
+                    # Same bound unit waiting() would peek, read under this lock.
+                    bound = self._unit_at(rate.limit - item.weight)
+                    retry_after = SlidingWindowLog.retry_after(rate, item.timestamp, bound.timestamp if bound else None)
+                    return self._apply_decision(Decision(failing_rate=rate, retry_after=retry_after), item)
+
+            self.items.append(item)
+            cumulative.append(total_weight + item.weight)
+            return self._apply_decision(Decision(), item)
+
+    def _initial_states(self) -> List[State]:
+        if not isinstance(self._algorithm, StatefulAlgorithm):
+            return []
+        return [self._algorithm.initial_state(rate) for rate in self.rates]
+
+    def _put_stateful(self, item: RateItem) -> bool:
+        assert isinstance(self._algorithm, StatefulAlgorithm)
+        with self._lock:
+            decision, self._states = self._algorithm.check(self.rates, self._states, item.timestamp, item.weight)
+            return self._apply_decision(decision, item)
 
-            self.failing_rate = None
+    def put_many(self, entries: Sequence[Tuple[AbstractBucket, RateItem]]) -> Union[int, Awaitable[int]]:
+        if not _in_memory_batch(entries):
+            return super().put_many(entries)
 
-            if item.weight > 1:
-                self.items.extend([item for _ in range(item.weight)])
-            else:
-                self.items.append(item)
+        return _put_many_in_memory(entries)
 
-            return True
+    def _snapshot(self, weight: int):
+        return len(self.items), list(self._states) if self.stateful else None
+
+    def _restore(self, snapshot) -> None:
+        # Only called with the lock held since the snapshot, so the appended
+        # entries are still the last ones (leak() needs the same lock).
+        length, states = snapshot
+        del self.items[length:]
+        del self._cumulative[length + 1 :]
+        if states is not None:
+            self._states = states
 
     def leak(self, current_timestamp: Optional[int] = None) -> int:
         assert current_timestamp is not None
         with self._lock:
             if self.items:
                 lower_bound = self._algorithm.leak_bound(self.rates, current_timestamp)
+                cumulative = self._cumulative
 
                 if lower_bound > self.items[-1].timestamp:
-                    remove_count = len(self.items)
+                    remove_count = cumulative[-1] - cumulative[0]
                     del self.items[:]
+                    del cumulative[:-1]
                     return remove_count
 
                 if lower_bound < self.items[0].timestamp:
                     return 0
 
                 idx = bisect_left(self.items, lower_bound, key=_by_timestamp)
+                remove_count = cumulative[idx] - cumulative[0]
                 del self.items[:idx]
-                return idx
+                del cumulative[:idx]
+                return remove_count
 
             return 0
 
@@ -98,17 +183,46 @@ class InMemoryBucket(AbstractBucket):
         with self._lock:
             self.failing_rate = None
             del self.items[:]
+            del self._cumulative[:-1]
+            self._states = self._initial_states()
+
+    def _load(self, items: List[RateItem]) -> None:
+        """Replace the contents with ``items``, sorted by timestamp, one entry
+        per put, and rebuild the prefix array to match."""
+        with self._lock:
+            self.items[:] = items
+            self._cumulative[:] = accumulate((item.weight for item in items), initial=0)
 
     def count(self) -> int:
         with self._lock:
-            return len(self.items)
+            if isinstance(self._algorithm, StatefulAlgorithm):
+                return self._algorithm.outstanding(self.rates, self._states, self.now())
+
+            return self._cumulative[-1] - self._cumulative[0]
 
     def peek(self, index: int) -> RateItem | None:
+        """Return the item holding the ``index``-th unit of weight, counting
+        from the latest unit backwards, as if every unit were stored."""
+        if self.stateful:
+            return None
+
         with self._lock:
-            if not self.items:
-                return None
+            return self._unit_at(index)
+
+    def _unit_at(self, index: int) -> Optional[RateItem]:
+        cumulative = self._cumulative
+        count = cumulative[-1] - cumulative[0]
+
+        if not abs(index) < count:
+            return None
+
+        if index < 0:
+            index += count
 
-            return self.items[-1 - index] if abs(index) < self.count() else None
+        # Absolute position of the unit; the entry holding it is the last
+        # one whose starting position is <= that unit.
+        position = cumulative[-1] - 1 - index
+        return self.items[bisect_right(cumulative, position) - 1]
 
     def __getstate__(self):
         """A threading RLock can't be pickled; drop it and recreate on
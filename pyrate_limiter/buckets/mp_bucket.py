@@ -1,9 +1,9 @@
-"""multiprocessing In-memory Bucket using a multiprocessing.Manager.ListProxy
+"""multiprocessing In-memory Bucket using multiprocessing.Manager.ListProxy
 and a multiprocessing.Lock.
 """
 
 from multiprocessing import Manager, RLock
-from multiprocessing.managers import ListProxy
+from multiprocessing.managers import ListProxy, SyncManager
 from multiprocessing.synchronize import RLock as LockType
 from typing import List, Optional
 
@@ -16,14 +16,28 @@ class MultiprocessBucket(InMemoryBucket):
     items: List[RateItem]  # ListProxy
     mp_lock: LockType
 
-    def __init__(self, rates: List[Rate], items: List[RateItem], mp_lock: LockType):
+    def __init__(self, rates: List[Rate], items: List[RateItem], mp_lock: LockType, cumulative: Optional[List[int]] = None):
         if not isinstance(items, ListProxy):  # pragma: no cover - guard only
             raise ValueError("items must be a ListProxy")
 
+        if cumulative is None:
+            # A proxy unpickled in another process no longer knows its
+            # manager; a prefix array on a new one would be private to this
+            # process and drift from the shared items.
+            manager = getattr(items, "_manager", None)
+            if manager is None:
+                raise ValueError("cumulative is required when items' manager is not in this process; build the bucket with MultiprocessBucket.init()")
+            cumulative = self._prefix_weights(items, mp_lock, manager)
+        elif not isinstance(cumulative, ListProxy):  # pragma: no cover - guard only
+            raise ValueError("cumulative must be a ListProxy")
+
         self._clock = MonotonicClock()
 
         self.rates = rates  # AbstractBucket.rates setter sorts + validates
         self.items = items
+        # InMemoryBucket's prefix array of cumulative weights; shared across
+        # processes alongside `items` so run-length entries stay consistent.
+        self._cumulative = cumulative
         self.mp_lock = mp_lock
         # InMemoryBucket.put/peek/count/flush guard `self.items` via self._lock
         # (issue #300). MultiprocessBucket does NOT call super().__init__(), so
@@ -32,6 +46,16 @@ class MultiprocessBucket(InMemoryBucket):
         # reentrant RLock tolerates put()/leak() re-acquiring it via super().
         self._lock = mp_lock  # type: ignore[assignment]
 
+    @staticmethod
+    def _prefix_weights(items: List[RateItem], mp_lock: LockType, manager: SyncManager) -> List[int]:
+        """Build the shared prefix array for ``items`` on ``manager``, the
+        one that holds them."""
+        with mp_lock:
+            cumulative = [0]
+            for item in items:
+                cumulative.append(cumulative[-1] + item.weight)
+            return manager.list(cumulative)  # type: ignore[return-value]
+
     def put(self, item: RateItem) -> bool:
         with self.mp_lock:
             return super().put(item)
@@ -56,10 +80,11 @@ class MultiprocessBucket(InMemoryBucket):
         rates: List[Rate],
     ):
         """
-        Creates a single ListProxy so that this bucket can be shared across multiple processes.
+        Creates the shared ListProxies so that this bucket can be shared across multiple processes.
         """
-        shared_items: List[RateItem] = Manager().list()  # type: ignore[assignment]
-
+        manager = Manager()
+        shared_items: List[RateItem] = manager.list()  # type: ignore[assignment]
         mp_lock: LockType = RLock()
+        shared_cumulative = cls._prefix_weights(shared_items, mp_lock, manager)
 
-        return cls(rates=rates, items=shared_items, mp_lock=mp_lock)
+        return cls(rates=rates, items=shared_items, mp_lock=mp_lock, cumulative=shared_cumulative)
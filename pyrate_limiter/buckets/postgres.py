@@ -3,16 +3,19 @@
 from __future__ import annotations
 
 import logging
-from contextlib import contextmanager
-from typing import TYPE_CHECKING, Awaitable, List, Optional, Union
+from contextlib import contextmanager, nullcontext
+from copy import copy
+from inspect import isawaitable
+from typing import TYPE_CHECKING, Awaitable, Callable, List, Optional, Sequence, Tuple, Union
 
-from ..abstracts import AbstractBucket, Rate, RateItem
-from ..clocks import PostgresClock
+from ..abstracts import AbstractBucket, Algorithm, BucketFactory, Decision, Rate, RateItem, SlidingWindowLog, StatefulAlgorithm
+from ..abstracts.algorithm import State
+from ..clocks import AsyncPostgresClock, PostgresClock
 
 logger = logging.getLogger(__name__)
 
 if TYPE_CHECKING:
-    from psycopg_pool import ConnectionPool  # type: ignore[import-untyped]
+    from psycopg_pool import AsyncConnectionPool, ConnectionPool  # type: ignore[import-untyped]
 
 
 class Queries:
@@ -26,19 +29,44 @@ class Queries:
     CREATE_BUCKET_TABLE = """
     CREATE TABLE IF NOT EXISTS {table} (
         name VARCHAR,
-        weight SMALLINT,
+        weight {weight_type},
         item_timestamp TIMESTAMP
     )
     """
+    # weighted_rows: one row carries a whole put's weight, which SMALLINT
+    # would overflow past 32767; tables created without it are widened.
+    WEIGHT_IS_SMALLINT = """
+    SELECT 1 FROM pg_attribute
+    WHERE attrelid = to_regclass(%s) AND attname = 'weight' AND atttypid = 'smallint'::regtype
+    """
+    WIDEN_WEIGHT = """
+    ALTER TABLE {table} ALTER COLUMN weight TYPE INTEGER
+    """
     CREATE_INDEX_ON_TIMESTAMP = """
     CREATE INDEX IF NOT EXISTS {index} ON {table} (item_timestamp)
     """
     LOCK_TABLE = """
     LOCK TABLE {table} IN EXCLUSIVE MODE NOWAIT
     """
+    # lock_mode="advisory": a transaction-scoped advisory lock keyed on the
+    # bucket table, waited for up to the transaction-local lock_timeout.
+    SET_LOCK_TIMEOUT = """
+    SELECT set_config('lock_timeout', %s, true)
+    """
+    ADVISORY_LOCK = """
+    SELECT pg_advisory_xact_lock(hashtext(%s))
+    """
     COUNT = """
     SELECT COUNT(*) FROM {table}
     """
+    # The windowed counts of {windows}, plus {put} of the item in the same
+    # statement when every count {fits} - so a whole check-and-insert is one
+    # round trip. Parameters: the windows', the put's, then the fits'.
+    ADMIT = """
+    WITH windows AS ({windows}),
+    admitted AS ({put} WHERE (SELECT {fits} FROM windows))
+    SELECT * FROM windows
+    """
     COUNT_WINDOW = """
     SELECT COUNT(*) FROM {table}
     WHERE item_timestamp >= TO_TIMESTAMP(%s) - (%s * INTERVAL '1 milliseconds')
@@ -60,50 +88,334 @@ class Queries:
     LEAK = """
     DELETE FROM {table} WHERE item_timestamp < TO_TIMESTAMP(%s)
     """
-    LEAK_COUNT = """
-    SELECT COUNT(*) FROM {table} WHERE item_timestamp < TO_TIMESTAMP(%s)
+    # bucket_key given: many logical buckets share one table, told apart by
+    # bucket_key and served by a (bucket_key, item_timestamp) index. Writers
+    # of a key serialize on an advisory lock on that key, never on the table.
+    CREATE_KEYED_TABLE = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        bucket_key VARCHAR NOT NULL,
+        name VARCHAR,
+        weight {weight_type},
+        item_timestamp TIMESTAMP
+    )
+    """
+    CREATE_INDEX_ON_KEY_TIMESTAMP = """
+    CREATE INDEX IF NOT EXISTS {index} ON {table} (bucket_key, item_timestamp)
+    """
+    TRY_ADVISORY_LOCK = """
+    SELECT pg_try_advisory_xact_lock(hashtext(%s))
+    """
+    KEYED_COUNT = """
+    SELECT COUNT(*) FROM {table} WHERE bucket_key = %s
+    """
+    KEYED_PUT = """
+    INSERT INTO {table} (bucket_key, name, weight, item_timestamp)
+    SELECT %s, %s, %s, TO_TIMESTAMP(%s) FROM generate_series(1, %s)
+    """
+    KEYED_FLUSH = """
+    DELETE FROM {table} WHERE bucket_key = %s
+    """
+    KEYED_PEEK = """
+    SELECT name, weight, (extract(epoch FROM item_timestamp) * 1000) as item_timestamp
+    FROM {table}
+    WHERE bucket_key = %s
+    ORDER BY item_timestamp DESC
+    LIMIT 1
+    OFFSET %s
+    """
+    KEYED_LEAK = """
+    DELETE FROM {table} WHERE bucket_key = %s AND item_timestamp < TO_TIMESTAMP(%s)
+    """
+    # partition_ms given: the item table is range-partitioned by time slice.
+    # Partition bounds are literals: DDL takes no bound parameters.
+    PARTITION_BY_TIMESTAMP = """
+    PARTITION BY RANGE (item_timestamp)
+    """
+    CREATE_PARTITION = """
+    CREATE TABLE IF NOT EXISTS {partition} PARTITION OF {table}
+    FOR VALUES FROM (TO_TIMESTAMP({start})) TO (TO_TIMESTAMP({end}))
+    """
+    LIST_PARTITIONS = """
+    SELECT c.relname FROM pg_inherits i
+    JOIN pg_class p ON p.oid = i.inhparent
+    JOIN pg_class c ON c.oid = i.inhrelid
+    WHERE p.relname = %s AND pg_table_is_visible(p.oid)
+    """
+    # weighted_rows: one row per put, carrying its weight, instead of one row
+    # per unit. {where} / {and_key} scope a keyed bucket to its key. The n-th
+    # newest unit (0-based %s) is found with a running sum of weights, newest
+    # first, rather than an OFFSET over unit rows.
+    WEIGHTED_NTH_UNIT = """
+    (SELECT name, weight, item_timestamp,
+        SUM(weight) OVER (ORDER BY item_timestamp DESC ROWS UNBOUNDED PRECEDING) AS units
+    FROM {table} {where}) ranked
+    WHERE units > %s
+    ORDER BY item_timestamp DESC
+    LIMIT 1
+    """
+    WEIGHTED_PEEK = """
+    SELECT name, weight, (extract(epoch FROM item_timestamp) * 1000) as item_timestamp
+    FROM {nth_unit}
+    """
+    WEIGHTED_COUNT = """
+    SELECT COALESCE(SUM(weight), 0) FROM {table} {where}
+    """
+    WEIGHTED_LEAK = """
+    WITH leaked AS (
+        DELETE FROM {table} WHERE {and_key}item_timestamp < TO_TIMESTAMP(%s) RETURNING weight
+    )
+    SELECT COALESCE(SUM(weight), 0) FROM leaked
+    """
+    # Per-rate state of a StatefulAlgorithm: one row per rate keyed by interval.
+    # {columns} / {values} are composed from the algorithm's state fields.
+    CREATE_STATE_TABLE = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        rate_interval BIGINT PRIMARY KEY,
+        {columns}
+    )
+    """
+    SEED_STATE = """
+    INSERT INTO {table} (rate_interval, {columns}) VALUES (%s, {values})
+    ON CONFLICT (rate_interval) DO NOTHING
+    """
+    LOCK_STATES = """
+    SELECT rate_interval, {columns} FROM {table}
+    WHERE rate_interval = ANY(%s)
+    ORDER BY rate_interval
+    FOR UPDATE
+    """
+    GET_STATES = """
+    SELECT rate_interval, {columns} FROM {table} WHERE rate_interval = ANY(%s)
+    """
+    UPDATE_STATE = """
+    UPDATE {table} SET ({columns}) = ROW({values}) WHERE rate_interval = %s
     """
 
 
 class PostgresBucket(AbstractBucket):
+    """A bucket storing one row per item in a PostgreSQL table.
+
+    With a ``StatefulAlgorithm`` (e.g. ``algorithm=GCRA()``) it instead keeps
+    one row per rate in ``ratelimit_<algorithm name>___<table>``; puts lock
+    those rows with ``SELECT ... FOR UPDATE`` rather than the whole table, so
+    concurrent writers queue instead of being rejected by ``NOWAIT``.
+
+    ``lock_mode`` picks how a log bucket serializes its check-and-insert:
+
+    - ``"nowait"`` (default): ``LOCK TABLE ... IN EXCLUSIVE MODE NOWAIT``; a
+      put that finds the table locked is rejected at once, even with capacity
+      left.
+    - ``"advisory"``: ``pg_advisory_xact_lock`` keyed on the bucket table, so
+      writers queue for up to ``lock_timeout_ms`` and are rejected only when
+      that wait runs out. Leaks and reads do not take it. Every writer of a
+      table must use the same mode.
+
+    With a ``bucket_key`` the bucket is one of many logical buckets sharing
+    ``ratelimit_keyed___<table>``, whose rows carry their key and are indexed
+    on ``(bucket_key, item_timestamp)``, so 100k keys cost 100k index ranges
+    rather than 100k tables. Writers lock the key, not the table: ``"nowait"``
+    becomes ``pg_try_advisory_xact_lock`` on the key. Only the log algorithm
+    is supported. ``PostgresBucketFactory`` routes names to keys.
+
+    With ``partition_ms`` the item table is range-partitioned into time
+    slices of that many milliseconds, created ``PARTITIONS_AHEAD`` slices
+    ahead by puts and leaks. Leaking drops every slice that lies wholly
+    before the longest rate window instead of deleting rows, so it leaves no
+    dead tuples or index bloat behind, and admission only touches the small
+    indexes of the live slices. Expired rows linger in ``count()`` until their
+    slice is dropped; ``DROP`` briefly locks the table, so leaks of a NOWAIT
+    bucket may reject a few concurrent puts.
+
+    With ``weighted_rows=True`` each put writes one row carrying its weight
+    instead of ``weight`` unit rows, and windows are checked with
+    ``SUM(weight)``, so heavy acquires cost one heap row and index entry.
+    Every bucket on a table must use the same setting.
+    """
+
     is_async = False
     table: str
     pool: ConnectionPool
+    lock_mode: str
+    lock_timeout_ms: int
+    bucket_key: Optional[str]
+    partition_ms: Optional[int]
+    weighted_rows: bool
 
-    def __init__(self, pool: ConnectionPool, table: str, rates: List[Rate]):
-        from psycopg import sql
+    LOCK_MODES = ("nowait", "advisory")
+    PARTITIONS_AHEAD = 2
 
+    def __init__(
+        self,
+        pool: ConnectionPool,
+        table: str,
+        rates: List[Rate],
+        algorithm: Optional[Algorithm] = None,
+        lock_mode: str = "nowait",
+        lock_timeout_ms: int = 1000,
+        bucket_key: Optional[str] = None,
+        partition_ms: Optional[int] = None,
+        weighted_rows: bool = False,
+    ):
         self._clock = PostgresClock(pool)
+        self._compose_queries(pool, table, rates, algorithm, lock_mode, lock_timeout_ms, bucket_key, partition_ms, weighted_rows)
+        self._create_table()
+
+    def _compose_queries(
+        self,
+        pool,
+        table: str,
+        rates: List[Rate],
+        algorithm: Optional[Algorithm],
+        lock_mode: str = "nowait",
+        lock_timeout_ms: int = 1000,
+        bucket_key: Optional[str] = None,
+        partition_ms: Optional[int] = None,
+        weighted_rows: bool = False,
+    ):
+        from psycopg import sql
+
+        if lock_mode not in self.LOCK_MODES:
+            raise ValueError(f"lock_mode must be one of {self.LOCK_MODES}, got {lock_mode!r}")
+        if lock_timeout_ms < 1:
+            raise ValueError("lock_timeout_ms must be >= 1")
+
+        self.lock_mode = lock_mode
+        self.lock_timeout_ms = lock_timeout_ms
+        self.bucket_key = bucket_key
         self.table = table.lower()
         self.pool = pool
         assert rates
         self.rates = rates
-        self._full_tbl = f"ratelimit___{self.table}"
+        self._use_algorithm(algorithm, (SlidingWindowLog, StatefulAlgorithm))
+
+        keyed = bucket_key is not None
+        if keyed and self.stateful:
+            raise ValueError("A keyed PostgresBucket supports the SlidingWindowLog algorithm only")
+        if weighted_rows and self.stateful:
+            raise ValueError("weighted_rows applies to the SlidingWindowLog algorithm only")
+
+        self.weighted_rows = weighted_rows
+
+        self._full_tbl = f"ratelimit_keyed___{self.table}" if keyed else f"ratelimit___{self.table}"
+
+        self.partition_ms = partition_ms
+        # End of the slices known to exist, in a list shared with for_key()
+        # copies so one key's put spares the others the DDL round trip.
+        self._partitions_until = [0]
+        if partition_ms is not None:
+            if partition_ms < 1:
+                raise ValueError("partition_ms must be >= 1")
+            if self.stateful:
+                raise ValueError("A partitioned PostgresBucket supports the SlidingWindowLog algorithm only")
+            # Partitions are named <table>_p<slice start ms>; keep that within
+            # PostgreSQL's 63-byte identifiers, which it would silently truncate.
+            if len(self._full_tbl) > 48:
+                raise ValueError(f"Table name {self._full_tbl!r} is too long to partition")
 
         # Compose all SQL with properly-quoted identifiers and bound
         # parameters instead of f-string interpolation (issue #233). The table
         # identifier is fixed per bucket, so the statements are composed once
         # here; only values vary and are passed as query parameters.
         tbl = sql.Identifier(self._full_tbl)
-        index_name = sql.Identifier(f"timestampindex_{self.table}")
-        self._q_create_table = sql.SQL(Queries.CREATE_BUCKET_TABLE).format(table=tbl)
-        self._q_create_index = sql.SQL(Queries.CREATE_INDEX_ON_TIMESTAMP).format(index=index_name, table=tbl)
+        weight_type = sql.SQL("INTEGER" if weighted_rows else "SMALLINT")
+        if keyed:
+            index_name = sql.Identifier(f"keytimestampindex_{self.table}")
+            self._q_create_table = sql.SQL(Queries.CREATE_KEYED_TABLE).format(table=tbl, weight_type=weight_type)
+            self._q_create_index = sql.SQL(Queries.CREATE_INDEX_ON_KEY_TIMESTAMP).format(index=index_name, table=tbl)
+        else:
+            index_name = sql.Identifier(f"timestampindex_{self.table}")
+            self._q_create_table = sql.SQL(Queries.CREATE_BUCKET_TABLE).format(table=tbl, weight_type=weight_type)
+            self._q_create_index = sql.SQL(Queries.CREATE_INDEX_ON_TIMESTAMP).format(index=index_name, table=tbl)
+        if partition_ms is not None:
+            self._q_create_table = sql.SQL("{} {}").format(self._q_create_table, sql.SQL(Queries.PARTITION_BY_TIMESTAMP))
+        self._q_list_partitions = sql.SQL(Queries.LIST_PARTITIONS)
         self._q_lock = sql.SQL(Queries.LOCK_TABLE).format(table=tbl)
-        self._q_count = sql.SQL(Queries.COUNT).format(table=tbl)
+        self._q_set_lock_timeout = sql.SQL(Queries.SET_LOCK_TIMEOUT)
+        self._q_advisory_lock = sql.SQL(Queries.ADVISORY_LOCK)
+        self._q_try_advisory_lock = sql.SQL(Queries.TRY_ADVISORY_LOCK)
+        # Table-wide leak: one DELETE for every key of a keyed table.
+        self._q_leak_all = sql.SQL(Queries.LEAK).format(table=tbl)
+        # Every per-bucket statement of a keyed table is scoped to its key,
+        # bound first (see _key_params).
+        where_key = sql.SQL("WHERE bucket_key = %s " if keyed else "")
+        self._q_count = sql.SQL(Queries.KEYED_COUNT if keyed else Queries.COUNT).format(table=tbl)
         # One scan computing every rate's windowed count via COUNT(*) FILTER,
-        # instead of one round trip per rate. Each rate contributes a
-        # (TO_TIMESTAMP(%s), %s) pair, filled in self.rates order at put time.
+        # instead of one round trip per rate, each followed by the timestamp
+        # waiting() would peek for that rate - only looked up when the rate is
+        # full, so a rejected put needs no second round trip. Each rate takes
+        # (TO_TIMESTAMP(%s), %s) for the count, then (same pair, %s, %s) for
+        # the bound, filled in self.rates order at put time.
         # Composed with psycopg.sql (no string interpolation).
         _filter = sql.SQL("COUNT(*) FILTER (WHERE item_timestamp >= TO_TIMESTAMP(%s) - (%s * INTERVAL '1 milliseconds'))")
-        _fields = sql.SQL(", ").join([_filter] * len(self.rates))
-        self._q_count_windows = sql.SQL("SELECT {fields} FROM {table}").format(fields=_fields, table=tbl)
-        self._q_put = sql.SQL(Queries.PUT).format(table=tbl)
-        self._q_flush = sql.SQL(Queries.FLUSH).format(table=tbl)
-        self._q_peek = sql.SQL(Queries.PEEK).format(table=tbl)
-        self._q_leak = sql.SQL(Queries.LEAK).format(table=tbl)
-        self._q_leak_count = sql.SQL(Queries.LEAK_COUNT).format(table=tbl)
+        _bound = sql.SQL(
+            "CASE WHEN {count} > %s THEN ("
+            "SELECT FLOOR(extract(epoch FROM item_timestamp) * 1000)::BIGINT FROM {table} {where}"
+            "ORDER BY item_timestamp DESC LIMIT 1 OFFSET %s) END"
+        ).format(count=_filter, table=tbl, where=where_key)
+        self._q_put = sql.SQL(Queries.KEYED_PUT if keyed else Queries.PUT).format(table=tbl)
+        self._compose_windows(tbl, where_key, _filter, _bound)
+        self._q_flush = sql.SQL(Queries.KEYED_FLUSH if keyed else Queries.FLUSH).format(table=tbl)
+        self._q_peek = sql.SQL(Queries.KEYED_PEEK if keyed else Queries.PEEK).format(table=tbl)
+        self._q_leak = sql.SQL(Queries.KEYED_LEAK if keyed else Queries.LEAK).format(table=tbl)
 
-        self._create_table()
+        if weighted_rows:
+            self._compose_weighted_queries(tbl, where_key)
+
+        if isinstance(self._algorithm, StatefulAlgorithm):
+            self._compose_state_queries(self._algorithm)
+
+    def _compose_windows(self, tbl, where_key, count, bound):
+        """``_q_count_windows`` from each rate's ``count`` and ``bound``
+        expressions, and ``_q_admit`` fusing it with ``_q_put``."""
+        from psycopg import sql
+
+        counts = [sql.Identifier(f"count_{i}") for i in range(len(self.rates))]
+        bounds = [sql.Identifier(f"bound_{i}") for i in range(len(self.rates))]
+        fields = sql.SQL(", ").join([sql.SQL("{} AS {}, {} AS {}").format(count, c, bound, b) for c, b in zip(counts, bounds, strict=True)])
+        fits = sql.SQL(" AND ").join([sql.SQL("{} <= %s").format(c) for c in counts])
+        self._q_count_windows = sql.SQL("SELECT {fields} FROM {table} {where}").format(fields=fields, table=tbl, where=where_key)
+        admit = sql.SQL(Queries.ADMIT).format(windows=self._q_count_windows, put=self._q_put, fits=fits)
+        # Rendered once: sent (and prepared) on every put, it should not be
+        # re-composed each time.
+        self._q_admit = sql.SQL(admit.as_string(None))
+
+    def _compose_weighted_queries(self, tbl, where_key):
+        """Replace the unit-row counting statements for ``weighted_rows``;
+        parameters keep the same order."""
+        from psycopg import sql
+
+        and_key = sql.SQL("bucket_key = %s AND " if self.bucket_key is not None else "")
+        nth_unit = sql.SQL(Queries.WEIGHTED_NTH_UNIT).format(table=tbl, where=where_key)
+        _sum = sql.SQL("COALESCE(SUM(weight) FILTER (WHERE item_timestamp >= TO_TIMESTAMP(%s) - (%s * INTERVAL '1 milliseconds')), 0)")
+        _bound = sql.SQL("CASE WHEN {sum} > %s THEN (SELECT FLOOR(extract(epoch FROM item_timestamp) * 1000)::BIGINT FROM {nth_unit}) END").format(
+            sum=_sum, nth_unit=nth_unit
+        )
+        self._compose_windows(tbl, where_key, _sum, _bound)
+        self._q_count = sql.SQL(Queries.WEIGHTED_COUNT).format(table=tbl, where=where_key)
+        self._q_peek = sql.SQL(Queries.WEIGHTED_PEEK).format(nth_unit=nth_unit)
+        # Leaks that report what they removed in one statement sum the
+        # deleted weights, where unit rows would just use the rowcount.
+        self._q_leak_units = sql.SQL(Queries.WEIGHTED_LEAK).format(table=tbl, and_key=and_key)
+        self._q_leak_all_units = sql.SQL(Queries.WEIGHTED_LEAK).format(table=tbl, and_key=sql.SQL(""))
+        self._q_widen_weight = sql.SQL(Queries.WIDEN_WEIGHT).format(table=tbl)
+        # The table as to_regclass() parses it: a quoted identifier.
+        self._regclass = '"{}"'.format(self._full_tbl.replace('"', '""'))
+
+    def _compose_state_queries(self, algorithm: StatefulAlgorithm):
+        from psycopg import sql
+
+        self._state_tbl = f"ratelimit_{algorithm.name}___{self.table}"
+        tbl = sql.Identifier(self._state_tbl)
+        fields = [sql.Identifier(field) for field in algorithm.state_fields]
+        columns = sql.SQL(", ").join(fields)
+        values = sql.SQL(", ").join([sql.Placeholder()] * len(fields))
+        definitions = sql.SQL(", ").join([sql.SQL("{} DOUBLE PRECISION NOT NULL").format(field) for field in fields])
+
+        self._q_create_state_table = sql.SQL(Queries.CREATE_STATE_TABLE).format(table=tbl, columns=definitions)
+        self._q_seed_state = sql.SQL(Queries.SEED_STATE).format(table=tbl, columns=columns, values=values)
+        self._q_lock_states = sql.SQL(Queries.LOCK_STATES).format(table=tbl, columns=columns)
+        self._q_get_states = sql.SQL(Queries.GET_STATES).format(table=tbl, columns=columns)
+        self._q_update_state = sql.SQL(Queries.UPDATE_STATE).format(table=tbl, columns=columns, values=values)
 
     @contextmanager
     def _get_conn(self):
@@ -117,52 +429,340 @@ class PostgresBucket(AbstractBucket):
             conn.execute(self._q_create_table)
             conn.execute(self._q_create_index)
 
+            if self.weighted_rows and conn.execute(Queries.WEIGHT_IS_SMALLINT, (self._regclass,)).fetchone():
+                conn.execute(self._q_widen_weight)
+
+            if isinstance(self._algorithm, StatefulAlgorithm):
+                # Seed every rate's row so concurrent first puts find a row to
+                # lock instead of racing to insert it.
+                conn.execute(self._q_create_state_table)
+                with conn.cursor() as cur:
+                    cur.executemany(self._q_seed_state, self._state_rows())
+
+    def _initial_states(self) -> List[State]:
+        assert isinstance(self._algorithm, StatefulAlgorithm)
+        return [self._algorithm.initial_state(rate) for rate in self.rates]
+
+    def _state_rows(self) -> List[tuple]:
+        """Initial ``(rate_interval, *state)`` row of every rate, for seeding."""
+        return [(rate.interval, *state) for rate, state in zip(self.rates, self._initial_states(), strict=True)]
+
+    def _state_updates(self, states: List[State]) -> List[tuple]:
+        """``_q_update_state`` parameters storing ``states``."""
+        return [(*state, rate.interval) for rate, state in zip(self.rates, states, strict=True)]
+
+    def _parse_states(self, rows: list) -> List[State]:
+        """Per-rate states, in ``self.rates`` order, from state table rows."""
+        stored = {int(row[0]): tuple(float(value) for value in row[1:]) for row in rows}
+        return [stored.get(rate.interval, initial) for rate, initial in zip(self.rates, self._initial_states(), strict=True)]
+
+    def _read_states(self, conn, query) -> List[State]:
+        cur = conn.execute(query, ([rate.interval for rate in self.rates],))
+        rows = cur.fetchall()
+        cur.close()
+        return self._parse_states(rows)
+
+    @property
+    def _key_params(self) -> tuple:
+        """Leading parameters scoping a statement to this bucket's key."""
+        return () if self.bucket_key is None else (self.bucket_key,)
+
+    @property
+    def _lock_key(self) -> str:
+        return self._full_tbl if self.bucket_key is None else f"{self._full_tbl}/{self.bucket_key}"
+
+    def for_key(self, bucket_key: str) -> PostgresBucket:
+        """A bucket for ``bucket_key`` on this keyed bucket's table, sharing
+        its pool and composed statements; creates nothing in the database."""
+        assert self.bucket_key is not None, "for_key() needs a keyed bucket"
+        bucket = copy(self)
+        bucket.bucket_key = bucket_key
+        bucket.failing_rate = None
+        bucket._retry = None
+        return bucket
+
+    def _lock_statements(self) -> List[tuple]:
+        """``(query, params)`` pairs serializing writers of this log bucket
+        for the rest of the transaction, per ``lock_mode``. Either raises
+        ``LockNotAvailable`` when the lock cannot be had, except a keyed
+        ``"nowait"`` bucket's try-lock, which returns false instead."""
+        if self.lock_mode == "advisory":
+            return [
+                (self._q_set_lock_timeout, (f"{self.lock_timeout_ms}ms",)),
+                (self._q_advisory_lock, (self._lock_key,)),
+            ]
+        if self.bucket_key is not None:
+            return [(self._q_try_advisory_lock, (self._lock_key,))]
+        return [(self._q_lock, None)]
+
+    def _lock(self, conn) -> bool:
+        """Take the writer lock of ``_lock_statements``; False if unavailable."""
+        from psycopg.errors import LockNotAvailable
+
+        try:
+            for query, params in self._lock_statements():
+                cur = conn.execute(query, params)
+        except LockNotAvailable:
+            logger.debug("LockNotAvailable")
+            return False
+
+        if query is self._q_try_advisory_lock:
+            row = cur.fetchone()
+            return bool(row and row[0])
+        return True
+
+    def _count_params(self, item: RateItem) -> List[Union[float, str]]:
+        """Parameters of ``_q_count_windows`` for ``item``."""
+        item_ts_seconds = item.timestamp / 1000
+        key = self._key_params
+        params: List[Union[float, str]] = []
+        for rate in self.rates:
+            bound_offset = max(rate.limit - item.weight, 0)
+            params.extend((item_ts_seconds, rate.interval, item_ts_seconds, rate.interval, bound_offset, *key, bound_offset))
+        params.extend(key)
+        return params
+
+    def _admit_params(self, item: RateItem) -> list:
+        """Parameters of ``_q_admit`` for ``item``."""
+        return [*self._count_params(item), *self._put_params(item), *(rate.limit - item.weight for rate in self.rates)]
+
+    @property
+    def _fused_admit(self) -> bool:
+        """Whether ``_q_admit``'s SQL test matches the algorithm's ``admit``;
+        a ``SlidingWindowLog`` subclass overriding it checks in Python."""
+        return type(self._algorithm).admit is SlidingWindowLog.admit
+
+    @staticmethod
+    def _prepare(conn) -> Optional[bool]:
+        """``prepare=`` for hot statements: always, unless the connection
+        disables prepared statements (``prepare_threshold=None``, e.g. behind
+        a transaction-pooling PgBouncer)."""
+        return None if conn.prepare_threshold is None else True
+
+    @staticmethod
+    def _pipeline(conn):
+        """``conn.pipeline()`` where libpq supports pipeline mode."""
+        from psycopg import Pipeline
+
+        return conn.pipeline() if Pipeline.is_supported() else nullcontext()
+
+    def _put_params(self, item: RateItem) -> tuple:
+        """Parameters of ``_q_put`` inserting ``item``'s unit rows."""
+        rows = 1 if self.weighted_rows else item.weight
+        return (*self._key_params, item.name, item.weight, item.timestamp / 1000, rows)
+
+    def _partitions_due(self, timestamp: int) -> bool:
+        """Whether fewer than one slice after ``timestamp``'s is known to exist."""
+        return self.partition_ms is not None and timestamp >= self._partitions_until[0] - self.partition_ms
+
+    def _partition_statements(self, timestamp: int) -> Tuple[List[tuple], int]:
+        """``(query, params)`` pairs creating, if missing, the slice holding
+        ``timestamp`` and the ``PARTITIONS_AHEAD`` after it, serialized across
+        writers; and the end of the last slice created."""
+        from psycopg import sql
+
+        assert self.partition_ms is not None
+        tbl = sql.Identifier(self._full_tbl)
+        first = timestamp - timestamp % self.partition_ms
+        end = first + (self.PARTITIONS_AHEAD + 1) * self.partition_ms
+        statements: List[tuple] = [(self._q_advisory_lock, (f"{self._full_tbl}/partitions",))]
+
+        for start in range(first, end, self.partition_ms):
+            create = sql.SQL(Queries.CREATE_PARTITION).format(
+                partition=sql.Identifier(f"{self._full_tbl}_p{start}"),
+                table=tbl,
+                start=sql.Literal(start / 1000),
+                end=sql.Literal((start + self.partition_ms) / 1000),
+            )
+            statements.append((create, None))
+
+        return statements, end
+
+    def _expired_partitions(self, names: List[str], lower_bound: int) -> List[str]:
+        """Partitions among ``names`` whose whole slice ends by ``lower_bound``."""
+        assert self.partition_ms is not None
+        prefix = f"{self._full_tbl}_p"
+        starts = [name[len(prefix) :] for name in names if name.startswith(prefix)]
+        return [f"{prefix}{start}" for start in starts if start.isdigit() and int(start) + self.partition_ms <= lower_bound]
+
+    def _drop_statements(self, partitions: List[str]) -> Tuple:
+        """Queries counting the units in ``partitions``, then dropping them."""
+        from psycopg import sql
+
+        tables = [sql.Identifier(partition) for partition in partitions]
+        units = sql.SQL("COALESCE(SUM(weight), 0)" if self.weighted_rows else "COUNT(*)")
+        counts = [sql.SQL("(SELECT {} FROM {})").format(units, t) for t in tables]
+        count = sql.SQL("SELECT {}").format(sql.SQL(" + ").join(counts))
+        drop = sql.SQL("DROP TABLE IF EXISTS {}").format(sql.SQL(", ").join(tables))
+        return count, drop
+
+    def _ensure_partitions(self, timestamp: int) -> None:
+        if not self._partitions_due(timestamp):
+            return
+
+        statements, until = self._partition_statements(timestamp)
+        with self._get_conn() as conn:
+            for query, params in statements:
+                conn.execute(query, params)
+
+        self._partitions_until[0] = max(self._partitions_until[0], until)
+
+    def _drop_partitions(self, lower_bound: int) -> int:
+        """Drop the slices wholly before ``lower_bound``; the rows dropped."""
+        with self._get_conn() as conn:
+            cur = conn.execute(self._q_list_partitions, (self._full_tbl,))
+            expired = self._expired_partitions([row[0] for row in cur.fetchall()], lower_bound)
+
+            if not expired:
+                return 0
+
+            count, drop = self._drop_statements(expired)
+            cur = conn.execute(count)
+            result = cur.fetchone()
+            conn.execute(drop)
+
+        return int(result[0]) if result else 0
+
+    def _decide(self, item: RateItem, row: tuple) -> Decision:
+        """Admit ``item`` against the counts and bounds of ``_q_count_windows``."""
+        counts, bounds = row[0::2], row[1::2]
+        decision = self._algorithm.admit(self.rates, counts, item.weight)
+        if not decision.allowed:
+            assert decision.failing_rate is not None
+            bound = bounds[self.rates.index(decision.failing_rate)]
+            retry_after = SlidingWindowLog.retry_after(decision.failing_rate, item.timestamp, bound)
+            return Decision(decision.failing_rate, retry_after)
+        return decision
+
+    def _check_stateful(self, conn, item: RateItem) -> Decision:
+        algorithm = self._algorithm
+        assert isinstance(algorithm, StatefulAlgorithm)
+
+        # Row locks, taken in interval order, serialize writers of this
+        # bucket until the transaction ends.
+        states = self._read_states(conn, self._q_lock_states)
+        decision, states = algorithm.check(self.rates, states, item.timestamp, item.weight)
+
+        if decision.allowed:
+            with conn.cursor() as cur:
+                cur.executemany(self._q_update_state, self._state_updates(states))
+
+        return decision
+
+    def _check_and_insert(self, conn, item: RateItem) -> Decision:
+        """Check ``item`` and insert it if admitted, inside the caller's
+        transaction on ``conn``."""
+        from psycopg.errors import LockNotAvailable, PipelineAborted
+
+        if self.stateful:
+            return self._check_stateful(conn, item)
+
+        if not self._fused_admit:
+            return self._check_then_insert(conn, item)
+
+        # Serialize writers of this bucket (see lock_mode), so the "check
+        # current count" + "insert new items" sequence is atomic with respect
+        # to other writers and rate limits cannot be exceeded by concurrent
+        # requests interleaving.
+        #
+        # With NOWAIT (or a keyed bucket's try-lock), or once the advisory
+        # lock's lock_timeout runs out, we reject this request (return False)
+        # instead of blocking any longer. Either way only one writer performs
+        # the check-and-put at a time.
+        #
+        # The lock statements and the fused check-and-insert go out as one
+        # pipelined batch of prepared statements: one round trip per put. A
+        # failed lock aborts the rest of the batch; it may surface from an
+        # execute inside the pipeline block or from the sync on leaving it.
+        # Caught inside, it leaves the block cleanly rather than having the
+        # pipeline log the aborted sync as an error ignored on the way out.
+        locks = self._lock_statements()
+        prepare = self._prepare(conn)
+        locked = True
+        try:
+            with self._pipeline(conn):
+                try:
+                    lock_cursors = [conn.execute(query, params, prepare=prepare) for query, params in locks]
+                    cur = conn.execute(self._q_admit, self._admit_params(item), prepare=prepare)
+                except LockNotAvailable:
+                    locked = False
+        except (LockNotAvailable, PipelineAborted):
+            locked = False
+
+        if not locked:
+            logger.debug("LockNotAvailable")
+            return Decision(self.rates[0])
+
+        row = cur.fetchone()
+        if locks[-1][0] is self._q_try_advisory_lock and not lock_cursors[-1].fetchone()[0]:
+            # A try-lock reports failure instead of raising: undo the insert
+            # the batch made without holding it.
+            logger.debug("LockNotAvailable")
+            conn.rollback()
+            return Decision(self.rates[0])
+
+        return self._decide(item, row)
+
+    def _check_then_insert(self, conn, item: RateItem) -> Decision:
+        """``_check_and_insert`` in separate round trips, deciding in Python."""
+        if not self._lock(conn):
+            return Decision(self.rates[0])
+
+        cur = conn.execute(self._q_count_windows, self._count_params(item))
+        row = cur.fetchone()
+        cur.close()
+
+        decision = self._decide(item, row)
+        if decision.allowed:
+            # Insert all `weight` unit-rows in a single statement (one round
+            # trip) instead of `weight` separate INSERTs under the table lock.
+            conn.execute(self._q_put, self._put_params(item))
+        return decision
+
     def put(self, item: RateItem) -> Union[bool, Awaitable[bool]]:
         """Put an item (typically the current time) in the bucket
         return true if successful, otherwise false
         """
-        from psycopg.errors import LockNotAvailable
-
         if item.weight == 0:
             return True
 
-        item_ts_seconds = item.timestamp / 1000
+        self._ensure_partitions(item.timestamp)
 
         with self._get_conn() as conn:
-            # Acquire an EXCLUSIVE MODE lock on the bucket table using NOWAIT.
-            # This ensures the "check current count" + "insert new items" sequence
-            # is atomic with respect to other writers, so rate limits cannot be
-            # exceeded due to concurrent requests interleaving.
-            #
-            # Because we use NOWAIT, if the table is already locked by another
-            # transaction, PostgreSQL raises LockNotAvailable and we immediately
-            # reject this request (return False) instead of blocking or retrying.
-            # This provides predictable, fail-fast behavior but may limit
-            # throughput under high contention since only one writer can perform
-            # the check-and-put at a time.
-            try:
-                conn.execute(self._q_lock)
-            except LockNotAvailable:
-                logger.debug("LockNotAvailable")
-                self.failing_rate = self.rates[0]
-                return False
-
-            params = [v for rate in self.rates for v in (item_ts_seconds, rate.interval)]
-            cur = conn.execute(self._q_count_windows, params)
-            counts = cur.fetchone()
-            cur.close()
-
-            decision = self._algorithm.admit(self.rates, counts, item.weight)
-            if not decision.allowed:
-                self.failing_rate = decision.failing_rate
-                return False
+            decision = self._check_and_insert(conn, item)
 
-            self.failing_rate = None
-            # Insert all `weight` unit-rows in a single statement (one round
-            # trip) instead of `weight` separate INSERTs under the table lock.
-            conn.execute(self._q_put, (item.name, item.weight, item_ts_seconds, item.weight))
+        return self._apply_decision(decision, item)
 
-        return True
+    def put_many(self, entries: Sequence[Tuple[AbstractBucket, RateItem]]) -> Union[int, Awaitable[int]]:
+        """All-or-nothing put over buckets sharing this bucket's pool, in a
+        single transaction on one connection."""
+        if not all(isinstance(bucket, PostgresBucket) and bucket.pool is self.pool for bucket, _ in entries):
+            return super().put_many(entries)
+
+        for bucket, item in entries:
+            bucket._ensure_partitions(item.timestamp)  # type: ignore[attr-defined]
+
+        with self._get_conn() as conn:
+            for idx in self._lock_order(entries):
+                bucket, item = entries[idx]
+                assert isinstance(bucket, PostgresBucket)
+                decision = bucket._check_and_insert(conn, item)
+
+                if not decision.allowed:
+                    conn.rollback()
+                    bucket._apply_decision(decision, item)
+                    return idx
+
+        for bucket, item in entries:
+            bucket._apply_decision(Decision(), item)
+
+        return -1
+
+    @staticmethod
+    def _lock_order(entries: Sequence[Tuple[AbstractBucket, RateItem]]) -> List[int]:
+        """Lock tables/rows in one global order so concurrent batches cannot
+        deadlock; indices still refer to the caller's order."""
+        return sorted(range(len(entries)), key=lambda idx: entries[idx][0]._lock_key)  # type: ignore[attr-defined]
 
     def leak(
         self,
@@ -170,39 +770,76 @@ class PostgresBucket(AbstractBucket):
     ) -> Union[int, Awaitable[int]]:
         """leaking bucket - removing items that are outdated"""
         assert current_timestamp is not None, "current-time must be passed on for leak"
+        if self.stateful:
+            return 0
+
         lower_bound = self._algorithm.leak_bound(self.rates, current_timestamp)
 
         if lower_bound <= 0:
             return 0
 
-        count = 0
+        if self.partition_ms is not None and self.bucket_key is None:
+            self._ensure_partitions(current_timestamp)
+            return self._drop_partitions(lower_bound)
+
         lower_bound_seconds = lower_bound / 1000
 
+        # One statement deletes and reports what it removed, so no insert
+        # lands between a count and the delete.
         with self._get_conn() as conn:
-            cur = conn.execute(self._q_leak_count, (lower_bound_seconds,))
-            result = cur.fetchone()
+            if self.weighted_rows:
+                cur = conn.execute(self._q_leak_units, (*self._key_params, lower_bound_seconds))
+                result = cur.fetchone()
+                return int(result[0]) if result else 0
 
-            if result:
-                conn.execute(self._q_leak, (lower_bound_seconds,))
-                count = int(result[0])
+            cur = conn.execute(self._q_leak, (*self._key_params, lower_bound_seconds))
+            return cur.rowcount
 
-        return count
+    def leak_all(self, current_timestamp: Optional[int] = None) -> int:
+        """Leak every key of a keyed table in one DELETE (or by dropping its
+        expired partitions), using this bucket's rates for all of them."""
+        assert current_timestamp is not None, "current-time must be passed on for leak"
+        lower_bound = self._algorithm.leak_bound(self.rates, current_timestamp)
+
+        if lower_bound <= 0:
+            return 0
+
+        if self.partition_ms is not None:
+            self._ensure_partitions(current_timestamp)
+            return self._drop_partitions(lower_bound)
+
+        with self._get_conn() as conn:
+            if self.weighted_rows:
+                cur = conn.execute(self._q_leak_all_units, (lower_bound / 1000,))
+                result = cur.fetchone()
+                return int(result[0]) if result else 0
+
+            cur = conn.execute(self._q_leak_all, (lower_bound / 1000,))
+            return cur.rowcount
 
     def flush(self) -> Union[None, Awaitable[None]]:
         """Flush the whole bucket
         - Must remove `failing-rate` after flushing
         """
         with self._get_conn() as conn:
-            conn.execute(self._q_flush)
+            conn.execute(self._q_flush, self._key_params)
+            if isinstance(self._algorithm, StatefulAlgorithm):
+                with conn.cursor() as cur:
+                    cur.executemany(self._q_update_state, self._state_updates(self._initial_states()))
             self.failing_rate = None
 
         return None
 
     def count(self) -> Union[int, Awaitable[int]]:
         """Count number of items in the bucket"""
+        if isinstance(self._algorithm, StatefulAlgorithm):
+            with self._get_conn() as conn:
+                states = self._read_states(conn, self._q_get_states)
+            return self._algorithm.outstanding(self.rates, states, self.now())
+
         count = 0
         with self._get_conn() as conn:
-            cur = conn.execute(self._q_count)
+            cur = conn.execute(self._q_count, self._key_params)
             result = cur.fetchone()
             assert result
             count = int(result[0])
@@ -214,10 +851,13 @@ class PostgresBucket(AbstractBucket):
         NOTE: The reason we cannot peek from the start of the queue(earliest-to-latest) is
         we can't really tell how many outdated items are still in the queue
         """
+        if self.stateful:
+            return None
+
         item = None
 
         with self._get_conn() as conn:
-            cur = conn.execute(self._q_peek, (index,))
+            cur = conn.execute(self._q_peek, (*self._key_params, index))
             result = cur.fetchone()
             if result:
                 name, weight, timestamp = result[0], int(result[1]), int(result[2])
@@ -231,3 +871,334 @@ class PostgresBucket(AbstractBucket):
                 self.pool.close()
             except Exception as e:
                 logger.debug("Exception closing pool, %s", e)
+
+
+class AsyncPostgresBucket(PostgresBucket):
+    """``PostgresBucket`` on a psycopg ``AsyncConnectionPool``.
+
+    Same tables, statements and admission logic (the single-scan
+    ``COUNT(*) FILTER`` check under ``LOCK TABLE ... NOWAIT``, or the locked
+    state rows of a ``StatefulAlgorithm``), but every round trip is awaited
+    so acquires do not stall the event loop. The Leaker leaks it from its
+    asyncio task. Create it with ``await AsyncPostgresBucket.init(...)``,
+    which also creates the tables.
+    """
+
+    is_async = True
+    pool: AsyncConnectionPool  # type: ignore[assignment]
+
+    def __init__(
+        self,
+        pool: AsyncConnectionPool,
+        table: str,
+        rates: List[Rate],
+        algorithm: Optional[Algorithm] = None,
+        lock_mode: str = "nowait",
+        lock_timeout_ms: int = 1000,
+        bucket_key: Optional[str] = None,
+        partition_ms: Optional[int] = None,
+        weighted_rows: bool = False,
+    ):
+        self._clock = AsyncPostgresClock(pool)
+        self._compose_queries(pool, table, rates, algorithm, lock_mode, lock_timeout_ms, bucket_key, partition_ms, weighted_rows)
+
+    @classmethod
+    async def init(
+        cls,
+        pool: AsyncConnectionPool,
+        table: str,
+        rates: List[Rate],
+        algorithm: Optional[Algorithm] = None,
+        lock_mode: str = "nowait",
+        lock_timeout_ms: int = 1000,
+        bucket_key: Optional[str] = None,
+        partition_ms: Optional[int] = None,
+        weighted_rows: bool = False,
+    ) -> AsyncPostgresBucket:
+        bucket = cls(
+            pool,
+            table,
+            rates,
+            algorithm=algorithm,
+            lock_mode=lock_mode,
+            lock_timeout_ms=lock_timeout_ms,
+            bucket_key=bucket_key,
+            partition_ms=partition_ms,
+            weighted_rows=weighted_rows,
+        )
+        await bucket._create_table_async()
+        return bucket
+
+    async def _create_table_async(self):
+        async with self.pool.connection() as conn:
+            lock_id = hash(self._full_tbl) & 0x7FFFFFFF
+            await conn.execute("SELECT pg_advisory_xact_lock(%s)", (lock_id,))
+            await conn.execute(self._q_create_table)
+            await conn.execute(self._q_create_index)
+
+            if self.weighted_rows and await (await conn.execute(Queries.WEIGHT_IS_SMALLINT, (self._regclass,))).fetchone():
+                await conn.execute(self._q_widen_weight)
+
+            if isinstance(self._algorithm, StatefulAlgorithm):
+                await conn.execute(self._q_create_state_table)
+                async with conn.cursor() as cur:
+                    await cur.executemany(self._q_seed_state, self._state_rows())
+
+    async def _read_states_async(self, conn, query) -> List[State]:
+        cur = await conn.execute(query, ([rate.interval for rate in self.rates],))
+        rows = await cur.fetchall()
+        await cur.close()
+        return self._parse_states(rows)
+
+    async def _ensure_partitions_async(self, timestamp: int) -> None:
+        if not self._partitions_due(timestamp):
+            return
+
+        statements, until = self._partition_statements(timestamp)
+        async with self.pool.connection() as conn:
+            for query, params in statements:
+                await conn.execute(query, params)
+
+        self._partitions_until[0] = max(self._partitions_until[0], until)
+
+    async def _drop_partitions_async(self, lower_bound: int) -> int:
+        async with self.pool.connection() as conn:
+            cur = await conn.execute(self._q_list_partitions, (self._full_tbl,))
+            expired = self._expired_partitions([row[0] for row in await cur.fetchall()], lower_bound)
+
+            if not expired:
+                return 0
+
+            count, drop = self._drop_statements(expired)
+            cur = await conn.execute(count)
+            result = await cur.fetchone()
+            await conn.execute(drop)
+
+        return int(result[0]) if result else 0
+
+    async def _lock_async(self, conn) -> bool:
+        """Async ``_lock``."""
+        from psycopg.errors import LockNotAvailable
+
+        try:
+            for query, params in self._lock_statements():
+                cur = await conn.execute(query, params)
+        except LockNotAvailable:
+            logger.debug("LockNotAvailable")
+            return False
+
+        if query is self._q_try_advisory_lock:
+            row = await cur.fetchone()
+            return bool(row and row[0])
+        return True
+
+    async def _check_and_insert_async(self, conn, item: RateItem) -> Decision:
+        """Async ``_check_and_insert``, inside the caller's transaction."""
+        from psycopg import AsyncPipeline
+        from psycopg.errors import LockNotAvailable, PipelineAborted
+
+        if isinstance(self._algorithm, StatefulAlgorithm):
+            states = await self._read_states_async(conn, self._q_lock_states)
+            decision, states = self._algorithm.check(self.rates, states, item.timestamp, item.weight)
+            if decision.allowed:
+                async with conn.cursor() as cur:
+                    await cur.executemany(self._q_update_state, self._state_updates(states))
+            return decision
+
+        if not self._fused_admit:
+            if not await self._lock_async(conn):
+                return Decision(self.rates[0])
+
+            cur = await conn.execute(self._q_count_windows, self._count_params(item))
+            row = await cur.fetchone()
+            await cur.close()
+
+            decision = self._decide(item, row)
+            if decision.allowed:
+                await conn.execute(self._q_put, self._put_params(item))
+            return decision
+
+        locks = self._lock_statements()
+        prepare = self._prepare(conn)
+        locked = True
+        try:
+            async with conn.pipeline() if AsyncPipeline.is_supported() else nullcontext():
+                try:
+                    lock_cursors = [await conn.execute(query, params, prepare=prepare) for query, params in locks]
+                    cur = await conn.execute(self._q_admit, self._admit_params(item), prepare=prepare)
+                except LockNotAvailable:
+                    locked = False
+        except (LockNotAvailable, PipelineAborted):
+            locked = False
+
+        if not locked:
+            logger.debug("LockNotAvailable")
+            return Decision(self.rates[0])
+
+        row = await cur.fetchone()
+        if locks[-1][0] is self._q_try_advisory_lock and not (await lock_cursors[-1].fetchone())[0]:
+            logger.debug("LockNotAvailable")
+            await conn.rollback()
+            return Decision(self.rates[0])
+
+        return self._decide(item, row)
+
+    async def put(self, item: RateItem) -> bool:  # type: ignore[override]
+        if item.weight == 0:
+            return True
+
+        await self._ensure_partitions_async(item.timestamp)
+
+        async with self.pool.connection() as conn:
+            decision = await self._check_and_insert_async(conn, item)
+
+        return self._apply_decision(decision, item)
+
+    async def put_many(self, entries: Sequence[Tuple[AbstractBucket, RateItem]]) -> int:  # type: ignore[override]
+        """All-or-nothing put over buckets sharing this bucket's pool, in a
+        single transaction on one connection."""
+        if not all(isinstance(bucket, AsyncPostgresBucket) and bucket.pool is self.pool for bucket, _ in entries):
+            result = super(PostgresBucket, self).put_many(entries)
+            return await result if isawaitable(result) else result
+
+        for bucket, item in entries:
+            await bucket._ensure_partitions_async(item.timestamp)  # type: ignore[attr-defined]
+
+        async with self.pool.connection() as conn:
+            for idx in self._lock_order(entries):
+                bucket, item = entries[idx]
+                assert isinstance(bucket, AsyncPostgresBucket)
+                decision = await bucket._check_and_insert_async(conn, item)
+
+                if not decision.allowed:
+                    await conn.rollback()
+                    bucket._apply_decision(decision, item)
+                    return idx
+
+        for bucket, item in entries:
+            bucket._apply_decision(Decision(), item)
+
+        return -1
+
+    async def leak(self, current_timestamp: Optional[int] = None) -> int:  # type: ignore[override]
+        assert current_timestamp is not None, "current-time must be passed on for leak"
+        if self.stateful:
+            return 0
+
+        lower_bound = self._algorithm.leak_bound(self.rates, current_timestamp)
+
+        if lower_bound <= 0:
+            return 0
+
+        if self.partition_ms is not None and self.bucket_key is None:
+            await self._ensure_partitions_async(current_timestamp)
+            return await self._drop_partitions_async(lower_bound)
+
+        lower_bound_seconds = lower_bound / 1000
+
+        async with self.pool.connection() as conn:
+            if self.weighted_rows:
+                cur = await conn.execute(self._q_leak_units, (*self._key_params, lower_bound_seconds))
+                result = await cur.fetchone()
+                return int(result[0]) if result else 0
+
+            cur = await conn.execute(self._q_leak, (*self._key_params, lower_bound_seconds))
+            return cur.rowcount
+
+    async def flush(self) -> None:  # type: ignore[override]
+        async with self.pool.connection() as conn:
+            await conn.execute(self._q_flush, self._key_params)
+            if isinstance(self._algorithm, StatefulAlgorithm):
+                async with conn.cursor() as cur:
+                    await cur.executemany(self._q_update_state, self._state_updates(self._initial_states()))
+            self.failing_rate = None
+
+    async def count(self) -> int:  # type: ignore[override]
+        if isinstance(self._algorithm, StatefulAlgorithm):
+            async with self.pool.connection() as conn:
+                states = await self._read_states_async(conn, self._q_get_states)
+            return self._algorithm.outstanding(self.rates, states, await self.now())
+
+        async with self.pool.connection() as conn:
+            cur = await conn.execute(self._q_count, self._key_params)
+            result = await cur.fetchone()
+            assert result
+            return int(result[0])
+
+    async def peek(self, index: int) -> Optional[RateItem]:  # type: ignore[override]
+        if self.stateful:
+            return None
+
+        async with self.pool.connection() as conn:
+            cur = await conn.execute(self._q_peek, (*self._key_params, index))
+            result = await cur.fetchone()
+
+        if not result:
+            return None
+
+        return RateItem(name=result[0], weight=int(result[1]), timestamp=int(result[2]))
+
+    async def close(self) -> None:  # type: ignore[override]
+        """Close the pool; ``await bucket.close()``."""
+        if self.pool is not None and not self.pool.closed:
+            try:
+                await self.pool.close()
+            except Exception as e:
+                logger.debug("Exception closing pool, %s", e)
+
+
+class _KeyedTableLeak(PostgresBucket):
+    """Leaker entry standing in for every key of a keyed table: its leak is
+    the table-wide ``leak_all``."""
+
+    def __init__(self, template: PostgresBucket):
+        self.__dict__.update(template.__dict__)
+
+    def leak(self, current_timestamp: Optional[int] = None) -> int:  # type: ignore[override]
+        return self.leak_all(current_timestamp)
+
+
+class PostgresBucketFactory(BucketFactory):
+    """Routes item names to keys of one keyed ``PostgresBucket`` table.
+
+    Every key gets ``rates``; ``key_func`` maps an item name to its key (the
+    name itself by default). Per-key buckets are cheap copies made with
+    ``for_key`` on each ``get`` - no table, connection or Leaker entry per
+    key - and a single DELETE leaks all keys at once.
+    """
+
+    template: PostgresBucket
+
+    def __init__(
+        self,
+        pool: ConnectionPool,
+        table: str,
+        rates: List[Rate],
+        key_func: Optional[Callable[[str], str]] = None,
+        lock_mode: str = "nowait",
+        lock_timeout_ms: int = 1000,
+        schedule_leak: bool = True,
+        partition_ms: Optional[int] = None,
+        weighted_rows: bool = False,
+    ):
+        self.template = PostgresBucket(
+            pool,
+            table,
+            rates,
+            lock_mode=lock_mode,
+            lock_timeout_ms=lock_timeout_ms,
+            bucket_key="",
+            partition_ms=partition_ms,
+            weighted_rows=weighted_rows,
+        )
+        self.key_func = key_func
+
+        if schedule_leak:
+            self.schedule_leak(_KeyedTableLeak(self.template))
+
+    def wrap_item(self, name: str, weight: int = 1) -> RateItem:
+        return RateItem(name, self.template.now(), weight=weight)
+
+    def get(self, item: RateItem) -> PostgresBucket:
+        key = item.name if self.key_func is None else self.key_func(item.name)
+        return self.template.for_key(key)
@@ -2,11 +2,22 @@
 
 from __future__ import annotations
 
+import asyncio
 from inspect import isawaitable
-from time import time_ns
-from typing import TYPE_CHECKING, Awaitable, List, Optional, Tuple, Union
-
-from ..abstracts import AbstractBucket, Rate, RateItem
+from typing import TYPE_CHECKING, Any, Awaitable, Dict, List, Optional, Sequence, Set, Tuple, Union
+
+from ..abstracts import (
+    GCRA,
+    AbstractBucket,
+    Algorithm,
+    Decision,
+    Rate,
+    RateItem,
+    SlidingWindowCounter,
+    SlidingWindowLog,
+    StatefulAlgorithm,
+)
+from ..clocks import AbstractClock, WallClock
 from ..utils import id_generator
 
 if TYPE_CHECKING:
@@ -17,8 +28,14 @@ if TYPE_CHECKING:
 class LuaScript:
     """Scripts that deal with bucket operations"""
 
+    # Every script returns {failing rate index or -1, retry-after ms}, so a
+    # rejected put needs no second round trip for waiting().
+    #
+    # Members are "<ARGV[3]><unit>", or with a sequence key KEYS[2]
+    # (compact_members) the integers INCRBY hands out for this put's units.
     PUT_ITEM = """
     local bucket = KEYS[1]
+    local sequence = KEYS[2]
     local now = ARGV[1]
     local space_required = tonumber(ARGV[2])
     local item_name = ARGV[3]
@@ -31,17 +48,36 @@ class LuaScript:
         local count = redis.call('ZCOUNT', bucket, now - interval, now)
         local space_available = limit - tonumber(count)
         if space_available < space_required then
-            return i - 1
+            -- Same bound member waiting() would peek: it must leave the
+            -- window first. +1 as in SlidingWindowLog.retry_after.
+            local retry_after = 0
+            local bound_idx = limit - space_required
+            if bound_idx >= 0 then
+                local bound = redis.call('ZREVRANGE', bucket, bound_idx, bound_idx, 'WITHSCORES')
+                if #bound > 0 then
+                    retry_after = tonumber(bound[2]) - (tonumber(now) - interval) + 1
+                end
+            end
+            return {i - 1, retry_after}
         end
     end
 
     local batch = {}
     -- Each member adds two unpacked arguments; 1000 stays below Lua 5.1 limits.
     local batch_size = 1000
+    local first = 0
+
+    if sequence then
+        first = redis.call('INCRBY', sequence, space_required) - space_required
+    end
 
     for i=1,space_required do
         batch[#batch + 1] = now
-        batch[#batch + 1] = item_name..i
+        if sequence then
+            batch[#batch + 1] = string.format('%d', first + i)
+        else
+            batch[#batch + 1] = item_name..i
+        end
 
         if #batch == batch_size * 2 then
             redis.call('ZADD', bucket, unpack(batch))
@@ -53,16 +89,339 @@ class LuaScript:
         redis.call('ZADD', bucket, unpack(batch))
     end
 
-    return -1
+    return {-1, 0}
     """
 
+    # GCRA: one hash per bucket holding each rate's theoretical arrival time
+    # in the field "<interval>:tat". The key expires once every TAT has passed,
+    # since a TAT in the past is equivalent to no state at all.
+    GCRA = """
+    local bucket = KEYS[1]
+    local now = tonumber(ARGV[1])
+    local weight = tonumber(ARGV[2])
+    local rates_count = tonumber(ARGV[3])
+    local tats = {}
+    local failing = -1
+    local retry_after = 0
+    local expire = 0
+
+    for i=1,rates_count do
+        local offset = (i - 1) * 2
+        local interval = tonumber(ARGV[4 + offset])
+        local limit = tonumber(ARGV[4 + offset + 1])
+        local tat = tonumber(redis.call('HGET', bucket, ARGV[4 + offset]..':tat')) or 0
+        local new_tat = math.max(tat, now) + weight * interval / limit
+        local allow_at = new_tat - interval
+
+        if allow_at > now then
+            if failing < 0 then
+                failing = i - 1
+            end
+            retry_after = math.max(retry_after, allow_at - now)
+        end
+
+        tats[i] = new_tat
+        expire = math.max(expire, new_tat - now)
+    end
+
+    if failing >= 0 then
+        return {failing, math.ceil(retry_after)}
+    end
+
+    for i=1,rates_count do
+        local field = ARGV[4 + (i - 1) * 2]..':tat'
+        redis.call('HSET', bucket, field, string.format('%.3f', tats[i]))
+    end
+
+    redis.call('PEXPIRE', bucket, math.ceil(expire))
+    return {-1, 0}
+    """
+
+    # Sliding-window counter: per rate the fields "<interval>:window_start",
+    # "<interval>:previous" and "<interval>:current" in one hash; mirrors
+    # SlidingWindowCounter.check, including the closed-form retry-after.
+    SLIDING_WINDOW_COUNTER = """
+    local bucket = KEYS[1]
+    local now = tonumber(ARGV[1])
+    local weight = tonumber(ARGV[2])
+    local rates_count = tonumber(ARGV[3])
+    local states = {}
+    local failing = -1
+    local retry_at = now
+    local expire = 0
+
+    for i=1,rates_count do
+        local offset = (i - 1) * 2
+        local interval = tonumber(ARGV[4 + offset])
+        local limit = tonumber(ARGV[4 + offset + 1])
+        local prefix = ARGV[4 + offset]..':'
+        local fields = redis.call('HMGET', bucket, prefix..'window_start', prefix..'previous', prefix..'current')
+        local window_start = tonumber(fields[1]) or 0
+        local previous = tonumber(fields[2]) or 0
+        local current = tonumber(fields[3]) or 0
+        local now_window = now - now % interval
+
+        if now_window > window_start then
+            if now_window == window_start + interval then
+                previous = current
+            else
+                previous = 0
+            end
+            current = 0
+            window_start = now_window
+        end
+
+        local elapsed = math.min(math.max(now - window_start, 0), interval)
+        local estimate = previous * (1 - elapsed / interval) + current
+
+        if estimate + weight > limit then
+            if failing < 0 then
+                failing = i - 1
+            end
+
+            local room = limit - current - weight
+            local at = nil
+
+            if room >= 0 and previous > 0 then
+                at = window_start + interval * (1 - room / previous)
+                if at >= window_start + interval then
+                    at = nil
+                end
+            end
+
+            if at == nil then
+                at = window_start + interval
+                if current > 0 and weight + current > limit then
+                    at = at + interval * (1 - (limit - weight) / current)
+                end
+            end
+
+            retry_at = math.max(retry_at, at)
+        end
+
+        states[i] = {prefix, window_start, previous, current + weight}
+        expire = math.max(expire, window_start + 2 * interval - now)
+    end
+
+    if failing >= 0 then
+        return {failing, math.max(math.ceil(retry_at - now), 1)}
+    end
+
+    for i=1,rates_count do
+        local state = states[i]
+        redis.call(
+            'HSET', bucket,
+            state[1]..'window_start', string.format('%d', state[2]),
+            state[1]..'previous', state[3],
+            state[1]..'current', state[4]
+        )
+    end
+
+    redis.call('PEXPIRE', bucket, math.ceil(expire))
+    return {-1, 0}
+    """
+
+    # All-or-nothing PUT_ITEM over several bucket keys (RedisBucket.put_many).
+    # KEYS holds the n bucket keys, then n sequence keys: a compact bucket's,
+    # or any other bucket's own key, unused. ARGV holds, per key: now, weight,
+    # member prefix ("" for compact members), rates count and the (interval,
+    # limit) pairs. Units are inserted key by key; on the first full rate
+    # every unit inserted by this call is removed again. Returns {failing key
+    # index or -1, failing rate index, retry-after ms}.
+    PUT_MANY = """
+    local function units(bucket, now, prefix, first, count, command)
+        local batch = {}
+        -- Each member adds up to two unpacked arguments; stay below Lua limits.
+        local batch_size = 1000
+
+        for i=1,count do
+            if command == 'ZADD' then
+                batch[#batch + 1] = now
+            end
+            if prefix == '' then
+                batch[#batch + 1] = string.format('%d', first + i)
+            else
+                batch[#batch + 1] = prefix..i
+            end
+
+            if #batch >= batch_size * 2 then
+                redis.call(command, bucket, unpack(batch))
+                batch = {}
+            end
+        end
+
+        if #batch > 0 then
+            redis.call(command, bucket, unpack(batch))
+        end
+    end
+
+    local inserted = {}
+    local cursor = 1
+    local buckets = #KEYS / 2
+
+    for k=1,buckets do
+        local bucket = KEYS[k]
+        local now = ARGV[cursor]
+        local space_required = tonumber(ARGV[cursor + 1])
+        local prefix = ARGV[cursor + 2]
+        local rates_count = tonumber(ARGV[cursor + 3])
+        cursor = cursor + 4
+
+        for i=1,rates_count do
+            local interval = tonumber(ARGV[cursor])
+            local limit = tonumber(ARGV[cursor + 1])
+            cursor = cursor + 2
+
+            local count = redis.call('ZCOUNT', bucket, now - interval, now)
+            if limit - tonumber(count) < space_required then
+                for _, unit in ipairs(inserted) do
+                    units(unit[1], unit[2], unit[3], unit[4], unit[5], 'ZREM')
+                end
+
+                local retry_after = 0
+                local bound_idx = limit - space_required
+                if bound_idx >= 0 then
+                    local bound = redis.call('ZREVRANGE', bucket, bound_idx, bound_idx, 'WITHSCORES')
+                    if #bound > 0 then
+                        retry_after = tonumber(bound[2]) - (tonumber(now) - interval) + 1
+                    end
+                end
+                return {k - 1, i - 1, retry_after}
+            end
+        end
+
+        local first = 0
+        if prefix == '' then
+            first = redis.call('INCRBY', KEYS[buckets + k], space_required) - space_required
+        end
+
+        units(bucket, now, prefix, first, space_required, 'ZADD')
+        inserted[#inserted + 1] = {bucket, now, prefix, first, space_required}
+    end
+
+    return {-1, -1, 0}
+    """
+
+
+# Script implementing each supported algorithm natively, keyed by type.
+_SCRIPTS = {
+    SlidingWindowLog: LuaScript.PUT_ITEM,
+    GCRA: LuaScript.GCRA,
+    SlidingWindowCounter: LuaScript.SLIDING_WINDOW_COUNTER,
+}
+
+
+def _hash_tag(key: str) -> Optional[str]:
+    """The hash tag Redis Cluster hashes instead of ``key``, if any: what is
+    between the first ``{`` and the next ``}``, when not empty."""
+    start = key.find("{")
+    end = key.find("}", start + 1) if start >= 0 else -1
+    return key[start + 1 : end] if end > start + 1 else None
+
+
+class RedisBatcher:
+    """Coalesce script calls from concurrent async acquires into one pipeline.
+
+    Each ``evalsha`` is queued; the first call of a batch schedules a flush
+    after ``window_ms`` (``0`` only yields to the event loop, which gathers
+    every acquire that became ready in the same tick), and a batch reaching
+    ``max_batch`` items is sent at once. A batch goes out as a single
+    non-transactional pipeline, so N concurrent acquires cost one round trip
+    instead of N. Every script call stays atomic on the server on its own.
+
+    Share one batcher between the buckets using the same async client: calls
+    for different bucket keys are coalesced together. A batcher belongs to
+    the event loop of its client.
+    """
+
+    def __init__(self, redis: AsyncRedis, window_ms: float = 0, max_batch: int = 128):
+        if window_ms < 0:
+            raise ValueError("window_ms must be >= 0")
+        if max_batch < 1:
+            raise ValueError("max_batch must be >= 1")
+
+        self.redis = redis
+        self.window_ms = window_ms
+        self.max_batch = max_batch
+        self._pending: List[Tuple[Tuple[Any, ...], asyncio.Future]] = []
+        self._flusher: Optional[asyncio.Task] = None
+        # Strong references to in-flight sends, so they are not collected.
+        self._sending: Set[asyncio.Task] = set()
+
+    async def evalsha(self, *args: Any) -> Any:
+        """Queue ``EVALSHA *args`` and wait for its reply."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((args, future))
+
+        if len(self._pending) >= self.max_batch:
+            self._spawn(self._send(self._take()))
+        elif self._flusher is None:
+            self._flusher = loop.create_task(self._flush_later())
+
+        return await future
+
+    def _take(self) -> List[Tuple[Tuple[Any, ...], asyncio.Future]]:
+        batch, self._pending = self._pending, []
+        return batch
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._sending.add(task)
+        task.add_done_callback(self._sending.discard)
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.window_ms / 1000)
+        self._flusher = None
+        batch = self._take()
+        if batch:
+            await self._send(batch)
+
+    async def _send(self, batch: List[Tuple[Tuple[Any, ...], asyncio.Future]]) -> None:
+        pipe = self.redis.pipeline(transaction=False)
+        for args, _ in batch:
+            pipe.evalsha(*args)
+
+        try:
+            replies = await pipe.execute(raise_on_error=False)
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        for (_, future), reply in zip(batch, replies, strict=True):
+            # A caller cancelled while waiting (e.g. by a timeout) has no
+            # future to resolve; its script already ran, as with a plain call.
+            if future.done():
+                continue
+            if isinstance(reply, Exception):
+                future.set_exception(reply)
+            else:
+                future.set_result(reply)
+
 
 class RedisBucket(AbstractBucket):
     """A bucket using redis for storing data
-    - We are not using redis' built-in TIME since it is non-deterministic
-    - In distributed context, use local server time or a remote time server
+    - We are not using redis' built-in TIME inside scripts since it is
+      non-deterministic; timestamps come from ``now()``
+    - In distributed context, pass ``clock=CachedClock(RedisClock(redis))``
+      (``AsyncCachedClock`` for an async client) so workers agree on Redis'
+      time without a ``TIME`` round trip per acquire; by default ``now()`` is
+      the local wall clock
     - Each bucket instance use a dedicated connection to avoid race-condition
     - can be either sync or async
+    - ``algorithm=GCRA()`` / ``SlidingWindowCounter()`` keep one hash of
+      per-rate state instead of a sorted set of items; use a bucket key not
+      shared with a log bucket
+    - with an async client, ``batcher=RedisBatcher(redis)`` pipelines the
+      puts of concurrent acquires
+    - on Redis Cluster, name related buckets with ``tagged_key`` so they share
+      a slot; ``put_many`` is atomic only over keys in one slot
+    - ``shards=K`` splits a hot log bucket over K sub-keys (on different
+      slots), each admitting its share of every limit; see ``__init__``
+    - ``compact_members=True`` stores each unit as an integer from a per-key
+      sequence instead of ``<name>:<uuid>:<unit>``; see ``__init__``
     """
 
     rates: List[Rate]
@@ -70,6 +429,16 @@ class RedisBucket(AbstractBucket):
     bucket_key: str
     script_hash: str
     redis: Union[Redis, AsyncRedis]
+    # Multi-key PUT_MANY script, registered on first use by put_many()
+    _put_many_script: Optional[Any] = None
+    batcher: Optional[RedisBatcher]
+    shards: int
+    # Sub-keys of a sharded bucket and their proportional rates
+    keys: List[str]
+    _shard_rates: List[List[Rate]]
+    # Heaviest put a shard's share admits; None when not sharded
+    _max_shard_weight: Optional[int]
+    compact_members: bool
 
     def __init__(
         self,
@@ -77,16 +446,108 @@ class RedisBucket(AbstractBucket):
         redis: Union[Redis, AsyncRedis],
         bucket_key: str,
         script_hash: str,
+        algorithm: Optional[Algorithm] = None,
+        batcher: Optional[RedisBatcher] = None,
+        clock: Optional[AbstractClock] = None,
+        shards: int = 1,
+        compact_members: bool = False,
     ):
+        """With ``shards > 1`` the items live in ``shards`` sorted sets,
+        ``<bucket_key>:0`` to ``<bucket_key>:<shards - 1>``, which Redis
+        Cluster hashes to different slots. Each put goes to the next shard in
+        turn and is checked against that shard's share of every limit; the
+        shares add up to the limit, with the remainder on the first shards. The bucket then never admits more than
+        its rates allow, but may reject early when load reaches the shards
+        unevenly. A rejected put reports its shard's rate as ``failing_rate``.
+        Sharding needs the log algorithm and a ``bucket_key`` without a hash
+        tag, which would put every shard in one slot.
+
+        A single put lands on one shard, so its weight is capped at the
+        smallest share, ``limit // shards`` of the tightest rate, rather than
+        at the limit; a heavier put raises ``ValueError``.
+
+        With ``compact_members`` each unit's member is the next integer of a
+        counter ``INCRBY``-ed in the script, kept in a sequence key beside
+        each item key (``sequence_key``, same cluster slot), instead of the
+        item name plus a uuid. Members shrink from ~40 bytes to a small
+        integer, which sorted sets store natively, and acquires skip the uuid.
+        ``peek`` then reports the member number as the item name. Buckets on
+        one key must agree on the setting.
+        """
         self.rates = rates
+        self._use_algorithm(algorithm, tuple(_SCRIPTS))
         self.redis = redis
         self.bucket_key = bucket_key
         self.script_hash = script_hash
+        self.batcher = batcher
         self.failing_rate = None
-
-    def now(self):
-        # TODO: Use a Redis time source via a Lua script
-        return time_ns() // 1000000
+        self._clock = clock if clock is not None else WallClock()
+        self.shards = shards
+        self.compact_members = compact_members
+
+        if compact_members and self.stateful:
+            raise ValueError("compact_members requires the log algorithm")
+
+        if shards < 1:
+            raise ValueError("shards must be at least 1")
+
+        if shards == 1:
+            self.keys = [bucket_key]
+            self._shard_rates = [rates]
+            self._max_shard_weight = None
+        else:
+            if self.stateful:
+                raise ValueError("shards requires the log algorithm")
+            if _hash_tag(bucket_key) is not None:
+                raise ValueError("a sharded bucket_key must not have a hash tag")
+            if any(rate.limit < shards for rate in rates):
+                raise ValueError("every rate limit must be at least shards")
+
+            self.keys = [f"{bucket_key}:{shard}" for shard in range(shards)]  # noqa: E231
+            self._shard_rates = [
+                [Rate(rate.limit // shards + (shard < rate.limit % shards), rate.interval) for rate in rates] for shard in range(shards)
+            ]
+            self._max_shard_weight = min(rate.limit // shards for rate in rates)
+
+        # Shares are fixed (instances share the keys) with the remainder on
+        # the first shards, which a round-robin from shard 0 fills first: a
+        # single instance admits exactly up to each limit.
+        self._next_shard = 0
+
+    @staticmethod
+    def tagged_key(tag: str, name: str) -> str:
+        """Key ``{tag}:name``: Redis Cluster hashes only ``tag``, so buckets
+        named with the same tag share a slot and ``put_many`` over them stays
+        a single atomic script call."""
+        if not tag or "{" in tag or "}" in tag:
+            raise ValueError("tag must be non-empty and without braces")
+        return f"{{{tag}}}:{name}"  # noqa: E231
+
+    @staticmethod
+    def sequence_key(key: str) -> str:
+        """Sequence of ``key``'s compact members, in the same cluster slot:
+        ``key``'s hash tag, or ``key`` itself as the tag."""
+        return f"{key}:seq" if _hash_tag(key) is not None else f"{{{key}}}:seq"  # noqa: E231
+
+    def _shard(self, ahead: int = 0) -> int:
+        """The shard of the put ``ahead`` puts from now; ``_advance`` moves on."""
+        return (self._next_shard + ahead) % self.shards
+
+    def _advance(self, puts: int = 1) -> None:
+        self._next_shard = (self._next_shard + puts) % self.shards
+
+    def _check_shard_weight(self, item: RateItem) -> None:
+        if self._max_shard_weight is not None and item.weight > self._max_shard_weight:
+            raise ValueError(
+                f"weight {item.weight} exceeds {self._max_shard_weight}, the most one of {self.shards} shards admits; "
+                "use fewer shards or a higher limit"
+            )
+
+    def _member_prefix(self, item: RateItem) -> str:
+        if self.compact_members:
+            return ""
+        # NOTE: this is to avoid key collision since we are using ZSET
+        return f"{item.name}:{id_generator()}:"  # noqa: E231
 
     @classmethod
     def init(
@@ -94,79 +555,246 @@ class RedisBucket(AbstractBucket):
         rates: List[Rate],
         redis: Union[Redis, AsyncRedis],
         bucket_key: str,
+        algorithm: Optional[Algorithm] = None,
+        batcher: Optional[RedisBatcher] = None,
+        clock: Optional[AbstractClock] = None,
+        shards: int = 1,
+        compact_members: bool = False,
     ):
-        script_hash = redis.script_load(LuaScript.PUT_ITEM)
+        script = _SCRIPTS.get(type(algorithm or SlidingWindowLog()))
+
+        if script is None:
+            raise ValueError(f"{cls.__name__} does not support {type(algorithm).__name__}")
+
+        script_hash = redis.script_load(script)
 
         if isawaitable(script_hash):
 
             async def _async_init():
                 nonlocal script_hash
                 script_hash = await script_hash
-                return cls(rates, redis, bucket_key, script_hash)
+                return cls(
+                    rates,
+                    redis,
+                    bucket_key,
+                    script_hash,
+                    algorithm=algorithm,
+                    batcher=batcher,
+                    clock=clock,
+                    shards=shards,
+                    compact_members=compact_members,
+                )
 
             return _async_init()
 
-        return cls(rates, redis, bucket_key, script_hash)
+        return cls(
+            rates,
+            redis,
+            bucket_key,
+            script_hash,
+            algorithm=algorithm,
+            batcher=batcher,
+            clock=clock,
+            shards=shards,
+            compact_members=compact_members,
+        )
+
+    def _state_fields(self) -> List[str]:
+        assert isinstance(self._algorithm, StatefulAlgorithm)
+        return [f"{rate.interval}:{field}" for rate in self.rates for field in self._algorithm.state_fields]  # noqa: E231
+
+    def _check_and_insert(self, item: RateItem) -> Union[Decision, Awaitable[Decision]]:
+        self._check_shard_weight(item)
+        shard = self._shard()
+        self._advance()
+        keys = [self.keys[shard]]
+        rates = self._shard_rates[shard]
+        if self.compact_members:
+            keys.append(self.sequence_key(keys[0]))
+        rate_args = [value for rate in rates for value in (rate.interval, rate.limit)]
+
+        if self.stateful:
+            args: List[Any] = [item.timestamp, item.weight, len(self.rates), *rate_args]
+        else:
+            args = [item.timestamp, item.weight, self._member_prefix(item), len(rates), *rate_args]
+
+        evalsha = self.batcher.evalsha if self.batcher is not None else self.redis.evalsha
+        result = evalsha(self.script_hash, len(keys), *keys, *args)
+
+        def _handle_sync(returned: List[int]) -> Decision:
+            idx, retry_after = returned
+            if idx < 0:
+                return Decision()
+
+            return Decision(failing_rate=rates[idx], retry_after=retry_after)
+
+        async def _handle_async(returned: Awaitable[List[int]]) -> Decision:
+            assert isawaitable(returned), "Not corotine"
+            return _handle_sync(await returned)
+
+        return _handle_async(result) if isawaitable(result) else _handle_sync(result)
+
+    def put_many(self, entries: Sequence[Tuple[AbstractBucket, RateItem]]) -> Union[int, Awaitable[int]]:
+        """All-or-nothing put over several log buckets sharing this bucket's
+        Redis client, in a single multi-key Lua call. On Redis Cluster the
+        keys (a sharded bucket's chosen shard) must hash to one slot."""
+        shared = all(isinstance(bucket, RedisBucket) and bucket.redis is self.redis and not bucket.stateful for bucket, _ in entries)
+
+        if not shared:
+            return super().put_many(entries)
+
+        keys: List[str] = []
+        sequence_keys: List[str] = []
+        args: List[Union[str, int]] = []
+        entry_rates: List[List[Rate]] = []
+        # Puts per bucket: shards are only taken once the script will run.
+        puts: Dict[int, int] = {}
+        for bucket, item in entries:
+            assert isinstance(bucket, RedisBucket)
+            bucket._check_shard_weight(item)
+            shard = bucket._shard(ahead=puts.get(id(bucket), 0))
+            puts[id(bucket)] = puts.get(id(bucket), 0) + 1
+            rates = bucket._shard_rates[shard]
+            key = bucket.keys[shard]
+            keys.append(key)
+            sequence_keys.append(bucket.sequence_key(key) if bucket.compact_members else key)
+            entry_rates.append(rates)
+            args.extend([item.timestamp, item.weight, bucket._member_prefix(item), len(rates)])
+            args.extend(value for rate in rates for value in (rate.interval, rate.limit))
+
+        keyslot = getattr(self.redis, "keyslot", None)
+        if keyslot is not None and len({keyslot(key) for key in keys}) > 1:
+            # A cluster runs a script on one node only (CROSSSLOT otherwise).
+            return super().put_many(entries)
+
+        if self._put_many_script is None:
+            # register_script retries with SCRIPT LOAD on NOSCRIPT, for sync
+            # and async clients alike.
+            self._put_many_script = self.redis.register_script(LuaScript.PUT_MANY)
+
+        for bucket in {id(bucket): bucket for bucket, _ in entries}.values():
+            assert isinstance(bucket, RedisBucket)
+            bucket._advance(puts[id(bucket)])
+
+        result = self._put_many_script(keys=keys + sequence_keys, args=args)
+
+        def _handle_sync(returned: List[int]) -> int:
+            idx, rate_idx, retry_after = returned
+
+            if idx < 0:
+                for bucket, item in entries:
+                    bucket._apply_decision(Decision(), item)
+                return -1
+
+            bucket, item = entries[idx]
+            bucket._apply_decision(Decision(failing_rate=entry_rates[idx][rate_idx], retry_after=retry_after), item)
+            return idx
+
+        async def _handle_async(returned: Awaitable[List[int]]) -> int:
+            return _handle_sync(await returned)
+
+        return _handle_async(result) if isawaitable(result) else _handle_sync(result)  # type: ignore[arg-type]
 
-    def _check_and_insert(self, item: RateItem) -> Union[Rate, None, Awaitable[Optional[Rate]]]:
-        keys = [self.bucket_key]
+    def put(self, item: RateItem) -> Union[bool, Awaitable[bool]]:
+        """Add item to key"""
+        decision = self._check_and_insert(item)
+        if isawaitable(decision):
 
-        args = [
-            item.timestamp,
-            item.weight,
-            # NOTE: this is to avoid key collision since we are using ZSET
-            f"{item.name}:{id_generator()}:",  # noqa: E231
-            len(self.rates),
-            *[value for rate in self.rates for value in (rate.interval, rate.limit)],
-        ]
+            async def _handle_async():
+                return self._apply_decision(await decision, item)
 
-        idx = self.redis.evalsha(self.script_hash, len(keys), *keys, *args)
+            return _handle_async()
 
-        def _handle_sync(returned_idx: int):
-            assert isinstance(returned_idx, int), "Not int"
-            if returned_idx < 0:
-                return None
+        assert isinstance(decision, Decision)
+        return self._apply_decision(decision, item)
 
-            return self.rates[returned_idx]
+    def _pipelined(self, calls: Sequence[Tuple[str, Sequence[Any]]], **kwargs: Any) -> Union[List[Any], Awaitable[List[Any]]]:
+        """Run ``(command, args)`` calls in one non-transactional pipeline
+        (split per node by a cluster client)."""
+        pipe = self.redis.pipeline(transaction=False)
+        for command, args in calls:
+            getattr(pipe, command)(*args, **kwargs)
+        return pipe.execute()
 
-        async def _handle_async(returned_idx: Awaitable[int]):
-            assert isawaitable(returned_idx), "Not corotine"
-            awaited_idx = await returned_idx
-            return _handle_sync(awaited_idx)
+    def _each_shard(self, command: str, *args: Any, **kwargs: Any) -> Union[List[Any], Awaitable[List[Any]]]:
+        """Run ``command`` on every shard key."""
+        return self._pipelined([(command, (key, *args)) for key in self.keys], **kwargs)
 
-        return _handle_async(idx) if isawaitable(idx) else _handle_sync(idx)
+    def _sum_shards(self, command: str, *args: Any) -> Union[int, Awaitable[int]]:
+        return self._sum(self._each_shard(command, *args))
 
-    def put(self, item: RateItem) -> Union[bool, Awaitable[bool]]:
-        """Add item to key"""
-        failing_rate = self._check_and_insert(item)
-        if isawaitable(failing_rate):
+    @staticmethod
+    def _sum(results: Union[List[int], Awaitable[List[int]]]) -> Union[int, Awaitable[int]]:
+        if isawaitable(results):
 
-            async def _handle_async():
-                self.failing_rate = await failing_rate
-                return not bool(self.failing_rate)
+            async def _awaiting():
+                return sum(await results)
 
-            return _handle_async()
+            return _awaiting()
 
-        assert isinstance(failing_rate, Rate) or failing_rate is None
-        self.failing_rate = failing_rate
-        return not bool(self.failing_rate)
+        return sum(results)  # type: ignore[arg-type]
 
     def leak(self, current_timestamp: Optional[int] = None) -> Union[int, Awaitable[int]]:
         assert current_timestamp is not None
-        return self.redis.zremrangebyscore(
-            self.bucket_key,
-            0,
-            self._algorithm.leak_bound(self.rates, current_timestamp),
-        )
+        if self.stateful:
+            # Per-rate state expires on its own (PEXPIRE); nothing to leak.
+            return 0
+
+        bound = self._algorithm.leak_bound(self.rates, current_timestamp)
+
+        if self.shards > 1:
+            return self._sum_shards("zremrangebyscore", 0, bound)
+
+        return self.redis.zremrangebyscore(self.bucket_key, 0, bound)
 
     def flush(self):
         self.failing_rate = None
-        return self.redis.delete(self.bucket_key)
+        # A DEL per item key, with its sequence key (same slot): shard keys
+        # live in different cluster slots.
+        deletes = [(key, self.sequence_key(key)) if self.compact_members else (key,) for key in self.keys]
+
+        if len(deletes) == 1:
+            return self.redis.delete(*deletes[0])
+
+        return self._sum(self._pipelined([("delete", keys) for keys in deletes]))
 
     def count(self):
-        return self.redis.zcard(self.bucket_key)
+        if not isinstance(self._algorithm, StatefulAlgorithm):
+            if self.shards > 1:
+                return self._sum_shards("zcard")
+            return self.redis.zcard(self.bucket_key)
+
+        algorithm = self._algorithm
+        values = self.redis.hmget(self.bucket_key, self._state_fields())
+        width = len(algorithm.state_fields)
+
+        def _handle_values(received: List[Optional[bytes]]) -> int:
+            states = []
+            for idx, rate in enumerate(self.rates):
+                fields = received[idx * width : (idx + 1) * width]
+                if any(value is None for value in fields):
+                    states.append(algorithm.initial_state(rate))
+                else:
+                    states.append(tuple(float(value) for value in fields))  # type: ignore[arg-type]
+
+            return algorithm.outstanding(self.rates, states, self.now())
+
+        if isawaitable(values):
+
+            async def _awaiting():
+                return _handle_values(await values)
+
+            return _awaiting()
+
+        return _handle_values(values)  # type: ignore[arg-type]
 
     def peek(self, index: int) -> Union[RateItem, None, Awaitable[Optional[RateItem]]]:
+        if self.stateful:
+            return None
+
+        if self.shards > 1:
+            return self._peek_shards(index)
+
         items = self.redis.zrange(
             self.bucket_key,
             -1 - index,
@@ -197,3 +825,26 @@ class RedisBucket(AbstractBucket):
 
         assert isinstance(items, list)
         return _handle_items(items)
+
+    def _peek_shards(self, index: int) -> Union[RateItem, None, Awaitable[Optional[RateItem]]]:
+        """``peek`` over every shard: the ``index``-th newest of their newest
+        ``index + 1`` items each."""
+        results = self._each_shard("zrange", -1 - index, -1, withscores=True, score_cast_func=int)
+
+        def _handle_results(received: List[List[Tuple[Any, int]]]) -> Optional[RateItem]:
+            items = sorted((item for items in received for item in items), key=lambda item: item[1], reverse=True)
+
+            if len(items) <= index:
+                return None
+
+            name, timestamp = items[index]
+            return RateItem(name=str(name), timestamp=timestamp)
+
+        if isawaitable(results):
+
+            async def _awaiting():
+                return _handle_results(await results)
+
+            return _awaiting()
+
+        return _handle_results(results)  # type: ignore[arg-type]
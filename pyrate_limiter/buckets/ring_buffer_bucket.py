@@ -0,0 +1,158 @@
+"""In-memory bucket backed by a fixed-capacity ring buffer"""
+
+from array import array
+from bisect import bisect_left
+from threading import RLock
+from typing import Any, Awaitable, List, Optional, Sequence, Tuple, Union
+
+from ..abstracts.algorithm import Decision, SlidingWindowLog
+from ..abstracts.bucket import AbstractBucket
+from ..abstracts.rate import Rate, RateItem
+from .in_memory_bucket import _in_memory_batch, _put_many_in_memory
+
+# Layout of the buffer: two header slots followed by `capacity` timestamp
+# slots. Keeping the pointers inside the buffer (rather than as attributes)
+# means a buffer living in shared memory carries the whole bucket state.
+_WRITTEN = 0  # total units ever written; the next unit goes to slot WRITTEN % capacity
+_START = 1  # logical index of the oldest unit not leaked yet
+_HEADER = 2
+
+
+class RingBufferBucket(AbstractBucket):
+    """In-memory bucket preallocated to the largest rate limit
+
+    A bucket can never hold more than ``rates[-1].limit`` units inside its
+    widest window, so this bucket stores one timestamp per unit in a ring of
+    exactly that many slots and never grows:
+
+    - Admission is O(1) per rate: ``weight`` more units fit a rate iff the
+      unit ``limit - weight`` positions back from the latest is already out of
+      that rate's window.
+    - Old units are simply overwritten, so the bucket stays bounded without a
+      background Leaker (``requires_leak = False``). ``leak`` is still
+      supported and only moves the start pointer, to keep ``count`` exact.
+
+    Item names are not stored; ``peek`` returns items with an empty name.
+    """
+
+    is_async = False
+    requires_leak = False
+    failing_rate: Optional[Rate]
+
+    def __init__(self, rates: List[Rate]):
+        self.rates = rates  # AbstractBucket.rates setter sorts + validates
+        self.capacity = self.rates[-1].limit
+        self._buf = self._allocate(_HEADER + self.capacity)
+        self._lock: Any = RLock()
+
+    def _allocate(self, size: int) -> Any:
+        """Zeroed int64 buffer of ``size`` slots."""
+        return array("q", bytes(8 * size))
+
+    def _timestamp_at(self, logical: int) -> int:
+        return self._buf[_HEADER + logical % self.capacity]
+
+    def _live_start(self) -> int:
+        """Logical index of the oldest unit still stored (neither leaked nor
+        overwritten)."""
+        return max(self._buf[_START], self._buf[_WRITTEN] - self.capacity)
+
+    def put(self, item: RateItem) -> bool:
+        if item.weight == 0:
+            return True
+
+        with self._lock:
+            written = self._buf[_WRITTEN]
+            live_start = self._live_start()
+
+            for rate in self.rates:
+                if item.weight > rate.limit:
+                    return self._apply_decision(Decision(failing_rate=rate), item)
+
+                # The unit that must already be outside the window for `weight`
+                # more units to fit; if it was never written (or was leaked)
+                # there is room.
+                bound = written - 1 - (rate.limit - item.weight)
+
+                if bound >= live_start and self._timestamp_at(bound) >= item.timestamp - rate.interval:
+                    # The same unit waiting() would peek, so the retry is exact.
+                    retry_after = SlidingWindowLog.retry_after(rate, item.timestamp, self._timestamp_at(bound))
+                    return self._apply_decision(Decision(failing_rate=rate, retry_after=retry_after), item)
+
+            self._write(written, item.timestamp, item.weight)
+            self._buf[_WRITTEN] = written + item.weight
+            return self._apply_decision(Decision(), item)
+
+    def _write(self, logical: int, timestamp: int, count: int) -> None:
+        """Fill ``count`` slots from ``logical`` onwards (wrapping) with
+        ``timestamp`` using at most two slice assignments."""
+        first = logical % self.capacity
+        head = min(count, self.capacity - first)
+        self._buf[_HEADER + first : _HEADER + first + head] = array("q", [timestamp]) * head
+
+        if count > head:
+            self._buf[_HEADER : _HEADER + count - head] = array("q", [timestamp]) * (count - head)
+
+    def put_many(self, entries: Sequence[Tuple[AbstractBucket, RateItem]]) -> Union[int, Awaitable[int]]:
+        if not _in_memory_batch(entries):
+            return super().put_many(entries)
+
+        return _put_many_in_memory(entries)
+
+    def _snapshot(self, weight: int):
+        """The pointers, plus the slots putting ``weight`` units may overwrite."""
+        written = self._buf[_WRITTEN]
+        overwritten = [self._timestamp_at(written + offset) for offset in range(min(weight, self.capacity))]
+        return written, self._buf[_START], overwritten
+
+    def _restore(self, snapshot) -> None:
+        written, start, overwritten = snapshot
+
+        for offset, timestamp in enumerate(overwritten):
+            self._buf[_HEADER + (written + offset) % self.capacity] = timestamp
+
+        self._buf[_WRITTEN] = written
+        self._buf[_START] = start
+
+    def leak(self, current_timestamp: Optional[int] = None) -> int:
+        assert current_timestamp is not None
+        with self._lock:
+            lower_bound = self._algorithm.leak_bound(self.rates, current_timestamp)
+            live = range(self._live_start(), self._buf[_WRITTEN])
+            remove_count = bisect_left(live, lower_bound, key=self._timestamp_at)
+
+            if remove_count:
+                self._buf[_START] = live.start + remove_count
+
+            return remove_count
+
+    def flush(self) -> None:
+        with self._lock:
+            self.failing_rate = None
+            self._buf[_START] = self._buf[_WRITTEN]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._buf[_WRITTEN] - self._live_start()
+
+    def peek(self, index: int) -> Optional[RateItem]:
+        with self._lock:
+            count = self.count()
+
+            if not abs(index) < count:
+                return None
+
+            if index < 0:
+                index += count
+
+            return RateItem("", self._timestamp_at(self._buf[_WRITTEN] - 1 - index))
+
+    def __getstate__(self):
+        """Drop the thread lock for pickling, like ``InMemoryBucket``."""
+        state = self.__dict__.copy()
+        state.pop("_lock", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = RLock()
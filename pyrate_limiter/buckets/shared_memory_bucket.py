@@ -0,0 +1,94 @@
+"""multiprocessing bucket: a RingBufferBucket whose ring lives in
+multiprocessing.shared_memory, guarded by a multiprocessing.RLock.
+"""
+
+import os
+import weakref
+from multiprocessing import RLock
+from multiprocessing.shared_memory import SharedMemory
+from multiprocessing.synchronize import RLock as LockType
+from typing import Any, List, Optional
+
+from ..abstracts import Rate
+from .ring_buffer_bucket import _HEADER, RingBufferBucket
+
+
+def _detach(buf: memoryview, shm: SharedMemory, owner_pid: Optional[int]) -> None:
+    """Release the view, then the mapping; the creating process also frees
+    the block. Registered as a finalizer, so it also runs at exit."""
+    buf.release()
+    shm.close()
+    if os.getpid() == owner_pid:
+        shm.unlink()
+
+
+class SharedMemoryBucket(RingBufferBucket):
+    """``RingBufferBucket`` shared across processes
+
+    The ring of int64 timestamps and its two pointers sit in one
+    ``multiprocessing.shared_memory`` block, so every process reads and writes
+    them directly under ``mp_lock``: an admit is a few memory accesses rather
+    than the IPC round trips to a manager process of ``MultiprocessBucket``.
+
+    Create it in the parent with ``init`` and pass it to the workers (e.g. via
+    a ``ProcessPoolExecutor`` initializer, like ``MultiprocessBucket``); each
+    worker attaches to the same block. The creating process frees the block
+    on ``close()``. As with ``RingBufferBucket``, item names are not stored.
+    """
+
+    mp_lock: LockType
+
+    def __init__(self, rates: List[Rate], mp_lock: LockType):
+        self.mp_lock = mp_lock
+        super().__init__(rates)
+        # RingBufferBucket guards the ring with self._lock; aliasing it to the
+        # cross-process lock makes every inherited method process-safe.
+        self._lock = mp_lock
+
+    def _allocate(self, size: int) -> Any:
+        self._shm = SharedMemory(create=True, size=8 * size)
+        self._owner_pid = os.getpid()
+        buf = self._attach()
+        buf[:] = super()._allocate(size)
+        return buf
+
+    def _attach(self) -> memoryview:
+        """int64 view of the block, released by ``close()`` or at exit."""
+        assert self._shm.buf is not None
+        buf = self._shm.buf[: 8 * (_HEADER + self.capacity)].cast("q")
+        self._detach = weakref.finalize(self, _detach, buf, self._shm, self._owner_pid)
+        return buf
+
+    def limiter_lock(self):
+        return self.mp_lock
+
+    def close(self) -> None:
+        """Detach from the block; the creating process also frees it."""
+        self._detach()
+
+    def __getstate__(self):
+        # The block travels by name and each copy attaches its own view.
+        state = super().__getstate__()
+        state.pop("_buf", None)
+        state.pop("_detach", None)
+        state["_shm"] = self._shm.name
+        # Only the bucket ``init`` returned frees the block, not its copies.
+        state["_owner_pid"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._shm = SharedMemory(state["_shm"])
+        self._buf = self._attach()
+        self._lock = self.mp_lock
+
+    @classmethod
+    def init(
+        cls,
+        rates: List[Rate],
+        mp_lock: Optional[LockType] = None,
+    ):
+        """
+        Creates the shared memory block and lock so that this bucket can be shared across multiple processes.
+        """
+        return cls(rates, mp_lock=mp_lock or RLock())
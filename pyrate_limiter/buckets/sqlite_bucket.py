@@ -2,16 +2,17 @@
 
 import logging
 import sqlite3
-from contextlib import nullcontext
+from contextlib import ExitStack, nullcontext
 from pathlib import Path
 from tempfile import gettempdir
-from threading import RLock
+from threading import Event, Lock, RLock, Thread, current_thread
 from time import time, time_ns
-from typing import List, Optional, Tuple, Union
+from typing import Awaitable, List, Optional, Sequence, Tuple, Union
 
-from ..abstracts import AbstractBucket, Rate, RateItem
+from ..abstracts import AbstractBucket, Algorithm, Decision, Rate, RateItem, SlidingWindowLog, StatefulAlgorithm
 from ..clocks import AbstractClock
 from ..utils import dedicated_sqlite_clock_connection
+from .in_memory_bucket import InMemoryBucket
 
 logger = logging.getLogger(__name__)
 
@@ -26,22 +27,87 @@ class Queries:
     CREATE_INDEX_ON_TIMESTAMP = """
     CREATE INDEX IF NOT EXISTS '{index_name}' ON '{table_name}' (item_timestamp)
     """
-    COUNT_BEFORE_INSERT = """
-    SELECT :interval{index} as interval, COUNT(*) FROM '{table}'
-    WHERE item_timestamp >= :current_timestamp - :interval{index}
+    # weighted_rows: one row per put, carrying its weight, instead of one row
+    # per unit. Existing unit-row tables are migrated by adding the column:
+    # each of their rows is one unit, which is what the default says. The
+    # index covers weight so window sums never read the table itself.
+    CREATE_WEIGHTED_BUCKET_TABLE = """
+    CREATE TABLE IF NOT EXISTS '{table}' (
+        name VARCHAR,
+        item_timestamp INTEGER,
+        weight INTEGER NOT NULL DEFAULT 1
+    )
+    """
+    TABLE_COLUMNS = "SELECT name FROM pragma_table_info(?)"
+    ADD_WEIGHT_COLUMN = "ALTER TABLE '{table}' ADD COLUMN weight INTEGER NOT NULL DEFAULT 1"
+    CREATE_INDEX_ON_TIMESTAMP_WEIGHT = """
+    CREATE INDEX IF NOT EXISTS '{index_name}' ON '{table_name}' (item_timestamp, weight)
+    """
+    DROP_INDEX = "DROP INDEX IF EXISTS '{index}'"
+    # One COUNT(*) per rate over its index range: SQLite counts a range by
+    # stepping the index without decoding rows, far cheaper than a single
+    # scan of the widest window evaluating a CASE per rate on every row.
+    WINDOW_COUNT = "(SELECT COUNT(*) FROM '{table}' WHERE item_timestamp >= :timestamp - :interval{index}) AS count{index}"
+    WINDOWS = "SELECT {counts}"
+    # The timestamp waiting() would peek for a rate, evaluated only when the
+    # rate is full (CASE short-circuits the subquery).
+    WINDOW_BOUND = """
+    CASE WHEN count{index} > :bound{index} THEN (
+        SELECT item_timestamp FROM '{table}' ORDER BY item_timestamp DESC LIMIT 1 OFFSET :bound{index}
+    ) END
+    """
+    COUNT_WINDOWS = "SELECT {columns} FROM ({windows})"
+    WEIGHTED_WINDOW_COUNT = """
+    (SELECT COALESCE(SUM(weight), 0) FROM '{table}' WHERE item_timestamp >= :timestamp - :interval{index}) AS count{index}
+    """
+    # The n-th newest unit (0-based) is found with a running sum of weights,
+    # newest first, rather than an OFFSET over unit rows.
+    WEIGHTED_NTH_UNIT = """
+    SELECT name, item_timestamp, weight FROM (
+        SELECT name, item_timestamp, weight,
+        SUM(weight) OVER (ORDER BY item_timestamp DESC ROWS UNBOUNDED PRECEDING) AS units
+        FROM '{table}' {where}
+    ) WHERE units > {nth} ORDER BY units LIMIT 1
+    """
+    WEIGHTED_WINDOW_BOUND = """
+    CASE WHEN count{index} > :bound{index} THEN (SELECT item_timestamp FROM ({nth_unit})) END
+    """
+    # Check and insert as one statement: ``weight`` unit rows, inserted only
+    # when every window fits them. The CTEs follow INSERT rather than precede
+    # it so that cursor.rowcount reports the rows inserted.
+    ADMIT = """
+    INSERT INTO '{table}' (name, item_timestamp)
+    WITH RECURSIVE units(n) AS (SELECT 1 WHERE :weight > 0 UNION ALL SELECT n + 1 FROM units WHERE n < :weight),
+    windows AS ({windows})
+    SELECT :name, :timestamp FROM units WHERE (SELECT {fits} FROM windows)
+    """
+    WEIGHTED_ADMIT = """
+    INSERT INTO '{table}' (name, item_timestamp, weight)
+    WITH windows AS ({windows})
+    SELECT :name, :timestamp, :weight WHERE :weight > 0 AND (SELECT {fits} FROM windows)
     """
     PUT_ITEM = """
     INSERT INTO '{table}' (name, item_timestamp) VALUES (?, ?)
     """
-    LEAK = """
-    DELETE FROM "{table}" WHERE rowid IN (
-    SELECT rowid FROM "{table}" ORDER BY item_timestamp ASC LIMIT {count});
-    """.strip()
-    COUNT_BEFORE_LEAK = """SELECT COUNT(*) FROM '{table}' WHERE item_timestamp < {lower_bound}"""
+    PUT_WEIGHTED_ITEM = """
+    INSERT INTO '{table}' (name, item_timestamp, weight) VALUES (?, ?, ?)
+    """
+    # One indexed range delete; the cursor's rowcount (changes()) is the
+    # number of rows removed.
+    LEAK = "DELETE FROM '{table}' WHERE item_timestamp < ?"
+    # Chunked leaks end each chunk after the n-th oldest expired row (0-based).
+    LEAK_CHUNK_END = "SELECT item_timestamp FROM '{table}' WHERE item_timestamp < ? ORDER BY item_timestamp LIMIT 1 OFFSET ?"
+    WEIGHTED_LEAK_UNITS = "SELECT COALESCE(SUM(weight), 0) FROM '{table}' WHERE item_timestamp < ?"
+    WEIGHTED_COUNT = "SELECT COALESCE(SUM(weight), 0) FROM '{table}'"
+    # Group commit: the log of the widest window, one row per timestamp,
+    # that a committed batch reloads into the in-memory view.
+    RECENT_UNITS = """
+    SELECT item_timestamp, {units} FROM '{table}' WHERE item_timestamp >= ?
+    GROUP BY item_timestamp ORDER BY item_timestamp
+    """
     FLUSH = """DELETE FROM '{table}'"""
     # The below sqls are for testing only
     DROP_TABLE = "DROP TABLE IF EXISTS '{table}'"
-    DROP_INDEX = "DROP INDEX IF EXISTS '{index}'"
     COUNT_ALL = "SELECT COUNT(*) FROM '{table}'"
     GET_ALL_ITEM = "SELECT * FROM '{table}' ORDER BY item_timestamp ASC"
     GET_FIRST_ITEM = "SELECT name, item_timestamp FROM '{table}' ORDER BY item_timestamp ASC"
@@ -55,11 +121,51 @@ class Queries:
     )
     """
     PEEK = 'SELECT * FROM "{table}" ORDER BY item_timestamp DESC LIMIT 1 OFFSET {count}'
+    # Per-rate state of a StatefulAlgorithm, one row per rate keyed by interval
+    CREATE_STATE_TABLE = """
+    CREATE TABLE IF NOT EXISTS '{table}' (
+        rate_interval INTEGER PRIMARY KEY,
+        {columns}
+    )
+    """
+    GET_STATES = "SELECT rate_interval, {columns} FROM '{table}'"
+    PUT_STATE = "INSERT OR REPLACE INTO '{table}' (rate_interval, {columns}) VALUES (?, {placeholders})"
 
 
 class SQLiteBucket(AbstractBucket):
     """For sqlite bucket, we are using the sql time function as the clock
     item's timestamp wont matter here
+
+    With a ``StatefulAlgorithm`` (e.g. ``algorithm=GCRA()``) the bucket keeps
+    one row per rate in the table ``<table>_<algorithm name>`` instead of one
+    row per item.
+
+    With ``weighted_rows=True`` each put writes one row carrying its weight
+    instead of ``weight`` unit rows, and windows are checked with
+    ``SUM(weight)``. The table needs a ``weight`` column: ``init_from_file``
+    creates it, or adds it to an existing table. Every bucket on a table must
+    then use the same setting.
+
+    With ``commit_interval_ms`` the bucket group-commits: puts are admitted
+    against an in-memory view of the log and queued, and a daemon thread
+    writes the queue every ``commit_interval_ms`` in one transaction, then
+    reloads the view from the table, picking up what other processes wrote.
+    Acquires then take neither the file lock nor a commit, so throughput is
+    no longer bound by fsync latency, at the cost of bounded staleness:
+
+    - each process sees the others' puts up to one interval late (an idle
+      bucket reloads the view on its next put), so across
+      ``P`` processes a window may admit up to ``P - 1`` intervals' worth of
+      their puts beyond its limit;
+    - puts not yet committed are lost if the process dies without ``close()``.
+
+    ``count``, ``peek``, ``leak`` and ``flush`` commit the queue first, and
+    ``commit()`` does so on demand.
+
+    ``leak`` deletes expired rows with one range ``DELETE``. With
+    ``leak_chunk_size`` it deletes about that many rows per transaction
+    instead, releasing the lock in between, so puts never wait behind a long
+    leak of a large table.
     """
 
     is_async = False
@@ -67,14 +173,45 @@ class SQLiteBucket(AbstractBucket):
     failing_rate: Optional[Rate]
     conn: sqlite3.Connection
     table: str
-    full_count_query: str
     lock: RLock
     use_limiter_lock: bool
-
-    def __init__(self, rates: List[Rate], conn: sqlite3.Connection, table: str, lock=None):
+    weighted_rows: bool
+    commit_interval_ms: Optional[float]
+    leak_chunk_size: Optional[int]
+
+    def __init__(
+        self,
+        rates: List[Rate],
+        conn: sqlite3.Connection,
+        table: str,
+        lock=None,
+        algorithm: Optional[Algorithm] = None,
+        weighted_rows: bool = False,
+        commit_interval_ms: Optional[float] = None,
+        leak_chunk_size: Optional[int] = None,
+    ):
         self.conn = conn
         self.table = table
         self.rates = rates
+        self._use_algorithm(algorithm, (SlidingWindowLog, StatefulAlgorithm))
+
+        if weighted_rows and self.stateful:
+            raise ValueError("weighted_rows applies to the SlidingWindowLog algorithm only")
+
+        self.weighted_rows = weighted_rows
+
+        if commit_interval_ms is not None:
+            if commit_interval_ms <= 0:
+                raise ValueError("commit_interval_ms must be > 0")
+            if type(self._algorithm).admit is not SlidingWindowLog.admit:
+                raise ValueError("commit_interval_ms applies to the SlidingWindowLog algorithm only")
+
+        self.commit_interval_ms = commit_interval_ms
+
+        if leak_chunk_size is not None and leak_chunk_size < 1:
+            raise ValueError("leak_chunk_size must be >= 1")
+
+        self.leak_chunk_size = leak_chunk_size
 
         if not lock:
             self.use_limiter_lock = False
@@ -83,94 +220,428 @@ class SQLiteBucket(AbstractBucket):
             self.use_limiter_lock = True
             self.lock = lock
 
+        if isinstance(self._algorithm, StatefulAlgorithm):
+            self._init_state_table(self._algorithm)
+        else:
+            self._compose_queries()
+
+        if commit_interval_ms is not None:
+            self._init_group_commit()
+
+    def _compose_queries(self) -> None:
+        """Build the statements once per bucket: the sqlite3 module caches
+        prepared statements per connection keyed by their SQL text, so reusing
+        the same strings skips re-parsing as well as re-formatting. Rates are
+        bound as parameters; only their number shapes the SQL."""
+        indexes = range(len(self.rates))
+        columns = [f"count{index}" for index in indexes]
+        fits = " AND ".join(f"count{index} <= :fit{index}" for index in indexes)
+
+        if self.weighted_rows:
+            counts = [Queries.WEIGHTED_WINDOW_COUNT.format(table=self.table, index=index) for index in indexes]
+            for index in indexes:
+                where = f"WHERE item_timestamp >= :timestamp - :interval{index}"
+                nth_unit = Queries.WEIGHTED_NTH_UNIT.format(table=self.table, where=where, nth=f":bound{index}")
+                columns.append(Queries.WEIGHTED_WINDOW_BOUND.format(index=index, nth_unit=nth_unit))
+        else:
+            counts = [Queries.WINDOW_COUNT.format(table=self.table, index=index) for index in indexes]
+            columns += [Queries.WINDOW_BOUND.format(index=index, table=self.table) for index in indexes]
+
+        windows = Queries.WINDOWS.format(counts=", ".join(counts))
+        admit = Queries.WEIGHTED_ADMIT if self.weighted_rows else Queries.ADMIT
+        put = Queries.PUT_WEIGHTED_ITEM if self.weighted_rows else Queries.PUT_ITEM
+
+        self._q_count_windows = Queries.COUNT_WINDOWS.format(columns=", ".join(columns), windows=windows)
+        self._q_admit = admit.format(table=self.table, windows=windows, fits=fits)
+        self._q_put = put.format(table=self.table)
+        self._composed_rates = len(self.rates)
+
+    def _init_group_commit(self) -> None:
+        self._view = InMemoryBucket(self.rates)
+        self._pending: List[RateItem] = []
+        # Guards the view and the queue; puts hold nothing else.
+        self._view_lock = RLock()
+        # One commit at a time: the committer thread's or an explicit one.
+        self._commit_lock = Lock()
+        self._wake = Event()
+        self._committer: Optional[Thread] = None
+        units = "SUM(weight)" if self.weighted_rows else "COUNT(*)"
+        self._q_recent_units = Queries.RECENT_UNITS.format(table=self.table, units=units)
+
+        with self.lock:
+            self._reload_view(self._recent_units())
+
+    def _recent_units(self) -> List[Tuple[int, int]]:
+        """(timestamp, units) of the widest window in the table; the caller
+        holds ``self.lock``."""
+        cur = self.conn.execute(self._q_recent_units, (self.now() - self.rates[-1].interval,))
+        rows = cur.fetchall()
+        cur.close()
+        return rows
+
+    def _reload_view(self, rows: List[Tuple[int, int]]) -> None:
+        """Rebuild the view from committed ``rows`` plus the queued puts."""
+        with self._view_lock:
+            items = [RateItem(self.table, timestamp, weight=units) for timestamp, units in rows]
+            self._view._load(sorted(items + self._pending, key=lambda item: item.timestamp))
+
+    def _refresh_idle_view(self) -> None:
+        """Reload the view before the first put after the committer retired:
+        no commit has reloaded it since, so it misses whatever other
+        processes wrote or leaked while this bucket was idle."""
+        if self._committer is not None:
+            return
+
+        with self._commit_lock:
+            with self.lock:
+                if self.conn is None:
+                    return
+                recent = self._recent_units()
+
+            self._reload_view(recent)
+
+    def _start_committer(self) -> None:
+        """Start the committer unless it runs; the caller holds ``_view_lock``,
+        under which an idle committer also retires."""
+        if self._committer is None and self.conn is not None:
+            self._committer = Thread(target=self._run_committer, name="PyrateLimiter's SQLite committer", daemon=True)
+            self._committer.start()
+
+    def _run_committer(self) -> None:
+        assert self.commit_interval_ms is not None
+        while not self._wake.wait(self.commit_interval_ms / 1000):
+            try:
+                self.commit()
+            except Exception as e:
+                logger.warning("SQLiteBucket group commit failed, will retry: %s", e)
+
+            # Retire once the queue is drained, so idle buckets cost no thread.
+            with self._view_lock:
+                if not self._pending or self.conn is None:
+                    self._committer = None
+                    return
+
+    def commit(self) -> int:
+        """Write the queued puts of a group-committing bucket in one
+        transaction and reload its view; return the number of puts written."""
+        if self.commit_interval_ms is None:
+            return 0
+
+        with self._commit_lock:
+            with self._view_lock:
+                batch, self._pending = self._pending, []
+
+            with self.lock:
+                if self.conn is None:
+                    return 0
+
+                rows: List[tuple]
+                if self.weighted_rows:
+                    rows = [(item.name, item.timestamp, item.weight) for item in batch]
+                else:
+                    rows = [(item.name, item.timestamp) for item in batch for _ in range(item.weight)]
+
+                if rows:
+                    try:
+                        self.conn.executemany(self._q_put, rows).close()
+                        self.conn.commit()
+                    except Exception:
+                        # Only a batch that never reached the table is queued
+                        # again; re-queueing a committed one would count it twice.
+                        self.conn.rollback()
+                        with self._view_lock:
+                            self._pending[:0] = batch
+                        raise
+
+                recent = self._recent_units()
+
+            self._reload_view(recent)
+            return len(batch)
+
+    def _put_grouped(self, item: RateItem) -> bool:
+        self._refresh_idle_view()
+
+        with self._view_lock:
+            if item.weight == 0:
+                return self._apply_decision(Decision(), item)
+
+            allowed = self._view.put(item)
+            if allowed:
+                self._pending.append(item)
+
+            self.failing_rate = self._view.failing_rate
+            self._retry = self._view._retry
+            self._start_committer()
+
+        return allowed
+
+    def _init_state_table(self, algorithm: StatefulAlgorithm) -> None:
+        self.state_table = f"{self.table}_{algorithm.name}"
+        columns = ", ".join(algorithm.state_fields)
+        placeholders = ", ".join("?" for _ in algorithm.state_fields)
+        self._q_get_states = Queries.GET_STATES.format(table=self.state_table, columns=columns)
+        self._q_put_state = Queries.PUT_STATE.format(table=self.state_table, columns=columns, placeholders=placeholders)
+
+        with self.lock:
+            query = Queries.CREATE_STATE_TABLE.format(
+                table=self.state_table,
+                columns=", ".join(f"{field} REAL NOT NULL" for field in algorithm.state_fields),
+            )
+            self.conn.execute(query).close()
+            self.conn.commit()
+
+    def _get_states(self, algorithm: StatefulAlgorithm):
+        cur = self.conn.execute(self._q_get_states)
+        stored = {row[0]: tuple(row[1:]) for row in cur.fetchall()}
+        cur.close()
+        return [stored.get(rate.interval, algorithm.initial_state(rate)) for rate in self.rates]
+
+    def _check_stateful(self, item: RateItem) -> Decision:
+        algorithm = self._algorithm
+        assert isinstance(algorithm, StatefulAlgorithm)
+        decision, states = algorithm.check(self.rates, self._get_states(algorithm), item.timestamp, item.weight)
+
+        if decision.allowed:
+            rows = [(rate.interval, *state) for rate, state in zip(self.rates, states, strict=True)]
+            self.conn.executemany(self._q_put_state, rows).close()
+
+        return decision
+
     def now(self):
         # TODO: Use Sqlite time source via a Lua script
         return time_ns() // 1000000
 
     def limiter_lock(self):
-        if self.use_limiter_lock:
+        # Group-committed puts never touch the database, so acquires need not
+        # hold the file lock.
+        if self.use_limiter_lock and self.commit_interval_ms is None:
             return self.lock
         else:
             return None
 
-    def _build_full_count_query(self, current_timestamp: int) -> Tuple[str, dict]:
-        full_query: List[str] = []
-
-        parameters = {"current_timestamp": current_timestamp}
+    def _parameters(self, item: RateItem) -> dict:
+        """Named parameters of ``_q_admit`` and ``_q_count_windows``."""
+        # Bind name + timestamp as parameters; never interpolate the
+        # user-supplied name into SQL (injection / quote-crash).
+        parameters = {"timestamp": item.timestamp, "weight": item.weight, "name": item.name}
 
         for index, rate in enumerate(self.rates):
             parameters[f"interval{index}"] = rate.interval
-            query = Queries.COUNT_BEFORE_INSERT.format(table=self.table, index=index)
-            full_query.append(query)
-
-        join_full_query = " union ".join(full_query) if len(full_query) > 1 else full_query[0]
-        return join_full_query, parameters
+            parameters[f"fit{index}"] = rate.limit - item.weight
+            parameters[f"bound{index}"] = max(rate.limit - item.weight, 0)
+
+        return parameters
+
+    def _count_windows(self, item: RateItem, parameters: dict) -> Decision:
+        """Count every window in one query and let the algorithm decide."""
+        cur = self.conn.execute(self._q_count_windows, parameters)
+        row = cur.fetchone()
+        cur.close()
+
+        count = len(self.rates)
+        decision = self._algorithm.admit(self.rates, row[:count], item.weight)
+        if not decision.allowed:
+            assert decision.failing_rate is not None
+            bound = row[count + self.rates.index(decision.failing_rate)]
+            retry_after = SlidingWindowLog.retry_after(decision.failing_rate, item.timestamp, bound)
+            return Decision(decision.failing_rate, retry_after)
+
+        return decision
+
+    def _check_and_insert(self, item: RateItem) -> Decision:
+        """Check ``item`` and write it if admitted, without committing; the
+        caller holds the lock and commits or rolls back."""
+        if self.stateful:
+            return self._check_stateful(item)
+
+        if self._composed_rates != len(self.rates):
+            self._compose_queries()
+
+        parameters = self._parameters(item)
+
+        if type(self._algorithm).admit is not SlidingWindowLog.admit:
+            # A custom admit can't be expressed in SQL: count, then insert.
+            decision = self._count_windows(item, parameters)
+            if decision.allowed and self.weighted_rows and item.weight > 0:
+                self.conn.execute(self._q_put, (item.name, item.timestamp, item.weight)).close()
+            elif decision.allowed and not self.weighted_rows:
+                self.conn.executemany(self._q_put, [(item.name, item.timestamp)] * item.weight).close()
+            return decision
+
+        cur = self.conn.execute(self._q_admit, parameters)
+        inserted = cur.rowcount
+        cur.close()
+
+        if item.weight > 0 and inserted == (1 if self.weighted_rows else item.weight):
+            return Decision()
+
+        # Rejected (or weight 0): recount to report the failing rate and
+        # retry-after, which only the rejected path needs.
+        return self._count_windows(item, parameters)
 
     def put(self, item: RateItem) -> bool:
+        if self.commit_interval_ms is not None:
+            return self._put_grouped(item)
+
         with self.lock:
-            query, parameters = self._build_full_count_query(item.timestamp)
-            cur = self.conn.execute(query, parameters)
-            rate_limit_counts = cur.fetchall()
-            cur.close()
+            decision = self._check_and_insert(item)
+            if decision.allowed:
+                self.conn.commit()
+            else:
+                # End the transaction the rejected INSERT opened, or it keeps
+                # other writers locked out until the next admitted put.
+                self.conn.rollback()
+            return self._apply_decision(decision, item)
+
+    def put_many(self, entries: Sequence[Tuple[AbstractBucket, RateItem]]) -> Union[int, Awaitable[int]]:
+        """All-or-nothing put over buckets sharing this bucket's connection,
+        in a single transaction. Group-committing buckets are put together
+        in memory instead, each committing with its own queue."""
+        if all(isinstance(bucket, SQLiteBucket) and bucket.commit_interval_ms is not None for bucket, _ in entries):
+            return self._put_many_grouped(entries)
+
+        if not all(isinstance(bucket, SQLiteBucket) and bucket.conn is self.conn and bucket.commit_interval_ms is None for bucket, _ in entries):
+            return super().put_many(entries)
+
+        locks = sorted({id(bucket.lock): bucket.lock for bucket, _ in entries}.values(), key=id)  # type: ignore[attr-defined]
+
+        with ExitStack() as stack:
+            for lock in locks:
+                stack.enter_context(lock)
+
+            for idx, (bucket, item) in enumerate(entries):
+                assert isinstance(bucket, SQLiteBucket)
+                decision = bucket._check_and_insert(item)
+
+                if not decision.allowed:
+                    self.conn.rollback()
+                    bucket._apply_decision(decision, item)
+                    return idx
 
-            # Each row is (interval, count); the UNION-of-COUNTs query returns
-            # them in ascending-interval order, matching self.rates. Verify that
-            # alignment, then defer the admit decision to the algorithm.
-            counts = []
-            for (interval, count), rate in zip(rate_limit_counts, self.rates, strict=True):
-                assert interval == rate.interval
-                counts.append(count)
-
-            decision = self._algorithm.admit(self.rates, counts, item.weight)
-            if not decision.allowed:
-                self.failing_rate = decision.failing_rate
-                return False
-
-            # Bind name + timestamp as parameters; never interpolate the
-            # user-supplied name into SQL (injection / quote-crash).
-            query = Queries.PUT_ITEM.format(table=self.table)
-            rows = [(item.name, item.timestamp)] * item.weight
-            self.conn.executemany(query, rows).close()
             self.conn.commit()
-            return True
+
+        for bucket, item in entries:
+            bucket._apply_decision(Decision(), item)
+
+        return -1
+
+    def _put_many_grouped(self, entries: Sequence[Tuple[AbstractBucket, RateItem]]) -> int:
+        buckets = sorted({id(bucket): bucket for bucket, _ in entries}.values(), key=id)
+        for bucket in buckets:
+            bucket._refresh_idle_view()  # type: ignore[attr-defined]
+
+        with ExitStack() as stack:
+            for bucket in buckets:
+                stack.enter_context(bucket._view_lock)  # type: ignore[attr-defined]
+
+            views: List[Tuple[AbstractBucket, RateItem]] = [(bucket._view, item) for bucket, item in entries]  # type: ignore[attr-defined]
+            failed = self._view.put_many(views)
+            assert isinstance(failed, int)
+
+            if failed >= 0:
+                bucket, item = entries[failed]
+                assert isinstance(bucket, SQLiteBucket)
+                bucket.failing_rate = bucket._view.failing_rate
+                bucket._retry = bucket._view._retry
+                return failed
+
+            for bucket, item in entries:
+                assert isinstance(bucket, SQLiteBucket)
+                if item.weight > 0:
+                    bucket._pending.append(item)
+                bucket._apply_decision(Decision(), item)
+
+            for bucket in buckets:
+                bucket._start_committer()  # type: ignore[attr-defined]
+
+        return -1
 
     def leak(self, current_timestamp: Optional[int] = None) -> int:
         """Leaking/clean up bucket"""
-        with self.lock:
-            if self.conn is None:
-                # The background Leaker may call leak() after close() has
-                # dropped the connection during teardown (issue #244).
-                return 0
-
-            assert current_timestamp is not None
-            query = Queries.COUNT_BEFORE_LEAK.format(
-                table=self.table,
-                lower_bound=self._algorithm.leak_bound(self.rates, current_timestamp),
-            )
-            cur = self.conn.execute(query)
-            count = cur.fetchone()[0]
-            query = Queries.LEAK.format(table=self.table, count=count)
-            cur.execute(query)
+        self.commit()
+
+        leaked = 0
+        while True:
+            with self.lock:
+                if self.conn is None:
+                    # The background Leaker may call leak() after close() has
+                    # dropped the connection during teardown (issue #244).
+                    return leaked
+
+                assert current_timestamp is not None
+                if self.stateful:
+                    return 0
+
+                lower_bound = self._algorithm.leak_bound(self.rates, current_timestamp)
+                bound = self._leak_chunk_bound(lower_bound)
+                leaked += self._leak_before(bound)
+                self.conn.commit()
+
+            if bound == lower_bound:
+                return leaked
+
+    def _leak_chunk_bound(self, lower_bound: int) -> int:
+        """Exclusive timestamp bound of the next leak: ``lower_bound``, or in
+        chunked mode just past the ``leak_chunk_size``-th oldest expired row.
+        Rows sharing that timestamp go in the same chunk, so every chunk
+        makes progress."""
+        if self.leak_chunk_size is None:
+            return lower_bound
+
+        cur = self.conn.execute(Queries.LEAK_CHUNK_END.format(table=self.table), (lower_bound, self.leak_chunk_size - 1))
+        row = cur.fetchone()
+        cur.close()
+        return row[0] + 1 if row else lower_bound
+
+    def _leak_before(self, bound: int) -> int:
+        """Delete the rows older than ``bound``; return the units removed."""
+        units = None
+        if self.weighted_rows:
+            cur = self.conn.execute(Queries.WEIGHTED_LEAK_UNITS.format(table=self.table), (bound,))
+            units = cur.fetchone()[0]
             cur.close()
-            self.conn.commit()
-            return count
+
+        cur = self.conn.execute(Queries.LEAK.format(table=self.table), (bound,))
+        deleted = cur.rowcount
+        cur.close()
+        return deleted if units is None else units
 
     def flush(self) -> None:
+        if self.commit_interval_ms is not None:
+            with self._commit_lock, self._view_lock:
+                self._pending.clear()
+                self._view.flush()
+
         with self.lock:
             self.conn.execute(Queries.FLUSH.format(table=self.table)).close()
+            if self.stateful:
+                self.conn.execute(Queries.FLUSH.format(table=self.state_table)).close()
             self.conn.commit()
             self.failing_rate = None
 
     def count(self) -> int:
+        self.commit()
+
         with self.lock:
-            cur = self.conn.execute(Queries.COUNT_ALL.format(table=self.table))
+            if isinstance(self._algorithm, StatefulAlgorithm):
+                return self._algorithm.outstanding(self.rates, self._get_states(self._algorithm), self.now())
+
+            cur = self.conn.execute((Queries.WEIGHTED_COUNT if self.weighted_rows else Queries.COUNT_ALL).format(table=self.table))
             ret = cur.fetchone()[0]
             cur.close()
             return ret
 
     def peek(self, index: int) -> Optional[RateItem]:
+        if self.stateful:
+            return None
+
+        self.commit()
+
         with self.lock:
-            query = Queries.PEEK.format(table=self.table, count=index)
+            if self.weighted_rows:
+                query = Queries.WEIGHTED_NTH_UNIT.format(table=self.table, where="", nth=index)
+            else:
+                query = Queries.PEEK.format(table=self.table, count=index)
             cur = self.conn.execute(query)
             item = cur.fetchone()
             cur.close()
@@ -178,9 +649,23 @@ class SQLiteBucket(AbstractBucket):
             if not item:
                 return None
 
+            if self.weighted_rows:
+                return RateItem(item[0], item[1], weight=item[2])
+
             return RateItem(item[0], item[1])
 
     def close(self):
+        if self.commit_interval_ms is not None and self.conn is not None:
+            # Stop the committer, then write what it left queued.
+            self._wake.set()
+            committer = self._committer
+            if committer is not None and committer is not current_thread():
+                committer.join()
+            try:
+                self.commit()
+            except Exception as e:
+                logger.warning("SQLiteBucket final group commit failed, %s", e)
+
         with self.lock:
             if self.conn is not None:
                 try:
@@ -191,8 +676,23 @@ class SQLiteBucket(AbstractBucket):
 
     @classmethod
     def init_from_file(
-        cls, rates: List[Rate], table: str = "rate_bucket", db_path: Optional[str] = None, create_new_table: bool = True, use_file_lock: bool = False
+        cls,
+        rates: List[Rate],
+        table: str = "rate_bucket",
+        db_path: Optional[str] = None,
+        create_new_table: bool = True,
+        use_file_lock: bool = False,
+        algorithm: Optional[Algorithm] = None,
+        weighted_rows: bool = False,
+        commit_interval_ms: Optional[float] = None,
+        leak_chunk_size: Optional[int] = None,
     ) -> "SQLiteBucket":
+        """Open (or create) ``db_path`` and the bucket's table in it.
+
+        With ``weighted_rows=True`` a table created by an earlier unit-row
+        bucket is migrated in place: its ``weight`` column is added, each
+        existing row counting as one unit.
+        """
         if db_path is None and use_file_lock:
             raise ValueError("db_path must be specified when using use_file_lock")
 
@@ -235,18 +735,42 @@ class SQLiteBucket(AbstractBucket):
                 cur.execute("PRAGMA synchronous=NORMAL;")
 
             if create_new_table:
-                cur.execute(Queries.CREATE_BUCKET_TABLE.format(table=table))
-
-            create_idx_query = Queries.CREATE_INDEX_ON_TIMESTAMP.format(
-                index_name=f"idx_{table}_rate_item_timestamp",
-                table_name=table,
-            )
+                create_table = Queries.CREATE_WEIGHTED_BUCKET_TABLE if weighted_rows else Queries.CREATE_BUCKET_TABLE
+                cur.execute(create_table.format(table=table))
+
+            index_name = f"idx_{table}_rate_item_timestamp"
+            if weighted_rows:
+                columns = {row[0] for row in cur.execute(Queries.TABLE_COLUMNS, (table,)).fetchall()}
+                if "weight" not in columns:
+                    logger.info("Adding a weight column to SQLite table %s for weighted_rows", table)
+                    cur.execute(Queries.ADD_WEIGHT_COLUMN.format(table=table))
+
+                # The covering index supersedes the plain one.
+                cur.execute(Queries.DROP_INDEX.format(index=index_name))
+                create_idx_query = Queries.CREATE_INDEX_ON_TIMESTAMP_WEIGHT.format(
+                    index_name=f"{index_name}_weight",
+                    table_name=table,
+                )
+            else:
+                create_idx_query = Queries.CREATE_INDEX_ON_TIMESTAMP.format(
+                    index_name=index_name,
+                    table_name=table,
+                )
 
             cur.execute(create_idx_query)
             cur.close()
             sqlite_connection.commit()
 
-            return cls(rates, sqlite_connection, table=table, lock=file_lock)
+            return cls(
+                rates,
+                sqlite_connection,
+                table=table,
+                lock=file_lock,
+                algorithm=algorithm,
+                weighted_rows=weighted_rows,
+                commit_interval_ms=commit_interval_ms,
+                leak_chunk_size=leak_chunk_size,
+            )
 
 
 class SQLiteClock(AbstractClock):
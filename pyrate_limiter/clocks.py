@@ -2,13 +2,18 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from abc import ABC, abstractmethod
+from inspect import isawaitable
+from threading import Event, Thread
 from time import monotonic_ns, time_ns
-from typing import TYPE_CHECKING, Awaitable, Union
+from typing import TYPE_CHECKING, Awaitable, List, Optional, Tuple, Union
 
 if TYPE_CHECKING:
-    from psycopg_pool import ConnectionPool
+    from psycopg_pool import AsyncConnectionPool, ConnectionPool
+    from redis import Redis
+    from redis.asyncio import Redis as AsyncRedis
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +47,14 @@ class MonotonicClock(AbstractClock):
         return self._get_monotonic_ms()
 
 
+class WallClock(AbstractClock):
+    """Wall-clock (epoch) time, for timestamps shared between hosts"""
+
+    def now(self) -> int:
+        """Get epoch time in milliseconds"""
+        return self._get_wall_ms()
+
+
 class MonotonicAsyncClock(AbstractClock):
     """Monotonic Async Clock, meant for testing only"""
 
@@ -50,6 +63,11 @@ class MonotonicAsyncClock(AbstractClock):
         return self._get_monotonic_ms()
 
 
+# used `clock_timestamp` instead of `current_timestamp`,
+# because we want the actual current time
+POSTGRES_NOW = "SELECT (extract(epoch FROM clock_timestamp()) * 1000)::bigint"
+
+
 class PostgresClock(AbstractClock):
     """Get timestamp using Postgres as remote clock backend"""
 
@@ -61,9 +79,7 @@ class PostgresClock(AbstractClock):
 
         Falls back to local time if the DB query fails for any reason.
         """
-        # used `clock_timestamp` instead of `current_timestamp`,
-        # because we want the actual current time
-        query = "SELECT (extract(epoch FROM clock_timestamp()) * 1000)::bigint"
+        query = POSTGRES_NOW
 
         try:
             with (
@@ -89,3 +105,289 @@ class PostgresClock(AbstractClock):
         # ~5 orders of magnitude smaller, so mixing it with epoch timestamps in
         # the same bucket would corrupt every window comparison and leak bound.
         return self._get_wall_ms()
+
+
+class AsyncPostgresClock(AbstractClock):
+    """``PostgresClock`` on a psycopg ``AsyncConnectionPool``"""
+
+    def __init__(self, pool: "AsyncConnectionPool"):
+        self.pool = pool
+
+    async def now(self) -> int:
+        """Get current time in milliseconds using Postgres.
+
+        Falls back to local wall-clock time if the DB query fails, as
+        ``PostgresClock`` does.
+        """
+        try:
+            async with self.pool.connection() as connection, connection.cursor() as cursor:
+                await cursor.execute(POSTGRES_NOW)
+                row = await cursor.fetchone()
+                if row is None:
+                    msg = "Postgres time query returned no rows"
+                    raise RuntimeError(msg)
+                return row[0]
+        except Exception:
+            logger.exception("Postgres time query failed, falling back to local clock")
+
+        return self._get_wall_ms()
+
+
+class RedisClock(AbstractClock):
+    """Get timestamp from Redis ``TIME``, sync or async like the client.
+
+    Every ``now()`` is a round trip; wrap it in ``CachedClock`` (or
+    ``AsyncCachedClock`` for an async client) to read it only on resyncs.
+    """
+
+    def __init__(self, redis: Union["Redis", "AsyncRedis"]):
+        self.redis = redis
+
+    @staticmethod
+    def _to_ms(time: Tuple[int, int]) -> int:
+        seconds, microseconds = time
+        return int(seconds) * 1000 + int(microseconds) // 1000
+
+    def now(self) -> Union[int, Awaitable[int]]:
+        """Get current time in milliseconds using Redis."""
+        time = self.redis.time()
+
+        if isawaitable(time):
+
+            async def _async_now() -> int:
+                return self._to_ms(await time)
+
+            return _async_now()
+
+        return self._to_ms(time)  # type: ignore[arg-type]
+
+
+class CachedClock(AbstractClock):
+    """Serve a remote clock's time from the local monotonic clock.
+
+    ``sync()`` reads the wrapped clock ``samples`` times, NTP-style: each read
+    is bracketed by local monotonic reads, the one with the shortest round
+    trip wins, and the remote time is taken to be its midpoint. ``now()`` then
+    extrapolates from that anchor along the monotonic clock, corrected by the
+    drift between the two clocks measured since the first sync, with no I/O.
+
+    The anchor's error is half the round trip plus the remote clock's 1 ms
+    resolution, and grows by ``max_drift_ppm`` of the time since it was taken.
+    A daemon thread resyncs every ``resync_interval`` ms, or sooner if the
+    error would otherwise reach ``max_error_ms``. While it exceeds that,
+    ``now()`` reads the wrapped clock directly, as if uncached; a warning is
+    logged when the round trip alone already takes the bound past it.
+
+    Time served never goes backwards, even when a resync moves the estimate.
+    """
+
+    name = "PyrateLimiter's CachedClock"
+
+    def __init__(
+        self,
+        clock: AbstractClock,
+        max_error_ms: float = 50,
+        resync_interval: int = 10_000,
+        samples: int = 3,
+        max_drift_ppm: float = 100,
+    ):
+        if max_error_ms <= 0 or resync_interval <= 0 or samples < 1 or max_drift_ppm < 0:
+            msg = "max_error_ms and resync_interval must be positive, samples >= 1 and max_drift_ppm >= 0"
+            raise ValueError(msg)
+
+        self.clock = clock
+        self.max_error_ms = max_error_ms
+        self.resync_interval = resync_interval
+        self.samples = samples
+        self.max_drift_ppm = max_drift_ppm
+
+        # (local monotonic ns, remote ms, error ms) at the last sync, replaced
+        # as a whole so readers never see a torn update.
+        self._anchor: Optional[Tuple[int, float, float]] = None
+        # Anchor drift is measured against; reset when the remote clock steps.
+        self._reference: Optional[Tuple[int, float, float]] = None
+        self.drift = 0.0
+        self._last = 0
+        self._closed = False
+        self._wake = Event()
+        self._thread: Optional[Thread] = None
+
+    def error_ms(self) -> float:
+        """Current error bound of the estimate; infinite before the first sync."""
+        return self._error(self._anchor, monotonic_ns())
+
+    def _error(self, anchor: Optional[Tuple[int, float, float]], mono_ns: int) -> float:
+        if anchor is None:
+            return float("inf")
+        elapsed_ms = (mono_ns - anchor[0]) / 1_000_000
+        return anchor[2] + elapsed_ms * self.max_drift_ppm / 1_000_000
+
+    def _estimate(self, anchor: Tuple[int, float, float], mono_ns: int) -> int:
+        elapsed_ms = (mono_ns - anchor[0]) / 1_000_000
+        return int(anchor[1] + elapsed_ms * (1 + self.drift))
+
+    def _serve(self, now: int) -> int:
+        """``now``, but never behind a time already served."""
+        # Benign race between threads: at worst one reading repeats.
+        self._last = now = max(now, self._last)
+        return now
+
+    def _best_sample(self, samples: List[Tuple[int, int, int]]) -> None:
+        """Anchor on the sample ``(start ns, remote ms, end ns)`` with the
+        shortest round trip, and update ``drift`` against the reference."""
+        start, remote, end = min(samples, key=lambda sample: sample[2] - sample[0])
+        anchor = (start + end) // 2, float(remote), (end - start) / 2_000_000 + 1
+        reference = self._reference
+
+        if reference is None:
+            self._reference = anchor
+        else:
+            elapsed_ms = (anchor[0] - reference[0]) / 1_000_000
+            drift = (anchor[1] - reference[1]) / elapsed_ms - 1 if elapsed_ms > 0 else 0.0
+            if abs(drift) >= 0.01:
+                # Nothing drifts by 1%: the remote clock was stepped.
+                self._reference = anchor
+                self.drift = 0.0
+            elif (anchor[2] + reference[2]) / elapsed_ms <= self.max_drift_ppm / 1_000_000:
+                # Trusted once the span dwarfs both anchors' errors.
+                self.drift = drift
+
+        if anchor[2] >= self.max_error_ms and self._syncable(self._anchor):
+            logger.warning(
+                "CachedClock round trip of %.1f ms leaves no room under max_error_ms=%s; now() reads the wrapped clock directly until it shortens",
+                (end - start) / 1_000_000,
+                self.max_error_ms,
+            )
+
+        self._anchor = anchor
+
+    def sync(self) -> None:
+        """Sample the wrapped clock and re-anchor the estimate."""
+        samples = []
+        for _ in range(self.samples):
+            start = monotonic_ns()
+            remote = self.clock.now()
+            assert isinstance(remote, int)
+            samples.append((start, remote, monotonic_ns()))
+
+        self._best_sample(samples)
+
+    def _syncable(self, anchor: Optional[Tuple[int, float, float]]) -> bool:
+        """Whether a resync could bring the error back within bounds: not if
+        the last one already missed it, e.g. because the round trip is long."""
+        return anchor is None or anchor[2] <= self.max_error_ms
+
+    def _resync_delay(self) -> float:
+        """Seconds until the next background resync is due."""
+        anchor = self._anchor
+        delay = self.resync_interval / 1000
+
+        if anchor is not None and self.max_drift_ppm > 0:
+            headroom_ms = self.max_error_ms - self._error(anchor, monotonic_ns())
+            # With none left even a fresh sync missed the bound: no point
+            # retrying before the regular interval.
+            if headroom_ms > 0:
+                delay = min(delay, headroom_ms / self.max_drift_ppm * 1000)
+
+        return delay
+
+    def _run(self) -> None:
+        """Worker-thread target; not meant to be called directly."""
+        while not self._closed:
+            self._wake.wait(self._resync_delay())
+            self._wake.clear()
+            if self._closed:
+                return
+            try:
+                self.sync()
+            except Exception as e:
+                logger.debug("CachedClock resync failed, %s", e)
+
+    def now(self) -> int:
+        if self._anchor is None:
+            self.sync()
+
+        if self._thread is None or not self._thread.is_alive():
+            self._closed = False
+            self._thread = Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+        anchor = self._anchor
+        mono = monotonic_ns()
+
+        if self._error(anchor, mono) > self.max_error_ms:
+            if self._syncable(anchor):
+                self._wake.set()
+            now = self.clock.now()
+            assert isinstance(now, int)
+            return self._serve(now)
+
+        assert anchor is not None
+        return self._serve(self._estimate(anchor, mono))
+
+    def close(self) -> None:
+        """Stop background resyncs; a later ``now()`` restarts them."""
+        self._closed = True
+        self._wake.set()
+
+
+class AsyncCachedClock(CachedClock):
+    """``CachedClock`` over an async clock such as ``AsyncPostgresClock``,
+    resyncing from an asyncio task instead of a thread."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._task: Optional[asyncio.Task] = None
+        self._aio_wake: Optional[asyncio.Event] = None
+
+    async def sync(self) -> None:  # type: ignore[override]
+        """Sample the wrapped clock and re-anchor the estimate."""
+        samples = []
+        for _ in range(self.samples):
+            start = monotonic_ns()
+            remote = await self.clock.now()  # type: ignore[misc]
+            samples.append((start, remote, monotonic_ns()))
+
+        self._best_sample(samples)
+
+    async def _run_async(self, wake: asyncio.Event) -> None:
+        while not self._closed:
+            try:
+                await asyncio.wait_for(wake.wait(), self._resync_delay())
+            except asyncio.TimeoutError:
+                pass
+            wake.clear()
+            if self._closed:
+                return
+            try:
+                await self.sync()
+            except Exception as e:
+                logger.debug("AsyncCachedClock resync failed, %s", e)
+
+    async def now(self) -> int:  # type: ignore[override]
+        if self._anchor is None:
+            await self.sync()
+
+        if self._task is None or self._task.done():
+            self._closed = False
+            self._aio_wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run_async(self._aio_wake))
+
+        anchor = self._anchor
+        mono = monotonic_ns()
+
+        if self._error(anchor, mono) > self.max_error_ms:
+            if self._syncable(anchor):
+                assert self._aio_wake is not None
+                self._aio_wake.set()
+            return self._serve(await self.clock.now())  # type: ignore[misc]
+
+        assert anchor is not None
+        return self._serve(self._estimate(anchor, mono))
+
+    def close(self) -> None:
+        """Stop background resyncs; a later ``now()`` restarts them."""
+        self._closed = True
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
@@ -8,6 +8,7 @@ from inspect import isawaitable, iscoroutine, iscoroutinefunction
 from threading import RLock, local
 from time import monotonic, sleep
 from typing import Any, Awaitable, Callable, Iterable, List, Optional, Protocol, Tuple, Union
+from weakref import WeakValueDictionary
 
 from .abstracts import AbstractBucket, BucketFactory, Rate, RateItem
 from .buckets import InMemoryBucket
@@ -120,31 +121,88 @@ class Limiter:
     bucket_factory: BucketFactory
     lock: Union[RLock, Iterable]
     buffer_ms: int
+    lock_stripes: int
 
-    # async_lock is thread local, created on first use
+    # async locks are thread local, per event loop and per item name, created on first use
     _thread_local: local
 
     def __init__(
         self,
         argument: Union[BucketFactory, AbstractBucket, Rate, List[Rate]],
         buffer_ms: int = 50,
+        lock_stripes: int = 1,
     ):
         """Init Limiter using either a single bucket / multiple-bucket factory
         / single rate / rate list.
 
         Parameters:
             argument (Union[BucketFactory, AbstractBucket, Rate, List[Rate]]): The bucket or rate configuration.
+            lock_stripes (int): Number of thread locks that item names are hashed onto. The default of 1
+                serializes every acquisition behind a single lock; with a multi-key ``BucketFactory``, raise it
+                so unrelated keys can acquire concurrently across threads.
         """
+        if lock_stripes < 1:
+            raise ValueError("lock_stripes must be >= 1")
 
         self.buffer_ms = buffer_ms
+        self.lock_stripes = lock_stripes
         self.bucket_factory = self._init_bucket_factory(argument)
-        self.lock = RLock()
         self._thread_local = local()
 
-        if isinstance(argument, AbstractBucket):
-            limiter_lock = argument.limiter_lock()
-            if limiter_lock is not None:
-                self.lock = (limiter_lock, self.lock)
+        limiter_lock = argument.limiter_lock() if isinstance(argument, AbstractBucket) else None
+        self._init_locks(limiter_lock)
+
+    def _init_locks(self, limiter_lock: Optional[object]) -> None:
+        """Create one RLock per stripe, each preceded by the bucket's
+        ``limiter_lock`` (e.g. a multiprocessing lock) when it provides one.
+
+        ``self.lock`` stays the first stripe, so with ``lock_stripes=1`` it is
+        the single limiter-wide lock it always was.
+        """
+        stripes: List[Union[RLock, Iterable]] = [RLock() for _ in range(self.lock_stripes)]
+
+        if limiter_lock is not None:
+            stripes = [(limiter_lock, lock) for lock in stripes]
+
+        self._lock_stripes = stripes
+        self.lock = stripes[0]
+
+    def _lock_for(self, name: str) -> Union[RLock, Iterable]:
+        """Lock guarding acquisitions of ``name``.
+
+        Names are hashed onto the stripes, so the same name always maps to the
+        same lock while unrelated names usually do not. Buckets still guard
+        their own storage (``InMemoryBucket._lock``, the Redis Lua script, the
+        Postgres table lock...), so two names that share a bucket but not a
+        stripe remain safe; they just no longer serialize on the limiter. The
+        only shared state they may race on is the bucket's ``failing_rate``,
+        which feeds the *estimate* of a blocking wait - the retry loop
+        re-checks on wake, so a stale estimate costs one extra retry at most.
+        """
+        if self.lock_stripes == 1:
+            return self.lock
+
+        return self._lock_stripes[hash(name) % self.lock_stripes]
+
+    def _locks_for(self, names: Iterable[str]) -> List[LockLike]:
+        """Every lock guarding any of ``names``, each once, in stripe order.
+
+        A fixed order means two batches over overlapping names cannot
+        deadlock; the bucket's ``limiter_lock`` shared by all stripes is only
+        taken once.
+        """
+        indices = sorted({hash(name) % self.lock_stripes for name in names})
+        locks: List[LockLike] = []
+        seen = set()
+
+        for index in indices:
+            stripe = self._lock_stripes[index]
+            for lock in stripe if isinstance(stripe, tuple) else (stripe,):
+                if id(lock) not in seen:
+                    seen.add(id(lock))
+                    locks.append(lock)
+
+        return locks
 
     def buckets(self) -> List[AbstractBucket]:
         """Get list of active buckets"""
@@ -335,7 +393,7 @@ class Limiter:
             item.timestamp += sleep_ms
             remaining: Union[int, float] = -1 if deadline is None else max(0.0, deadline - monotonic())
 
-            with combined_lock(self.lock, blocking=True, timeout=remaining):
+            with combined_lock(self._lock_for(item.name), blocking=True, timeout=remaining):
                 re_acquire = bucket.put(item)
 
                 if isawaitable(re_acquire):
@@ -353,19 +411,31 @@ class Limiter:
                 assert isinstance(next_wait, int)
                 wait_ms = next_wait
 
-    def _get_async_lock(self):
-        """Returns thread_local, loop-specific lock"""
+    def _get_async_lock(self, name: str) -> asyncio.Lock:
+        """Returns the thread-local, loop-specific lock for ``name``.
+
+        Coroutines acquiring the same name take turns, so a put and the wait
+        computed from it are not interleaved with another put on that key.
+        Different names never share a lock: their round trips to a networked
+        bucket (whose script or table lock makes each put atomic on its own)
+        overlap instead of queueing behind one another. Locks are held weakly
+        and go away with the last coroutine using them.
+        """
         loop = asyncio.get_running_loop()
         try:
             # The async loop *can* change in a given thread
-            lock = self._thread_local.async_lock
-            if self._thread_local.async_lock_loop is loop:
-                return lock
+            locks = self._thread_local.async_locks
+            if self._thread_local.async_lock_loop is not loop:
+                raise AttributeError
         except AttributeError:
-            pass
-        lock = asyncio.Lock()
-        self._thread_local.async_lock = lock
-        self._thread_local.async_lock_loop = loop
+            locks = WeakValueDictionary()
+            self._thread_local.async_locks = locks
+            self._thread_local.async_lock_loop = loop
+
+        lock = locks.get(name)
+        if lock is None:
+            lock = asyncio.Lock()
+            locks[name] = lock
         return lock
 
     def try_acquire(self, name: str = "pyrate", weight: int = 1, blocking: bool = True, timeout: int | float = -1) -> Union[bool, Awaitable[bool]]:
@@ -440,8 +510,9 @@ class Limiter:
 
         Notes
         -----
-        This is the async variant of ``try_acquire``. A top-level, thread-local
-        async lock is used to prevent blocking the event loop.
+        This is the async variant of ``try_acquire``. Concurrent calls for the
+        same name take turns on a per-name async lock (thread-local, per event
+        loop); calls for different names proceed concurrently.
         """
 
         if weight == 0:
@@ -454,7 +525,7 @@ class Limiter:
             raise RuntimeError("Can't set timeout with non-blocking")
 
         async def run():
-            lock = self._get_async_lock()
+            lock = self._get_async_lock(name)
             async with lock:
                 # Pass timeout through so the internal deadline governs the wait
                 # (mirrors sync try_acquire). This makes timeout=0 a non-waiting
@@ -470,6 +541,57 @@ class Limiter:
         except (asyncio.TimeoutError, TimeoutError):
             return False
 
+    def try_acquire_many(self, items: Iterable[Tuple[str, int]], blocking: bool = True, timeout: int | float = -1) -> Union[bool, Awaitable[bool]]:
+        """
+        Acquire permits for several names at once, all or nothing.
+
+        Parameters
+        ----------
+        items : Iterable[Tuple[str, int]]
+            ``(name, weight)`` pairs, e.g. per-user, per-org and global keys.
+        blocking : bool, default True
+            If True, wait until every permit is available (subject to timeout);
+            if False, return immediately.
+        timeout : int | float, default -1
+            Maximum time (in seconds) to wait; -1 means wait indefinitely.
+
+        Returns
+        -------
+        bool or Awaitable[bool]
+            True if every permit was acquired; False if none was. Async
+            limiters return an awaitable resolving to the same.
+
+        Notes
+        -----
+        The buckets the names route to must be able to commit together (see
+        ``AbstractBucket.put_many``): in-memory buckets, SQLite buckets sharing
+        a connection, Redis buckets sharing a client or Postgres buckets
+        sharing a pool. Other combinations raise ``NotImplementedError``.
+        """
+        if timeout < 0 and timeout != -1:
+            raise ValueError("timeout must be -1 or >= 0")
+
+        if not blocking and timeout != -1:
+            raise RuntimeError("Can't set timeout with non-blocking")
+
+        try:
+            result = self._try_acquire_many(list(items), blocking=blocking, timeout=timeout)
+        except TimeoutError:
+            logger.debug("Acquisition TimeoutError")
+            return False
+
+        if not isawaitable(result):
+            return result
+
+        async def _resolve_result(async_result: Awaitable[bool]) -> bool:
+            try:
+                return await self._handle_async_result(async_result)
+            except TimeoutError:
+                logger.debug("Acquisition TimeoutError")
+                return False
+
+        return _resolve_result(result)
+
     async def _acquire_co(
         self,
         item,
@@ -567,7 +689,7 @@ class Limiter:
 
         deadline: Optional[float] = monotonic() + timeout if timeout != -1 else None
 
-        with combined_lock(self.lock, blocking=blocking, timeout=timeout):
+        with combined_lock(self._lock_for(name), blocking=blocking, timeout=timeout):
             assert weight >= 0, "item's weight must be >= 0"
 
             if weight == 0:
@@ -639,6 +761,134 @@ class Limiter:
 
         return self._blocking_retry_sync(bucket, item, wait_ms, blocking=blocking, deadline=deadline)
 
+    def _try_acquire_many(self, items: List[Tuple[str, int]], blocking: bool, timeout: int | float = -1) -> Union[bool, Awaitable[bool]]:
+        """Batch counterpart of ``_try_acquire``: wrap and route every item,
+        then hand them to the first bucket's ``put_many`` under the locks of
+        every name involved."""
+        assert all(weight >= 0 for _, weight in items), "item's weight must be >= 0"
+        # NOTE: weightless items go through, as in _try_acquire
+        items = [(name, weight) for name, weight in items if weight > 0]
+
+        if not items:
+            return True
+
+        deadline: Optional[float] = monotonic() + timeout if timeout != -1 else None
+        locks = self._locks_for(name for name, _ in items)
+
+        with combined_lock(locks, blocking=blocking, timeout=timeout):
+            wrapped: List[Any] = [self.bucket_factory.wrap_item(name, weight) for name, weight in items]
+
+            if any(isawaitable(item) for item in wrapped):
+                return self._acquire_many_co(wrapped, blocking=blocking, deadline=deadline)
+
+            buckets: List[Any] = [self.bucket_factory.get(item) for item in wrapped]
+
+            if any(isawaitable(bucket) for bucket in buckets):
+                return self._acquire_many_co(wrapped, buckets, blocking=blocking, deadline=deadline)
+
+            batch = list(zip(buckets, wrapped, strict=True))
+            failed = batch[0][0].put_many(batch)
+
+            if isawaitable(failed):
+                return self._acquire_many_co(wrapped, buckets, failed, blocking=blocking, deadline=deadline)
+
+            if failed < 0:
+                return True
+
+            if not blocking:
+                return False
+
+            # Capture the wait under the locks, then sleep without them (#301).
+            bucket, item = batch[failed]
+            wait_ms = bucket.waiting(item)
+            if isawaitable(wait_ms):
+                return self._acquire_many_co(wrapped, buckets, failed, wait_ms, blocking=blocking, deadline=deadline)
+            assert isinstance(wait_ms, int)
+
+        return self._blocking_retry_many_sync(batch, locks, wait_ms, deadline=deadline)
+
+    def _blocking_retry_many_sync(
+        self, batch: List[Tuple[AbstractBucket, RateItem]], locks: List[LockLike], wait_ms: int, deadline: Optional[float] = None
+    ) -> bool:
+        """``_blocking_retry_sync`` for a batch: sleep unlocked, then re-put the
+        whole batch under the same locks."""
+        while True:
+            sleep_ms = self._delay_to_sleep_ms(wait_ms)
+            if sleep_ms is None:
+                return False
+
+            secs, timed_out = _plan_delay_step(deadline, sleep_ms)
+            sleep(secs)  # locks intentionally NOT held during the sleep
+            if timed_out:
+                raise TimeoutError()
+
+            for _, item in batch:
+                item.timestamp += sleep_ms
+
+            remaining: Union[int, float] = -1 if deadline is None else max(0.0, deadline - monotonic())
+
+            with combined_lock(locks, blocking=True, timeout=remaining):
+                failed = batch[0][0].put_many(batch)
+                assert isinstance(failed, int)
+
+                if failed < 0:
+                    return True
+
+                bucket, item = batch[failed]
+                next_wait = bucket.waiting(item)
+                assert isinstance(next_wait, int)
+                wait_ms = next_wait
+
+    async def _acquire_many_co(
+        self,
+        items: List[Any],
+        buckets: Any = _UNSET,
+        failed: Any = _UNSET,
+        wait: Any = _UNSET,
+        *,
+        blocking: bool,
+        deadline: Optional[float] = None,
+    ) -> bool:
+        """Async tail of ``_try_acquire_many``, entered at whichever stage
+        first returned an awaitable; earlier stages arrive already resolved."""
+        resolved = [await self._handle_async_result(item, deadline=deadline) for item in items]
+
+        if buckets is _UNSET:
+            buckets = [self.bucket_factory.get(item) for item in resolved]
+        buckets = [await self._handle_async_result(bucket, deadline=deadline) for bucket in buckets]
+
+        batch = list(zip(buckets, resolved, strict=True))
+
+        while True:
+            if failed is _UNSET:
+                failed = batch[0][0].put_many(batch)
+            failed = await self._handle_async_result(failed, deadline=deadline)
+
+            if failed < 0:
+                return True
+
+            if not blocking:
+                return False
+
+            bucket, item = batch[failed]
+            if wait is _UNSET:
+                wait = bucket.waiting(item)
+            wait = await self._handle_async_result(wait, deadline=deadline)
+
+            sleep_ms = self._delay_to_sleep_ms(wait)
+            if sleep_ms is None:
+                return False
+
+            secs, timed_out = _plan_delay_step(deadline, sleep_ms)
+            await asyncio.sleep(secs)
+            if timed_out:
+                raise TimeoutError()
+
+            for _, pending in batch:
+                pending.timestamp += sleep_ms
+
+            failed = wait = _UNSET
+
     def as_decorator(self, *, name="ratelimiter", weight=1):
         def deco(func: Callable[..., Any]) -> Callable[..., Any]:
             if iscoroutinefunction(func):
@@ -683,11 +933,13 @@ class Limiter:
         """Get state for pickling"""
         state = self.__dict__.copy()
         state.pop("lock", None)
+        state.pop("_lock_stripes", None)
         state.pop("_thread_local", None)
         return state
 
     def __setstate__(self, state):
         """Restore state after unpickling"""
         self.__dict__.update(state)
-        self.lock = RLock()
+        self.lock_stripes = state.get("lock_stripes", 1)
+        self._init_locks(None)
         self._thread_local = local()
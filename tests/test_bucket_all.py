@@ -193,6 +193,32 @@ async def test_bucket_waiting(create_bucket):
     assert await bucket.put(await create_item(3)) is True
 
 
+@pytest.mark.asyncio
+async def test_bucket_waiting_from_put_matches_peek(create_bucket):
+    """A rejected put's own retry-after (Decision.retry_after) must agree with
+    the peek-based waiting() it saves a round trip for."""
+    bucket = await create_bucket([Rate(3, 1000)])
+    wrapped = BucketAsyncWrapper(bucket)
+    now = wrapped.now()
+
+    if isawaitable(now):
+        now = await now
+
+    for offset in (300, 200, 100):
+        assert await wrapped.put(RateItem("item", now - offset)) is True
+
+    for weight, expected in ((1, 701), (2, 801)):
+        item = RateItem("item", now, weight)
+        assert await wrapped.put(item) is False
+        from_put = await wrapped.waiting(item)
+
+        bucket._retry = None
+        from_peek = await wrapped.waiting(item)
+
+        assert from_put == from_peek
+        assert abs(from_put - expected) <= 1
+
+
 @pytest.mark.asyncio
 async def test_bucket_leak(create_bucket):
     rates = [Rate(100, 3000)]
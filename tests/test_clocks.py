@@ -210,3 +210,168 @@ def test_postgres_clock_no_rows_falls_back(monkeypatch):
 
     got = clock.now()
     assert got == expected_ms
+
+
+class FakeRemoteClock(clocks.AbstractClock):
+    """Remote clock running ``drift`` faster than the patched monotonic clock,
+    whose reads each take ``rtt_ms`` of it."""
+
+    def __init__(self, local, offset_ms=1_700_000_000_000, drift=0.0, rtt_ms=0.2):
+        self.local = local
+        self.offset_ms = offset_ms
+        self.drift = drift
+        self.rtt_ms = rtt_ms
+        self.calls = 0
+
+    def time(self):
+        return int(self.offset_ms + self.local.ms * (1 + self.drift))
+
+    def now(self):
+        self.calls += 1
+        self.local.ns += int(self.rtt_ms * 500_000)
+        now = self.time()
+        self.local.ns += int(self.rtt_ms * 500_000)
+        return now
+
+
+class FakeMonotonic:
+    def __init__(self):
+        self.ns = 10**12
+
+    @property
+    def ms(self):
+        return self.ns / 1_000_000
+
+    def __call__(self):
+        return self.ns
+
+
+@pytest.fixture
+def local(monkeypatch):
+    fake = FakeMonotonic()
+    monkeypatch.setattr(clocks, "monotonic_ns", fake)
+    return fake
+
+
+def test_cached_clock_serves_remote_time_without_reads(local):
+    remote = FakeRemoteClock(local)
+    clock = clocks.CachedClock(remote, max_error_ms=5)
+
+    try:
+        assert abs(clock.now() - remote.time()) <= 1
+        calls = remote.calls
+        assert calls == clock.samples
+
+        for _ in range(100):
+            local.ns += 7_000_000
+            assert abs(clock.now() - remote.time()) <= clock.error_ms() <= 5
+
+        assert remote.calls == calls
+    finally:
+        clock.close()
+
+
+def test_cached_clock_estimates_drift(local):
+    remote = FakeRemoteClock(local, drift=50e-6)
+    clock = clocks.CachedClock(remote, max_error_ms=5, max_drift_ppm=100)
+
+    clock.sync()
+    local.ns += 300 * 10**9
+    clock.sync()
+    assert clock.drift == pytest.approx(50e-6, abs=10e-6)
+
+    # Ten minutes on, uncorrected drift alone would be 30 ms off.
+    local.ns += 600 * 10**9
+    anchor = clock._anchor
+    assert abs(clock._estimate(anchor, local.ns) - remote.time()) <= 5
+
+    # A stepped remote clock restarts drift estimation.
+    remote.offset_ms -= 60_000
+    local.ns += 60 * 10**9
+    clock.sync()
+    assert clock.drift == 0.0
+
+
+def test_cached_clock_reads_through_when_too_stale(local):
+    remote = FakeRemoteClock(local)
+    clock = clocks.CachedClock(remote, max_error_ms=5, max_drift_ppm=1_000)
+
+    try:
+        first = clock.now()
+        calls = remote.calls
+
+        # 10 s at 1000 ppm is 10 ms of possible error: read the remote.
+        local.ns += 10 * 10**9
+        assert clock.error_ms() > 5
+        assert clock.now() == remote.time()
+        assert remote.calls == calls + 1
+
+        # Never behind a time already served.
+        remote.offset_ms -= 1_000
+        assert clock.now() >= first + 10_000
+    finally:
+        clock.close()
+
+
+def test_cached_clock_warns_when_round_trip_exceeds_bound(local, caplog):
+    # A cross-AZ round trip: the default bound still leaves room for it.
+    remote = FakeRemoteClock(local, rtt_ms=20)
+    clock = clocks.CachedClock(remote)
+    clock.sync()
+    assert clock.error_ms() < clock.max_error_ms
+    assert not caplog.records
+
+    clock = clocks.CachedClock(remote, max_error_ms=5)
+    with caplog.at_level("WARNING", logger="pyrate_limiter.clocks"):
+        clock.sync()
+        clock.sync()
+
+    assert [record.levelname for record in caplog.records] == ["WARNING"]
+    assert "max_error_ms=5" in caplog.text
+
+    # Too slow to cache: every now() reads the remote.
+    calls = remote.calls
+    clock.now()
+    assert remote.calls == calls + 1
+    clock.close()
+
+
+def test_cached_clock_rejects_invalid_options():
+    with pytest.raises(ValueError):
+        clocks.CachedClock(clocks.MonotonicClock(), max_error_ms=0)
+    with pytest.raises(ValueError):
+        clocks.CachedClock(clocks.MonotonicClock(), samples=0)
+
+
+@pytest.mark.asyncio
+async def test_async_cached_clock(local):
+    remote = FakeRemoteClock(local)
+
+    class AsyncRemote(clocks.AbstractClock):
+        async def now(self):
+            return remote.now()
+
+    clock = clocks.AsyncCachedClock(AsyncRemote(), max_error_ms=5)
+
+    try:
+        assert abs(await clock.now() - remote.time()) <= 1
+        calls = remote.calls
+        local.ns += 1_000_000_000
+        assert abs(await clock.now() - remote.time()) <= 5
+        assert remote.calls == calls
+    finally:
+        clock.close()
+
+
+@pytest.mark.postgres
+def test_cached_clock_tracks_postgres(postgres_pool):
+    direct = clocks.PostgresClock(pool=postgres_pool)
+    clock = clocks.CachedClock(direct, max_error_ms=20)
+
+    try:
+        before = direct.now()
+        cached = clock.now()
+        after = direct.now()
+        assert before - 20 <= cached <= after + 20
+    finally:
+        clock.close()
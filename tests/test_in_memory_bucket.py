@@ -0,0 +1,152 @@
+"""Focused unit tests for the in-memory buckets."""
+import pytest
+
+from pyrate_limiter import ArrayBucket, InMemoryBucket, Limiter, Rate, RateItem, RingBufferBucket
+
+
+def test_weighted_put_stores_one_entry():
+    bucket = InMemoryBucket([Rate(20_000, 1000)])
+
+    assert bucket.put(RateItem("big", 100, weight=10_000)) is True
+    assert bucket.put(RateItem("small", 200, weight=1)) is True
+
+    assert len(bucket.items) == 2
+    assert bucket.count() == 10_001
+
+    # A third put that would overflow the limit by one unit is rejected.
+    assert bucket.put(RateItem("big", 300, weight=10_000)) is False
+    assert bucket.put(RateItem("fits", 300, weight=9_999)) is True
+    assert bucket.count() == 20_000
+
+
+def test_peek_addresses_units_not_entries():
+    bucket = InMemoryBucket([Rate(10, 1000)])
+    bucket.put(RateItem("a", 100, weight=3))
+    bucket.put(RateItem("b", 200, weight=2))
+
+    # Latest-to-earliest, as if every unit were stored: b, b, a, a, a
+    assert [bucket.peek(i).name for i in range(5)] == ["b", "b", "a", "a", "a"]
+    assert bucket.peek(5) is None
+    assert bucket.peek(-1).name == "a"
+
+
+def test_window_counts_weights_after_leak():
+    bucket = InMemoryBucket([Rate(5, 1000)])
+    assert bucket.put(RateItem("a", 0, weight=4)) is True
+    assert bucket.put(RateItem("b", 500, weight=1)) is True
+    assert bucket.put(RateItem("c", 900, weight=1)) is False
+    assert bucket.failing_rate is bucket.rates[0]
+
+    # Leak returns units of weight, not entries.
+    assert bucket.leak(1001) == 4
+    assert bucket.count() == 1
+    assert len(bucket.items) == 1
+
+    assert bucket.put(RateItem("c", 1001, weight=4)) is True
+    assert bucket.put(RateItem("d", 1001, weight=1)) is False
+    assert bucket.waiting(RateItem("d", 1001, weight=1)) == 500
+
+    bucket.flush()
+    assert bucket.count() == 0
+    assert bucket.peek(0) is None
+
+
+def test_array_bucket_unit_weights_skip_prefix_array():
+    bucket = ArrayBucket([Rate(3, 1000)])
+    for ts in (0, 10, 20):
+        assert bucket.put(RateItem("x", ts)) is True
+    assert bucket.put(RateItem("x", 30)) is False
+    assert bucket._cumulative is None
+    assert bucket._timestamps.itemsize == 8
+
+    # Names are dropped by default; timestamps and weights survive.
+    item = bucket.peek(0)
+    assert (item.name, item.timestamp, item.weight) == ("", 20, 1)
+    assert bucket.waiting(RateItem("x", 30)) == 971
+
+
+def test_array_bucket_weighted_and_compaction():
+    bucket = ArrayBucket([Rate(5000, 1000)], keep_names=True)
+    assert bucket.put(RateItem("w", 0, weight=3)) is True
+    assert bucket._cumulative is not None
+    assert [bucket.peek(i).name for i in range(3)] == ["w"] * 3
+
+    for ts in range(1, 3000):
+        assert bucket.put(RateItem(f"i{ts}", ts)) is True
+
+    assert bucket.count() == 3002
+    # Leak everything older than ts=2000: the 3-unit item plus 1999 singles.
+    assert bucket.leak(3000) == 2002
+    assert bucket.count() == 1000
+    # The leaked prefix was more than half the arrays -> compacted.
+    assert bucket._head == 0
+    assert len(bucket._timestamps) == 1000
+    assert bucket.peek(0).name == "i2999"
+    assert bucket.peek(999).name == "i2000"
+    assert bucket.peek(1000) is None
+
+
+def test_ring_buffer_admission_checks_one_slot_per_rate():
+    bucket = RingBufferBucket([Rate(3, 100), Rate(5, 1000)])
+    assert bucket.capacity == 5
+    assert len(bucket._buf) == 2 + 5
+
+    assert bucket.put(RateItem("x", 0, weight=2)) is True
+    assert bucket.put(RateItem("x", 10)) is True
+    assert bucket.put(RateItem("x", 20)) is False
+    assert bucket.failing_rate is bucket.rates[0]
+    assert bucket.waiting(RateItem("x", 20)) == 81
+
+    assert bucket.put(RateItem("x", 101, weight=2)) is True
+    assert bucket.put(RateItem("x", 150)) is False
+    assert bucket.failing_rate is bucket.rates[1]
+    assert bucket.put(RateItem("x", 101, weight=6)) is False
+
+    # Slots wrap around once the first units fall out of the widest window.
+    assert bucket.put(RateItem("x", 1001, weight=2)) is True
+    assert bucket.count() == 5
+    assert [bucket.peek(i).timestamp for i in range(5)] == [1001, 1001, 101, 101, 10]
+    assert bucket.peek(5) is None
+
+
+def test_ring_buffer_leak_moves_start_only():
+    bucket = RingBufferBucket([Rate(10, 1000)])
+    for ts in range(0, 500, 100):
+        assert bucket.put(RateItem("x", ts)) is True
+
+    assert bucket.leak(1250) == 3
+    assert bucket.count() == 2
+    assert bucket.leak(1250) == 0
+    assert bucket.peek(1).timestamp == 300
+
+    bucket.flush()
+    assert bucket.count() == 0
+    assert bucket.put(RateItem("x", 1300, weight=10)) is True
+
+
+def test_ring_buffer_does_not_start_leaker():
+    limiter = Limiter(RingBufferBucket([Rate(2, 1000)]))
+    leaker = limiter.bucket_factory._leaker
+    assert leaker is not None and len(leaker.sync_buckets) == 1
+    assert not leaker.is_alive()
+    assert limiter.buckets()
+    assert limiter.try_acquire("x", blocking=False) is True
+    limiter.close()
+
+
+@pytest.mark.parametrize("bucket_class", [InMemoryBucket, ArrayBucket, RingBufferBucket])
+def test_rejected_put_answers_waiting_without_peek(monkeypatch, bucket_class):
+    bucket = bucket_class([Rate(2, 1000)])
+    bucket.put(RateItem("a", 100))
+    bucket.put(RateItem("a", 200))
+
+    rejected = RateItem("a", 300)
+    assert bucket.put(rejected) is False
+    assert bucket._retry == (1, 1101)
+
+    def _no_peek(index):
+        raise AssertionError("waiting() should not peek")
+
+    monkeypatch.setattr(bucket, "peek", _no_peek)
+    # The earlier of the two items leaves the window at 100 + 1000.
+    assert bucket.waiting(rejected) == 801
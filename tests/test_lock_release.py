@@ -2,9 +2,13 @@
 sync blocking sleep, otherwise a long wait on one key serializes acquisitions
 for every other key sharing the limiter.
 """
+import asyncio
+import pickle
 import threading
 import time
 
+import pytest
+
 from pyrate_limiter import BucketFactory, InMemoryBucket, Limiter, Rate, RateItem
 from pyrate_limiter.clocks import MonotonicClock
 
@@ -56,3 +60,99 @@ def test_blocking_wait_on_one_key_does_not_serialize_other_keys():
 
     t.join(timeout=2)
     assert not t.is_alive()
+
+
+def _names_on_distinct_stripes(limiter):
+    """Two names that hash onto different lock stripes of ``limiter``."""
+    first = "A"
+    for i in range(1000):
+        other = f"B{i}"
+        if limiter._lock_for(other) is not limiter._lock_for(first):
+            return first, other
+    raise AssertionError("no names on distinct stripes")
+
+
+def test_lock_stripes_let_unrelated_keys_acquire_concurrently():
+    """With lock striping, holding the lock of one key's stripe must not block
+    an acquire on a key hashed onto another stripe."""
+    limiter = Limiter(_KeyedInMemoryFactory([Rate(5, 1000)]), lock_stripes=16)
+    a, b = _names_on_distinct_stripes(limiter)
+
+    assert limiter._lock_for(a) is limiter._lock_for(a)
+
+    with limiter._lock_for(a):
+        held = threading.Event()
+        result = {}
+
+        def acquire_b():
+            result["b"] = limiter.try_acquire(b, blocking=False)
+            held.set()
+
+        t = threading.Thread(target=acquire_b)
+        t.start()
+        assert held.wait(timeout=1)
+        t.join()
+
+    assert result["b"] is True
+
+
+def test_single_lock_stripe_serializes_every_key():
+    limiter = Limiter(_KeyedInMemoryFactory([Rate(5, 1000)]))
+    assert limiter._lock_for("A") is limiter._lock_for("B") is limiter.lock
+
+
+def test_lock_stripes_validation_and_pickle():
+    with pytest.raises(ValueError):
+        Limiter(Rate(5, 1000), lock_stripes=0)
+
+    limiter = Limiter(Rate(5, 1000), lock_stripes=4)
+    restored = pickle.loads(pickle.dumps(limiter))
+    assert restored.lock_stripes == 4
+    assert len(restored._lock_stripes) == 4
+    assert restored.try_acquire("x")
+
+
+class _SlowAsyncBucket(InMemoryBucket):
+    """InMemoryBucket whose put awaits ``latency`` seconds, like a network round trip."""
+
+    def __init__(self, rates, latency):
+        super().__init__(rates)
+        self.latency = latency
+
+    async def put(self, item):
+        await asyncio.sleep(self.latency)
+        return super().put(item)
+
+
+class _KeyedSlowFactory(_KeyedInMemoryFactory):
+    def get(self, item):
+        if item.name not in self._buckets:
+            self._buckets[item.name] = _SlowAsyncBucket(list(self._rates), 0.05)
+        return self._buckets[item.name]
+
+
+@pytest.mark.asyncio
+async def test_async_acquires_on_unrelated_keys_overlap():
+    limiter = Limiter(_KeyedSlowFactory([Rate(100, 1000)]))
+
+    t0 = time.perf_counter()
+    results = await asyncio.gather(*[limiter.try_acquire_async(f"key-{i}") for i in range(20)])
+    dt = time.perf_counter() - t0
+
+    assert all(results)
+    # 20 round trips of 50ms overlap; behind one loop-wide lock this took 1s.
+    assert dt < 0.5, f"20 keys took {dt:.3f}s - serialized on the async lock?"
+
+
+@pytest.mark.asyncio
+async def test_async_acquires_on_one_key_take_turns():
+    limiter = Limiter(_KeyedSlowFactory([Rate(100, 1000)]))
+
+    t0 = time.perf_counter()
+    results = await asyncio.gather(*[limiter.try_acquire_async("key") for _ in range(4)])
+    dt = time.perf_counter() - t0
+
+    assert all(results)
+    assert dt >= 0.2
+    # Locks are per name and dropped once unused.
+    assert "key" not in limiter._thread_local.async_locks
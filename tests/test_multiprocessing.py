@@ -1,9 +1,13 @@
 """Rate limiter multiprocessing tests"""
 import asyncio
+import pickle
 import time
 from collections import deque
 from concurrent.futures import ProcessPoolExecutor
 from concurrent.futures import wait
+from multiprocessing import Manager
+from multiprocessing import RLock
+from multiprocessing.shared_memory import SharedMemory
 from pathlib import Path
 from tempfile import gettempdir
 from typing import List
@@ -15,12 +19,15 @@ from pyrate_limiter import AbstractBucket
 from pyrate_limiter import Duration
 from pyrate_limiter import Limiter
 from pyrate_limiter import Rate
+from pyrate_limiter import RateItem
+from pyrate_limiter import SharedMemoryBucket
 from pyrate_limiter import SQLiteBucket
 from pyrate_limiter import SQLiteClock
 from pyrate_limiter.buckets.mp_bucket import MultiprocessBucket
 from pyrate_limiter import limiter_factory
 
 import logging
+from copy import copy
 
 logger = logging.getLogger(__name__)
 
@@ -111,6 +118,62 @@ def test_mp_bucket():
     analyze_times(start, requests_per_second, times)
 
 
+def test_shm_bucket():
+    requests_per_second = 250
+    num_seconds = 5
+    num_requests = requests_per_second * num_seconds
+
+    rate = Rate(requests_per_second, Duration.SECOND)
+    bucket = SharedMemoryBucket.init([rate])
+
+    def prime_bucket():
+        # Prime the bucket
+        limiter = Limiter(bucket)
+        [limiter.try_acquire("mytest") for i in range(requests_per_second)]
+
+    start = time.time()
+
+    with ProcessPoolExecutor(
+        initializer=limiter_factory.init_global_limiter,
+        initargs=(bucket,)
+    ) as executor:
+        prime_bucket()
+        futures = [executor.submit(my_task) for _ in range(num_requests)]
+        wait(futures)
+
+    times = [f.result() for f in futures]
+    bucket.close()
+
+    analyze_times(start, requests_per_second, times)
+
+
+def test_shm_bucket_copies_share_the_ring():
+    bucket = SharedMemoryBucket.init([Rate(3, 1000)])
+    # What a worker process gets: the lock is inherited, the ring attached by name.
+    other = copy(bucket)
+    assert other.mp_lock is bucket.mp_lock
+    assert other.limiter_lock() is other._lock is bucket.mp_lock
+
+    assert bucket.put(RateItem("x", 100, weight=2)) is True
+    assert other.count() == 2
+    assert other.put(RateItem("x", 200)) is True
+    assert bucket.put(RateItem("x", 300)) is False
+    assert bucket._retry == (1, 1101)
+    assert bucket.waiting(RateItem("x", 300)) == 801
+
+    assert other.leak(1150) == 2
+    assert bucket.count() == 1
+    assert bucket.peek(0).timestamp == 200
+
+    # A copy only detaches; the block lives on until the bucket that created it closes.
+    other.close()
+    assert bucket.count() == 1
+    bucket.close()
+    bucket.close()
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(bucket._shm.name)
+
+
 def test_sqlite_filelock_bucket():
     requests_per_second = 250
     num_seconds = 5
@@ -284,3 +347,28 @@ def test_bucket_full():
             f.result()
         except Exception as e:
             raise e
+
+
+def test_mp_bucket_without_cumulative():
+    # The pre-4.x three-argument constructor builds the prefix array itself.
+    manager = Manager()
+    items = manager.list([RateItem("a", 100, weight=2), RateItem("b", 200)])
+    bucket = MultiprocessBucket([Rate(5, 1000)], items, RLock())
+
+    assert bucket.count() == 3
+    assert bucket.peek(0).name == "b"
+    assert bucket.put(RateItem("c", 300, weight=2)) is True
+    assert bucket.put(RateItem("d", 400)) is False
+    assert bucket.leak(1150) == 2
+    assert bucket.count() == 3
+
+
+def test_mp_bucket_requires_cumulative_without_manager():
+    # A proxy rebuilt from a pickle, as in a child process, has lost its manager.
+    manager = Manager()
+    shared = manager.list([RateItem("a", 100)])
+    items = pickle.loads(pickle.dumps(shared))
+    assert items._manager is None
+
+    with pytest.raises(ValueError, match="cumulative is required"):
+        MultiprocessBucket([Rate(5, 1000)], items, RLock())
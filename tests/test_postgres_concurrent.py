@@ -56,7 +56,8 @@ class TestPostgresConcurrent:
                     sql.SQL("DROP TABLE IF EXISTS {}").format(sql.Identifier(bucket._full_tbl))
                 )
 
-    def test_concurrent_put(self, pg_pool, clean_table):
+    @pytest.mark.parametrize("lock_mode", PostgresBucket.LOCK_MODES)
+    def test_concurrent_put(self, pg_pool, clean_table, lock_mode):
         rate_limit = 5
         rates = [Rate(rate_limit, Duration.SECOND)]
         num_threads = 8
@@ -66,7 +67,7 @@ class TestPostgresConcurrent:
         results_lock = threading.Lock()
 
         def worker(thread_id: int):
-            bucket = PostgresBucket(pg_pool, clean_table, rates)
+            bucket = PostgresBucket(pg_pool, clean_table, rates, lock_mode=lock_mode)
             thread_results = []
 
             for _ in range(attempts_per_thread):
@@ -121,7 +122,8 @@ class TestPostgresConcurrent:
             "No rejections occurred - rate limiting may not be working"
         )
 
-    def test_concurrent_put_multiple_rates(self, pg_pool, clean_table):
+    @pytest.mark.parametrize("lock_mode", PostgresBucket.LOCK_MODES)
+    def test_concurrent_put_multiple_rates(self, pg_pool, clean_table, lock_mode):
         rates = [
             Rate(3, 500),   # 3 per 500ms
             Rate(5, 1000),  # 5 per second
@@ -133,7 +135,7 @@ class TestPostgresConcurrent:
         results_lock = threading.Lock()
 
         def worker(thread_id: int):
-            bucket = PostgresBucket(pg_pool, clean_table, rates)
+            bucket = PostgresBucket(pg_pool, clean_table, rates, lock_mode=lock_mode)
             thread_results = []
 
             for _ in range(attempts_per_thread):
@@ -166,7 +168,9 @@ class TestPostgresConcurrent:
             count_500ms = sum(1 for t in successful_timestamps if ts - 500 <= t <= ts)
             assert count_500ms <= 3, f"500ms rate exceeded: {count_500ms} items in window ending at {ts}"
 
-    def test_concurrent_put_weighted(self, pg_pool, clean_table):
+    @pytest.mark.parametrize("weighted_rows", [False, True])
+    @pytest.mark.parametrize("lock_mode", PostgresBucket.LOCK_MODES)
+    def test_concurrent_put_weighted(self, pg_pool, clean_table, lock_mode, weighted_rows):
         rate_limit = 10
         rates = [Rate(rate_limit, Duration.SECOND)]
         num_threads = 4
@@ -176,7 +180,7 @@ class TestPostgresConcurrent:
         results_lock = threading.Lock()
 
         def worker(thread_id: int):
-            bucket = PostgresBucket(pg_pool, clean_table, rates)
+            bucket = PostgresBucket(pg_pool, clean_table, rates, lock_mode=lock_mode, weighted_rows=weighted_rows)
             thread_results = []
 
             for _ in range(5):
@@ -205,3 +209,39 @@ class TestPostgresConcurrent:
             assert weight_in_window <= rate_limit, (
                 f"Rate limit exceeded: weight {weight_in_window} in 1-second window ending at {ts}"
             )
+
+    def test_advisory_lock_waits_instead_of_rejecting(self, pg_pool, clean_table):
+        """With capacity to spare, contended puts queue on the advisory lock
+        rather than being rejected the way NOWAIT rejects them."""
+        rates = [Rate(1000, Duration.SECOND)]
+        results = []
+        results_lock = threading.Lock()
+
+        def worker():
+            bucket = PostgresBucket(pg_pool, clean_table, rates, lock_mode="advisory")
+            thread_results = [bucket.put(RateItem("item", bucket.now())) for _ in range(10)]
+            with results_lock:
+                results.extend(thread_results)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert results == [True] * 80
+
+    def test_advisory_lock_timeout(self, pg_pool, clean_table):
+        bucket = PostgresBucket(pg_pool, clean_table, [Rate(5, Duration.SECOND)], lock_mode="advisory", lock_timeout_ms=50)
+
+        with pg_pool.connection() as conn:
+            # Another writer holds the bucket's lock for the whole test.
+            conn.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", (bucket._full_tbl,))
+
+            assert bucket.put(RateItem("item", bucket.now())) is False
+            assert bucket.failing_rate is bucket.rates[0]
+
+        assert bucket.put(RateItem("item", bucket.now())) is True
+
+        with pytest.raises(ValueError):
+            PostgresBucket(pg_pool, clean_table, [Rate(5, Duration.SECOND)], lock_mode="rows")
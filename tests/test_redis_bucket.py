@@ -1,13 +1,25 @@
+import asyncio
+from time import time_ns
+
 import pytest
 
+from pyrate_limiter import AsyncCachedClock
+from pyrate_limiter import CachedClock
+from pyrate_limiter import MonotonicClock
 from pyrate_limiter import Rate
 from pyrate_limiter import RateItem
+from pyrate_limiter import RedisBatcher
+from pyrate_limiter import RedisBucket
+from pyrate_limiter import RedisClock
+from pyrate_limiter import WallClock
 
 from .conftest import create_async_redis_bucket
 from .conftest import create_redis_bucket
 
 pytest.importorskip("redis")
 
+from redis.exceptions import NoScriptError  # noqa: E402
+
 
 @pytest.mark.redis
 @pytest.mark.asyncio
@@ -31,3 +43,324 @@ async def test_async_redis_bucket_batches_large_weight():
         assert await bucket.count() == 1001
     finally:
         await bucket.flush()
+
+
+class CountingBatcher(RedisBatcher):
+    """Record the size of every pipeline sent."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sent = []
+
+    async def _send(self, batch):
+        self.sent.append(len(batch))
+        await super()._send(batch)
+
+
+@pytest.mark.asyncredis
+@pytest.mark.asyncio
+async def test_batcher_coalesces_concurrent_acquires():
+    bucket = await create_async_redis_bucket([Rate(20, 10_000)])
+    other = await RedisBucket.init([Rate(20, 10_000)], bucket.redis, f"{bucket.bucket_key}-other")
+    batcher = CountingBatcher(bucket.redis)
+    bucket.batcher = other.batcher = batcher
+
+    try:
+        results = await asyncio.gather(
+            *[bucket.put(RateItem("item", bucket.now())) for _ in range(30)],
+            *[other.put(RateItem("item", other.now())) for _ in range(10)],
+        )
+
+        assert results.count(True) == 30
+        assert results[20:30] == [False] * 10
+        assert bucket.failing_rate is bucket.rates[0]
+        # Both keys went out together in a single round trip.
+        assert batcher.sent == [40]
+        assert await bucket.count() == 20
+        assert await other.count() == 10
+    finally:
+        await bucket.flush()
+        await other.flush()
+
+
+@pytest.mark.asyncredis
+@pytest.mark.asyncio
+async def test_batcher_max_batch_and_errors():
+    bucket = await create_async_redis_bucket([Rate(100, 10_000)])
+    batcher = CountingBatcher(bucket.redis, window_ms=5, max_batch=4)
+    bucket.batcher = batcher
+
+    try:
+        results = await asyncio.gather(*[bucket.put(RateItem("item", bucket.now())) for _ in range(10)])
+
+        assert all(results)
+        assert batcher.sent == [4, 4, 2]
+
+        with pytest.raises(ValueError):
+            RedisBatcher(bucket.redis, max_batch=0)
+    finally:
+        await bucket.flush()
+
+
+@pytest.mark.asyncredis
+@pytest.mark.asyncio
+async def test_batcher_propagates_script_errors():
+    bucket = await create_async_redis_bucket([Rate(1, 1000)])
+    broken = RedisBucket(bucket.rates, bucket.redis, bucket.bucket_key, "0" * 40, batcher=RedisBatcher(bucket.redis))
+
+    with pytest.raises(NoScriptError):
+        await broken.put(RateItem("item", broken.now()))
+
+
+class CountingRedisClock(RedisClock):
+    """Count the ``TIME`` round trips."""
+
+    calls = 0
+
+    def now(self):
+        self.calls += 1
+        return super().now()
+
+
+def redis_ms(time):
+    return time[0] * 1000 + time[1] // 1000
+
+
+@pytest.mark.redis
+@pytest.mark.asyncio
+async def test_redis_clock_serves_redis_time_from_cache():
+    bucket = await create_redis_bucket([Rate(5, 1000)])
+    remote = CountingRedisClock(bucket.redis)
+    bucket._clock = CachedClock(remote, max_error_ms=20)
+
+    try:
+        before = redis_ms(bucket.redis.time())
+        assert before - 20 <= remote.now() <= redis_ms(bucket.redis.time())
+
+        for _ in range(5):
+            assert bucket.put(RateItem("item", bucket.now())) is True
+        assert bucket.put(RateItem("item", bucket.now())) is False
+
+        # Five acquires later, TIME was only read by the initial sync.
+        calls = remote.calls
+        assert before - 20 <= bucket.now() <= redis_ms(bucket.redis.time()) + 20
+        assert remote.calls == calls
+    finally:
+        bucket._clock.close()
+        bucket.flush()
+
+
+@pytest.mark.redis
+@pytest.mark.asyncio
+async def test_redis_bucket_keeps_its_clock_in_clock_attribute():
+    bucket = await create_redis_bucket([Rate(5, 1000)])
+    assert isinstance(bucket._clock, WallClock)
+    assert abs(bucket.now() - time_ns() // 1_000_000) <= 1_000
+
+    bucket._clock = MonotonicClock()
+    assert bucket.now() == pytest.approx(MonotonicClock().now(), abs=1_000)
+
+    bucket = RedisBucket(bucket.rates, bucket.redis, bucket.bucket_key, bucket.script_hash, clock=MonotonicClock())
+    assert isinstance(bucket._clock, MonotonicClock)
+
+
+@pytest.mark.asyncredis
+@pytest.mark.asyncio
+async def test_async_redis_clock():
+    bucket = await create_async_redis_bucket([Rate(5, 1000)])
+    remote = RedisClock(bucket.redis)
+    bucket = await RedisBucket.init(bucket.rates, bucket.redis, bucket.bucket_key, clock=AsyncCachedClock(remote))
+
+    try:
+        before = redis_ms(await bucket.redis.time())
+        now = await bucket.now()
+        assert before - 5 <= now <= redis_ms(await bucket.redis.time()) + 5
+        assert await bucket.put(RateItem("item", now)) is True
+    finally:
+        bucket._clock.close()
+        await bucket.flush()
+
+
+def test_tagged_key():
+    from pyrate_limiter.buckets.redis_bucket import _hash_tag
+
+    assert RedisBucket.tagged_key("user:1", "search") == "{user:1}:search"
+    assert _hash_tag(RedisBucket.tagged_key("user:1", "search")) == "user:1"
+    assert _hash_tag("plain") is None
+    assert _hash_tag("{}:empty") is None
+
+    with pytest.raises(ValueError):
+        RedisBucket.tagged_key("a}b", "search")
+
+
+@pytest.mark.redis
+@pytest.mark.asyncio
+async def test_sharded_bucket_splits_limit_across_keys():
+    base = await create_redis_bucket([Rate(10, 1000)])
+    redis = base.redis
+    bucket = RedisBucket.init(base.rates, redis, f"{base.bucket_key}-sharded", shards=3)
+
+    try:
+        assert [rates[0].limit for rates in bucket._shard_rates] == [4, 3, 3]
+
+        now = bucket.now()
+        assert all(bucket.put(RateItem("item", now)) for _ in range(10))
+        assert bucket.put(RateItem("item", now)) is False
+        assert bucket.failing_rate in [rates[0] for rates in bucket._shard_rates]
+        assert sorted(redis.zcard(key) for key in bucket.keys) == [3, 3, 4]
+        assert bucket.count() == 10
+
+        latest = RateItem("latest", now + 1)
+        bucket.flush()
+        assert bucket.put(latest) is True
+        assert bucket.peek(0).timestamp == now + 1
+        assert bucket.peek(1) is None
+
+        assert bucket.leak(now + 2000) == 1
+        assert bucket.count() == 0
+    finally:
+        bucket.flush()
+
+
+@pytest.mark.redis
+@pytest.mark.asyncio
+async def test_sharded_bucket_caps_weight_at_one_share():
+    base = await create_redis_bucket([Rate(10, 1000), Rate(40, 60_000)])
+    bucket = RedisBucket.init(base.rates, base.redis, f"{base.bucket_key}-sharded", shards=3)
+
+    try:
+        # The smallest share of the tightest rate is 10 // 3 units.
+        now = bucket.now()
+        assert [bucket.put(RateItem("item", now, weight=3)) for _ in range(3)] == [True, True, True]
+        assert bucket.count() == 9
+
+        with pytest.raises(ValueError, match="weight 4 exceeds 3"):
+            bucket.put(RateItem("heavy", now, weight=4))
+        with pytest.raises(ValueError, match="weight 4 exceeds 3"):
+            bucket.put_many([(bucket, RateItem("heavy", now, weight=4))])
+        assert bucket.count() == 9
+    finally:
+        bucket.flush()
+
+
+@pytest.mark.redis
+@pytest.mark.asyncio
+async def test_sharded_put_many_takes_a_shard_only_when_it_runs():
+    from redis.crc import key_slot
+
+    base = await create_redis_bucket([Rate(10, 1000)])
+    redis = base.redis
+    bucket = RedisBucket.init(base.rates, redis, f"{base.bucket_key}-sharded", shards=3)
+
+    try:
+        now = bucket.now()
+        # Two puts on one bucket in a call take consecutive shards.
+        assert bucket.put_many([(bucket, RateItem("a", now)), (bucket, RateItem("b", now))]) == -1
+        assert [redis.zcard(key) for key in bucket.keys] == [1, 1, 0]
+        assert bucket._shard() == 2
+
+        # A call falling back to per-bucket puts leaves the round-robin alone.
+        redis.keyslot = lambda key: key_slot(key.encode())
+        with pytest.raises(NotImplementedError):
+            bucket.put_many([(bucket, RateItem("a", now)), (base, RateItem("b", now))])
+        assert bucket._shard() == 2
+    finally:
+        bucket.flush()
+        base.flush()
+
+
+@pytest.mark.asyncredis
+@pytest.mark.asyncio
+async def test_async_sharded_bucket():
+    base = await create_async_redis_bucket([Rate(4, 1000)])
+    bucket = await RedisBucket.init(base.rates, base.redis, f"{base.bucket_key}-sharded", shards=2)
+
+    try:
+        now = bucket.now()
+        assert all([await bucket.put(RateItem("item", now)) for _ in range(4)])
+        assert await bucket.put(RateItem("item", now)) is False
+        assert await bucket.count() == 4
+        assert (await bucket.peek(3)).timestamp == now
+        assert await bucket.leak(now + 2000) == 4
+    finally:
+        await bucket.flush()
+
+
+@pytest.mark.redis
+@pytest.mark.asyncio
+async def test_sharded_bucket_options_are_validated():
+    from pyrate_limiter import GCRA
+
+    base = await create_redis_bucket([Rate(2, 1000)])
+
+    with pytest.raises(ValueError):
+        RedisBucket.init(base.rates, base.redis, "key", shards=0)
+    with pytest.raises(ValueError):
+        RedisBucket.init(base.rates, base.redis, "key", shards=3)
+    with pytest.raises(ValueError):
+        RedisBucket.init(base.rates, base.redis, RedisBucket.tagged_key("tag", "key"), shards=2)
+    with pytest.raises(ValueError):
+        RedisBucket.init(base.rates, base.redis, "key", algorithm=GCRA(), shards=2)
+
+
+@pytest.mark.redis
+@pytest.mark.asyncio
+async def test_put_many_requires_one_slot_on_a_cluster():
+    from redis.crc import key_slot
+
+    base = await create_redis_bucket([Rate(2, 1000)])
+    redis = base.redis
+    # A cluster client tells the slot of a key.
+    redis.keyslot = lambda key: key_slot(key.encode())
+    tag = f"{base.bucket_key}-tag"
+    search, upload = (RedisBucket.init([Rate(2, 1000)], redis, RedisBucket.tagged_key(tag, name)) for name in ("search", "upload"))
+
+    try:
+        now = base.now()
+        assert search.put_many([(search, RateItem("a", now)), (upload, RateItem("b", now))]) == -1
+        assert [search.count(), upload.count()] == [1, 1]
+
+        with pytest.raises(NotImplementedError):
+            base.put_many([(base, RateItem("a", now)), (search, RateItem("b", now))])
+    finally:
+        search.flush()
+        upload.flush()
+        base.flush()
+
+
+@pytest.mark.redis
+@pytest.mark.asyncio
+async def test_compact_members_are_sequence_numbers():
+    bucket = await create_redis_bucket([Rate(10, 1000)], compact_members=True)
+    redis = bucket.redis
+
+    try:
+        now = bucket.now()
+        assert bucket.put(RateItem("item", now, weight=3)) is True
+        assert bucket.put(RateItem("item", now, weight=2)) is True
+        assert sorted(int(member) for member in redis.zrange(bucket.bucket_key, 0, -1)) == [1, 2, 3, 4, 5]
+        assert int(redis.get(RedisBucket.sequence_key(bucket.bucket_key))) == 5
+
+        # A rejected put_many takes its units back out; the sequence just skips them.
+        other = RedisBucket.init([Rate(1, 1000)], redis, f"{bucket.bucket_key}-other", compact_members=True)
+        assert bucket.put_many([(bucket, RateItem("a", now, weight=2)), (other, RateItem("b", now, weight=2))]) == 1
+        assert bucket.count() == 5
+        assert bucket.put_many([(bucket, RateItem("a", now, weight=2)), (other, RateItem("b", now))]) == -1
+        assert sorted(int(member) for member in redis.zrange(bucket.bucket_key, 0, -1))[-2:] == [8, 9]
+
+        rejected = RateItem("item", now + 10, weight=4)
+        assert bucket.put(rejected) is False
+        assert bucket.waiting(rejected) == 1000 - 10 + 1
+
+        bucket.flush()
+        other.flush()
+        assert not redis.exists(RedisBucket.sequence_key(bucket.bucket_key), RedisBucket.sequence_key(other.bucket_key))
+    finally:
+        bucket.flush()
+
+
+def test_sequence_key_shares_the_slot():
+    from redis.crc import key_slot
+
+    for key in ("plain", RedisBucket.tagged_key("user:1", "search")):
+        assert key_slot(RedisBucket.sequence_key(key).encode()) == key_slot(key.encode())
@@ -1,16 +1,18 @@
 """Focused unit tests for SQLiteBucket edge cases."""
+import sqlite3
 from pathlib import Path
 from tempfile import gettempdir
+from time import sleep, time
 
 import pytest
 
-from pyrate_limiter import Duration, Rate, RateItem, SQLiteBucket, id_generator
+from pyrate_limiter import GCRA, Duration, Rate, RateItem, SlidingWindowLog, SQLiteBucket, id_generator
 
 
-def _make_bucket(rates):
-    db_path = str(Path(gettempdir()) / f"pyrate_sqlite_test_{id_generator()}.sqlite")
-    table = f"pyrate-test-{id_generator()}"
-    return SQLiteBucket.init_from_file(rates, db_path=db_path, table=table, create_new_table=True)
+def _make_bucket(rates, weighted_rows=False, db_path=None, table=None):
+    db_path = db_path or str(Path(gettempdir()) / f"pyrate_sqlite_test_{id_generator()}.sqlite")
+    table = table or f"pyrate-test-{id_generator()}"
+    return SQLiteBucket.init_from_file(rates, db_path=db_path, table=table, create_new_table=True, weighted_rows=weighted_rows)
 
 
 @pytest.mark.sqlite
@@ -46,3 +48,379 @@ def test_sqlite_leak_after_close_is_safe():
 
     # Previously raised AttributeError: 'NoneType' object has no attribute 'execute'
     assert bucket.leak(bucket.now() + Duration.SECOND * 10) == 0
+
+
+class _PythonAdmit(SlidingWindowLog):
+    """The default policy through the count-then-insert fallback path."""
+
+    def admit(self, rates, counts, weight):
+        return super().admit(rates, counts, weight)
+
+
+@pytest.mark.sqlite
+@pytest.mark.parametrize("fused", [True, False])
+@pytest.mark.parametrize("weighted_rows", [False, True])
+def test_sqlite_admit_checks_every_window(fused, weighted_rows):
+    """One statement counts every window and inserts only when all fit; the
+    failing rate and retry-after come out the same as on the fallback path."""
+    rates = [Rate(2, Duration.SECOND), Rate(3, Duration.MINUTE), Rate(10, Duration.HOUR)]
+    bucket = _make_bucket(rates, weighted_rows=weighted_rows)
+    if not fused:
+        bucket._algorithm = _PythonAdmit()
+    try:
+        start = bucket.now()
+        assert bucket.put(RateItem("x", start, weight=2))
+        assert not bucket.put(RateItem("x", start + 10, weight=1))
+        assert bucket.failing_rate == rates[0]
+        assert bucket.waiting(RateItem("x", start + 10, weight=1)) == 991
+
+        # The second window passes, the minute does not fit a weight of 2.
+        later = start + 2 * Duration.SECOND
+        assert not bucket.put(RateItem("x", later, weight=2))
+        assert bucket.failing_rate == rates[1]
+        assert bucket.count() == 2
+
+        assert bucket.put(RateItem("x", later, weight=1))
+        assert bucket.count() == 3
+
+        # Weight 0 never inserts and always passes.
+        assert bucket.put(RateItem("x", later, weight=0))
+        assert bucket.count() == 3
+    finally:
+        bucket.close()
+
+
+@pytest.mark.sqlite
+def test_sqlite_admit_is_one_statement():
+    """An admitted put is a single statement reusing the bucket's composed SQL,
+    so it hits sqlite3's per-connection prepared statement cache."""
+    bucket = _make_bucket([Rate(10, Duration.SECOND), Rate(50, Duration.MINUTE)])
+    query = bucket._q_admit
+    try:
+        statements = []
+        bucket.conn.set_trace_callback(statements.append)
+        for _ in range(3):
+            assert bucket.put(RateItem("x", bucket.now(), weight=2))
+
+        # BEGIN is implicit before the INSERT; COMMIT follows it.
+        assert [statement.split()[0] for statement in statements] == ["BEGIN", "INSERT", "COMMIT"] * 3
+        assert bucket._q_admit is query
+        assert bucket.count() == 6
+    finally:
+        bucket.conn.set_trace_callback(None)
+        bucket.close()
+
+
+@pytest.mark.sqlite
+@pytest.mark.parametrize("fused", [True, False])
+def test_sqlite_rejected_put_ends_its_transaction(fused):
+    """A rejected put rolls back, so it leaves no write lock on the file."""
+    db_path = str(Path(gettempdir()) / f"pyrate_sqlite_test_{id_generator()}.sqlite")
+    bucket = _make_bucket([Rate(1, Duration.MINUTE)], db_path=db_path)
+    if not fused:
+        bucket._algorithm = _PythonAdmit()
+    try:
+        now = bucket.now()
+        assert bucket.put(RateItem("x", now))
+        assert not bucket.put(RateItem("x", now))
+        assert not bucket.conn.in_transaction
+        assert bucket.put_many([(bucket, RateItem("x", now))]) == 0
+        assert not bucket.conn.in_transaction
+
+        other = sqlite3.connect(db_path, timeout=0)
+        try:
+            other.execute(f"INSERT INTO '{bucket.table}' (name, item_timestamp) VALUES (?, ?)", ("y", now))
+            other.commit()
+        finally:
+            other.close()
+        assert bucket.count() == 2
+    finally:
+        bucket.close()
+
+
+def _rows(bucket):
+    cur = bucket.conn.execute(f"SELECT COUNT(*) FROM '{bucket.table}'")
+    rows = cur.fetchone()[0]
+    cur.close()
+    return rows
+
+
+@pytest.mark.sqlite
+def test_sqlite_weighted_rows_store_one_row_per_put():
+    bucket = _make_bucket([Rate(100, Duration.SECOND)], weighted_rows=True)
+    try:
+        now = bucket.now()
+        assert bucket.put(RateItem("a", now, weight=30))
+        assert bucket.put(RateItem("b", now + 1, weight=50))
+        assert not bucket.put(RateItem("c", now + 2, weight=21))
+        assert bucket.put(RateItem("c", now + 2, weight=20))
+
+        assert _rows(bucket) == 3
+        assert bucket.count() == 100
+
+        # The n-th newest unit, counting weights: c holds units 0-19, b 20-69.
+        assert bucket.peek(0).name == "c"
+        assert bucket.peek(20).name == "b"
+        assert bucket.peek(69).weight == 50
+        assert bucket.peek(70).name == "a"
+        assert bucket.peek(100) is None
+
+        assert bucket.leak(now + 2 + Duration.SECOND) == 80
+        assert bucket.count() == 20
+    finally:
+        bucket.close()
+
+
+@pytest.mark.sqlite
+def test_sqlite_weighted_rows_migrates_unit_table():
+    """A table written by a unit-row bucket gains a weight column; its rows
+    count as one unit each, and the plain index gives way to a covering one."""
+    db_path = str(Path(gettempdir()) / f"pyrate_sqlite_test_{id_generator()}.sqlite")
+    table = f"pyrate-test-{id_generator()}"
+    rates = [Rate(10, Duration.MINUTE)]
+
+    unit = _make_bucket(rates, db_path=db_path, table=table)
+    assert unit.put(RateItem("old", unit.now(), weight=4))
+    unit.close()
+
+    bucket = _make_bucket(rates, weighted_rows=True, db_path=db_path, table=table)
+    try:
+        assert bucket.count() == 4
+        assert not bucket.put(RateItem("new", bucket.now(), weight=7))
+        assert bucket.put(RateItem("new", bucket.now(), weight=6))
+        assert bucket.count() == 10
+        assert _rows(bucket) == 5
+
+        cur = bucket.conn.execute(f"SELECT name FROM pragma_index_list('{table}')")
+        assert [row[0] for row in cur.fetchall()] == [f"idx_{table}_rate_item_timestamp_weight"]
+        cur.close()
+    finally:
+        bucket.close()
+
+    # Opening the migrated table again leaves it as it is.
+    bucket = _make_bucket(rates, weighted_rows=True, db_path=db_path, table=table)
+    assert bucket.count() == 10
+    bucket.close()
+
+
+@pytest.mark.sqlite
+def test_sqlite_weighted_rows_requires_log_algorithm():
+    with pytest.raises(ValueError, match="weighted_rows"):
+        SQLiteBucket([Rate(10, Duration.SECOND)], sqlite3.connect(":memory:"), "t", algorithm=GCRA(), weighted_rows=True)
+
+
+def _committed(bucket):
+    """Rows visible to another connection, as another process would see them."""
+    conn = sqlite3.connect(bucket._db_path)
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM '{bucket.table}'").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def _make_grouped(rates, commit_interval_ms=60_000, **kwargs):
+    db_path = kwargs.pop("db_path", None) or str(Path(gettempdir()) / f"pyrate_sqlite_test_{id_generator()}.sqlite")
+    table = kwargs.pop("table", None) or f"pyrate-test-{id_generator()}"
+    bucket = SQLiteBucket.init_from_file(
+        rates, db_path=db_path, table=table, use_file_lock=True, commit_interval_ms=commit_interval_ms, **kwargs
+    )
+    bucket._db_path = db_path
+    return bucket
+
+
+@pytest.mark.sqlite
+@pytest.mark.parametrize("weighted_rows", [False, True])
+def test_sqlite_group_commit_batches_puts(weighted_rows):
+    """Puts are admitted in memory and written together by one commit."""
+    bucket = _make_grouped([Rate(10, Duration.MINUTE)], weighted_rows=weighted_rows)
+    try:
+        assert bucket.limiter_lock() is None
+
+        now = bucket.now()
+        for _ in range(3):
+            assert bucket.put(RateItem("x", now, weight=3))
+        assert not bucket.put(RateItem("x", now, weight=2))
+        assert bucket.failing_rate == bucket.rates[0]
+        assert _committed(bucket) == 0
+
+        statements = []
+        bucket.conn.set_trace_callback(statements.append)
+        assert bucket.commit() == 3
+        bucket.conn.set_trace_callback(None)
+
+        assert statements.count("COMMIT") == 1
+        assert _committed(bucket) == (3 if weighted_rows else 9)
+        assert bucket.count() == 9
+        assert bucket.put(RateItem("x", now, weight=1))
+        assert not bucket.put(RateItem("x", now, weight=1))
+    finally:
+        bucket.close()
+
+
+@pytest.mark.sqlite
+def test_sqlite_group_commit_reconciles_other_writers():
+    """Another process's puts reach a bucket's view when it next commits."""
+    rates = [Rate(10, Duration.MINUTE)]
+    first = _make_grouped(rates)
+    second = _make_grouped(rates, db_path=first._db_path, table=first.table)
+    try:
+        now = first.now()
+        assert first.put(RateItem("a", now, weight=6))
+        first.commit()
+
+        # Stale until its own commit reloads the table.
+        assert second.put(RateItem("b", now, weight=4))
+        second.commit()
+        assert not second.put(RateItem("b", now, weight=1))
+        assert second.count() == 10
+    finally:
+        first.close()
+        second.close()
+
+
+@pytest.mark.sqlite
+def test_sqlite_group_commit_in_background():
+    """The committer writes within an interval, then retires until the next put."""
+    bucket = _make_grouped([Rate(100, Duration.MINUTE)], commit_interval_ms=20)
+    try:
+        for weight in (2, 3):
+            assert bucket.put(RateItem("x", bucket.now(), weight=weight))
+            assert bucket._committer is not None
+
+            deadline = time() + 5
+            while bucket._committer is not None and time() < deadline:
+                sleep(0.01)
+            assert bucket._committer is None
+
+        assert _committed(bucket) == 5
+    finally:
+        bucket.close()
+
+
+@pytest.mark.sqlite
+def test_sqlite_group_commit_reloads_view_after_idle():
+    """Writes made while the committer was retired count on the next put."""
+    bucket = _make_grouped([Rate(5, Duration.MINUTE)], commit_interval_ms=20)
+    try:
+        assert bucket.put(RateItem("x", bucket.now(), weight=2))
+        deadline = time() + 5
+        while bucket._committer is not None and time() < deadline:
+            sleep(0.01)
+        assert bucket._committer is None
+
+        other = sqlite3.connect(bucket._db_path)
+        try:
+            other.executemany(f"INSERT INTO '{bucket.table}' (name, item_timestamp) VALUES (?, ?)", [("y", bucket.now())] * 3)
+            other.commit()
+        finally:
+            other.close()
+
+        assert not bucket.put(RateItem("x", bucket.now()))
+        assert bucket.failing_rate == bucket.rates[0]
+    finally:
+        bucket.close()
+
+
+@pytest.mark.sqlite
+def test_sqlite_group_commit_on_close():
+    bucket = _make_grouped([Rate(100, Duration.MINUTE)])
+    assert bucket.put(RateItem("x", bucket.now(), weight=3))
+    assert _committed(bucket) == 0
+
+    bucket.close()
+    assert _committed(bucket) == 3
+
+
+@pytest.mark.sqlite
+def test_sqlite_group_commit_reload_failure_keeps_batch_committed(monkeypatch):
+    """A reload failing after the commit must not queue the batch again."""
+    bucket = _make_grouped([Rate(100, Duration.MINUTE)])
+    try:
+        assert bucket.put(RateItem("x", bucket.now(), weight=3))
+
+        def fail():
+            raise sqlite3.OperationalError("database is locked")
+
+        monkeypatch.setattr(bucket, "_recent_units", fail)
+        with pytest.raises(sqlite3.OperationalError):
+            bucket.commit()
+        monkeypatch.undo()
+
+        assert bucket._pending == []
+        assert bucket.commit() == 0
+        assert _committed(bucket) == 3
+        assert bucket.count() == 3
+    finally:
+        bucket.close()
+
+
+@pytest.mark.sqlite
+def test_sqlite_group_commit_put_many_is_all_or_nothing():
+    first = _make_grouped([Rate(5, Duration.MINUTE)])
+    second = _make_grouped([Rate(2, Duration.MINUTE)])
+    try:
+        now = first.now()
+        assert first.put_many([(first, RateItem("a", now, weight=3)), (second, RateItem("b", now, weight=3))]) == 1
+        assert second.failing_rate == second.rates[0]
+        assert first.count() == 0
+
+        assert first.put_many([(first, RateItem("a", now, weight=3)), (second, RateItem("b", now, weight=2))]) == -1
+        assert first.count() == 3
+        assert second.count() == 2
+    finally:
+        first.close()
+        second.close()
+
+
+@pytest.mark.sqlite
+def test_sqlite_group_commit_options():
+    with pytest.raises(ValueError, match="commit_interval_ms"):
+        _make_grouped([Rate(10, Duration.SECOND)], commit_interval_ms=0)
+    with pytest.raises(ValueError, match="commit_interval_ms"):
+        _make_grouped([Rate(10, Duration.SECOND)], algorithm=GCRA())
+
+
+@pytest.mark.sqlite
+@pytest.mark.parametrize("weighted_rows", [False, True])
+@pytest.mark.parametrize("leak_chunk_size", [None, 4])
+def test_sqlite_leak_deletes_expired_range(weighted_rows, leak_chunk_size):
+    db_path = str(Path(gettempdir()) / f"pyrate_sqlite_test_{id_generator()}.sqlite")
+    bucket = SQLiteBucket.init_from_file(
+        [Rate(1000, Duration.SECOND)],
+        db_path=db_path,
+        table=f"pyrate-test-{id_generator()}",
+        weighted_rows=weighted_rows,
+        leak_chunk_size=leak_chunk_size,
+    )
+    try:
+        start = bucket.now()
+        # Ten expired puts, three of them sharing a timestamp across a chunk
+        # boundary, and two live ones.
+        for offset in (0, 1, 2, 3, 3, 3, 4, 5, 6, 7):
+            assert bucket.put(RateItem("old", start + offset, weight=2))
+        for _ in range(2):
+            assert bucket.put(RateItem("new", start + 500, weight=2))
+
+        statements = []
+        bucket.conn.set_trace_callback(statements.append)
+        assert bucket.leak(start + 8 + Duration.SECOND) == 20
+        bucket.conn.set_trace_callback(None)
+
+        deletes = [statement for statement in statements if statement.startswith("DELETE")]
+        if leak_chunk_size is None:
+            assert deletes == [f"DELETE FROM '{bucket.table}' WHERE item_timestamp < {start + 8}"]
+        else:
+            # Chunks of 4 rows, the three ties at start + 3 kept together:
+            # unit rows go 4, 8, 4, 4; weighted rows 6, 4.
+            assert len(deletes) == statements.count("COMMIT") == (2 if weighted_rows else 4)
+
+        assert bucket.count() == 4
+        assert bucket.leak(start + 8 + Duration.SECOND) == 0
+    finally:
+        bucket.close()
+
+
+@pytest.mark.sqlite
+def test_sqlite_leak_chunk_size_option():
+    with pytest.raises(ValueError, match="leak_chunk_size"):
+        SQLiteBucket([Rate(10, Duration.SECOND)], sqlite3.connect(":memory:"), "t", leak_chunk_size=0)